@@ -0,0 +1,253 @@
+"""
+    Benchmark API utilities
+
+    Drives a model endpoint with the payloads in a directory and reports
+    throughput, error rate and latency percentiles.
+
+    - closed-loop: a fixed number of workers each send their next request as
+      soon as the previous one completes.
+    - open-loop: requests are scheduled at a target rate, independent of
+      responses. Latency is measured from a request's scheduled send time, so
+      time spent queued behind a slow server is counted (coordinated omission).
+"""
+import itertools
+import logging
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+from mldock.api.predict import PredictClient
+from mldock.platform_helpers.mldock.inference import compression
+from mldock.platform_helpers.mldock.inference.headers import content_type_for_path
+from mldock.platform_helpers.mldock.tracking.latency import LatencyHistogram
+
+logger = logging.getLogger("mldock")
+
+CLOSED_LOOP = "closed"
+OPEN_LOOP = "open"
+
+
+def load_payloads(payload_dir: str, content_encoding: str = None) -> list:
+    """
+    Load the payloads in a directory, with content types from their extensions.
+
+    args:
+        payload_dir (str): directory of payload files
+        content_encoding (str): (Optional) compress payloads with gzip or zstd
+    return:
+        list: (content type, payload bytes, headers) per payload file
+    """
+    payloads = []
+    for path in sorted(Path(payload_dir).iterdir()):
+        content_type = content_type_for_path(path)
+        if not path.is_file() or content_type is None:
+            continue
+        headers = {"Content-Type": content_type}
+        data = path.read_bytes()
+        if content_encoding is not None:
+            headers["Content-Encoding"] = content_encoding
+            data = compression.compress(data, content_encoding)
+        payloads.append((content_type, data, headers))
+    if not payloads:
+        raise ValueError(f"No payloads with a known content type in {payload_dir}")
+    return payloads
+
+
+class _Recorder:
+    """records latencies and outcomes of benchmark requests"""
+
+    def __init__(self, expected_interval: float = None):
+        self.expected_interval = expected_interval
+        self.latency = LatencyHistogram()
+        self.service_time = LatencyHistogram()
+        self.errors = 0
+        self.status_codes = {}
+        self._lock = threading.Lock()
+
+    def record(self, status_code, service_time: float, latency: float):
+        """record a completed request, status_code is None for failed connections"""
+        with self._lock:
+            self.status_codes[str(status_code)] = (
+                self.status_codes.get(str(status_code), 0) + 1
+            )
+            if status_code != 200:
+                self.errors += 1
+                return
+        self.service_time.record(service_time)
+        self.latency.record(latency)
+        if self.expected_interval:
+            # closed-loop correction, back-fill the requests a stalled worker
+            # would have sent at the expected interval
+            for missed in range(1, int(latency / self.expected_interval)):
+                self.latency.record(latency - missed * self.expected_interval)
+
+
+def _send(client, host, payload, extra_headers):
+    """send a payload, returning its status code (None on failure), start and end times"""
+    _, data, headers = payload
+    start = time.perf_counter()
+    try:
+        response = client.post(
+            url=host, headers={**headers, **extra_headers}, data=data
+        )
+        status_code = response.status_code
+    except Exception as exception:  # pylint: disable=broad-except
+        logger.debug(f"Request failed: {exception}")
+        status_code = None
+    return status_code, start, time.perf_counter()
+
+
+def _closed_loop(client, host, payloads, headers, recorder, **kwargs):
+    """run workers that each send requests back to back until the deadline"""
+    deadline = kwargs["deadline"]
+    counter = itertools.count()
+    max_requests = kwargs.get("max_requests")
+
+    def worker():
+        while time.perf_counter() < deadline:
+            index = next(counter)
+            if max_requests is not None and index >= max_requests:
+                return
+            status_code, start, end = _send(
+                client, host, payloads[index % len(payloads)], headers
+            )
+            recorder.record(status_code, end - start, end - start)
+
+    threads = [
+        threading.Thread(target=worker, name=f"mldock-benchmark-{index}")
+        for index in range(kwargs["concurrency"])
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+
+def _open_loop(client, host, payloads, headers, recorder, **kwargs):
+    """schedule requests at the target rate until the deadline"""
+    rate = kwargs["rate"]
+    deadline = kwargs["deadline"]
+    max_requests = kwargs.get("max_requests")
+
+    def task(index, scheduled):
+        status_code, start, end = _send(
+            client, host, payloads[index % len(payloads)], headers
+        )
+        recorder.record(status_code, end - start, end - scheduled)
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(
+        max_workers=kwargs["concurrency"], thread_name_prefix="mldock-benchmark"
+    ) as executor:
+        for index in itertools.count():
+            scheduled = started + index / rate
+            if scheduled >= deadline or (
+                max_requests is not None and index >= max_requests
+            ):
+                break
+            delay = scheduled - time.perf_counter()
+            if delay > 0:
+                time.sleep(delay)
+            executor.submit(task, index, scheduled)
+
+
+def _summary(histogram: LatencyHistogram) -> dict:
+    """latency percentiles, mean and histogram in seconds"""
+    snapshot = histogram.snapshot()
+    snapshot["mean"] = snapshot["sum"] / snapshot["count"] if snapshot["count"] else 0.0
+    snapshot["histogram"] = [
+        {"latency": latency, "count": count} for latency, count in histogram.buckets()
+    ]
+    return snapshot
+
+
+def run_benchmark(
+    host: str,
+    payloads: list,
+    mode: str = CLOSED_LOOP,
+    concurrency: int = 4,
+    **kwargs,
+) -> dict:
+    """
+    Benchmark a model endpoint.
+
+    args:
+        host (str): url at which the model is served
+        payloads (list): (content type, payload bytes, headers), see load_payloads
+        mode (str): "closed" for a fixed number of concurrent workers, "open" for a target rate
+        concurrency (int): concurrent workers, the maximum requests in flight in open-loop
+        rate (float): target requests per second, required in open-loop
+        duration (float): seconds to run for. Defaults to 30.
+        max_requests (int): (Optional) stop after this many requests
+        expected_interval (float): (Optional) seconds between requests of a closed-loop worker
+            on a healthy server, used to correct latencies for coordinated omission
+        headers (dict): (Optional) extra request headers
+        client (PredictClient): (Optional) client to send requests with
+    return:
+        dict: benchmark results
+    """
+    if mode not in (CLOSED_LOOP, OPEN_LOOP):
+        raise ValueError(f"Unsupported mode '{mode}', expected closed or open")
+    if mode == OPEN_LOOP and not kwargs.get("rate"):
+        raise ValueError("Open-loop benchmarks require a target rate")
+
+    client = kwargs.get("client") or PredictClient(pool_size=concurrency)
+    duration = kwargs.get("duration", 30.0)
+    recorder = _Recorder(
+        expected_interval=kwargs.get("expected_interval")
+        if mode == CLOSED_LOOP
+        else None
+    )
+    run = _closed_loop if mode == CLOSED_LOOP else _open_loop
+
+    started = time.perf_counter()
+    run(
+        client,
+        host,
+        payloads,
+        kwargs.get("headers") or {},
+        recorder,
+        concurrency=concurrency,
+        rate=kwargs.get("rate"),
+        deadline=started + duration,
+        max_requests=kwargs.get("max_requests"),
+    )
+    elapsed = time.perf_counter() - started
+
+    requests_ = sum(recorder.status_codes.values())
+    return {
+        "host": host,
+        "mode": mode,
+        "concurrency": concurrency,
+        "target_rate": kwargs.get("rate"),
+        "duration": elapsed,
+        "requests": requests_,
+        "errors": recorder.errors,
+        "error_rate": recorder.errors / requests_ if requests_ else 0.0,
+        "throughput": (requests_ - recorder.errors) / elapsed if elapsed else 0.0,
+        "status_codes": recorder.status_codes,
+        "latency": _summary(recorder.latency),
+        "service_time": _summary(recorder.service_time),
+    }
+
+
+def format_results(results: dict) -> str:
+    """format benchmark results for the terminal"""
+    lines = [
+        f"{results['mode']}-loop benchmark of {results['host']}",
+        f"requests: {results['requests']} in {results['duration']:.2f}s, "
+        f"throughput: {results['throughput']:.1f} req/s, "
+        f"error rate: {results['error_rate']:.2%}",
+    ]
+    for name in ("latency", "service_time"):
+        summary = results[name]
+        percentiles = ", ".join(
+            f"{quantile}: {summary[quantile] * 1000:.2f}ms"
+            for quantile in ("p50", "p90", "p99", "p999")
+        )
+        lines.append(
+            f"{name}: mean: {summary['mean'] * 1000:.2f}ms, {percentiles}, "
+            f"max: {summary['max'] * 1000:.2f}ms"
+        )
+    return "\n".join(lines)
@@ -4,12 +4,90 @@ import json
 import csv
 from pathlib import Path
 import requests
+from requests.adapters import HTTPAdapter
 from PIL import Image
 
+from mldock.platform_helpers.mldock.inference import compression
+
+_DEFAULT_CLIENT = None
+
+
+class PredictClient:
+    """
+    Reusable predict client, keeping connections to the model server alive
+    in a pool instead of opening a new connection for every request.
+
+    e.g.
+        with PredictClient(pool_size=4, read_timeout=30) as client:
+            for request in requests_:
+                handle_prediction(host, request, client=client)
+    """
+
+    def __init__(
+        self,
+        pool_size: int = 10,
+        connect_timeout: float = 10.0,
+        read_timeout: float = None,
+    ):
+        """
+        args:
+            pool_size (int): maximum number of connections kept alive per host
+            connect_timeout (float): (Optional) seconds to wait to establish a connection
+            read_timeout (float): (Optional) seconds to wait for a response. Defaults to no timeout.
+        """
+        self.timeout = (connect_timeout, read_timeout)
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+
+    def post(self, url, headers, data):
+        """send a POST request over a pooled connection"""
+        return self.session.post(
+            url=url, headers=headers, data=data, timeout=self.timeout
+        )
+
+    def close(self):
+        """close the pooled connections"""
+        self.session.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+def default_client():
+    """return the module's shared predict client, creating it on first use"""
+    global _DEFAULT_CLIENT  # pylint: disable=global-statement
+    if _DEFAULT_CLIENT is None:
+        _DEFAULT_CLIENT = PredictClient()
+    return _DEFAULT_CLIENT
+
 
 def execute_request(url, headers, data):
-    """compiles and executes request to API"""
-    return requests.post(url=url, headers=headers, data=data)
+    """compiles and executes request to API, over the shared pooled client"""
+    return default_client().post(url=url, headers=headers, data=data)
+
+
+def send_request(url, headers, data, client=None):
+    """executes request to API, over client if given"""
+    if client is None:
+        return execute_request(url=url, headers=headers, data=data)
+    return client.post(url=url, headers=headers, data=data)
+
+
+def compress_request_data(data, headers, content_encoding=None):
+    """compress request data with content_encoding, adding the Content-Encoding header"""
+    if content_encoding is None:
+        return data
+
+    if hasattr(data, "read"):
+        data = data.read()
+
+    headers.update({"Content-Encoding": content_encoding})
+    return compression.compress(data, content_encoding)
 
 
 def save_bytes_as_png(bytes_img, filepath):
@@ -43,7 +121,13 @@ def send_json(data, host, **kwargs):
 
     headers.update({"Content-Type": "application/json"})
 
-    response = execute_request(url=host, headers=headers, data=json.dumps(data))
+    data = compress_request_data(
+        json.dumps(data), headers, content_encoding=kwargs.get("content_encoding")
+    )
+
+    response = send_request(
+        url=host, headers=headers, data=data, client=kwargs.get("client")
+    )
     if response.status_code != 200:
         raise requests.exceptions.RequestException(
             "error ({}): {}".format(response.status_code, response.raise_for_status())
@@ -61,7 +145,13 @@ def send_csv(data, host, **kwargs):
 
     headers.update({"Content-Type": "text/csv"})
 
-    response = execute_request(url=host, headers=headers, data=data)
+    data = compress_request_data(
+        data, headers, content_encoding=kwargs.get("content_encoding")
+    )
+
+    response = send_request(
+        url=host, headers=headers, data=data, client=kwargs.get("client")
+    )
 
     if response.status_code != 200:
         raise requests.exceptions.RequestException(
@@ -79,7 +169,13 @@ def send_image_jpeg(data, host, **kwargs):
 
     headers.update({"Content-Type": "image/jpeg"})
 
-    response = execute_request(url=host, headers=headers, data=data)
+    data = compress_request_data(
+        data, headers, content_encoding=kwargs.get("content_encoding")
+    )
+
+    response = send_request(
+        url=host, headers=headers, data=data, client=kwargs.get("client")
+    )
 
     if response.status_code != 200:
         raise requests.exceptions.RequestException(
@@ -153,13 +249,20 @@ def handle_prediction(
     response_content_type: str = "application/json",
     **kwargs
 ):
-    """handles prediction workflow from handling the request to handling the response"""
+    """
+    handles prediction workflow from handling the request to handling the response
+
+    note:
+        - pass client=PredictClient(...) to reuse its connections across calls
+    """
     # handle request (load to obj, convert, send, get response)
     response_obj = handle_request(
         host=host,
         file_path=request,
         content_type=request_content_type,
         headers=kwargs.get("headers"),
+        content_encoding=kwargs.get("content_encoding"),
+        client=kwargs.get("client"),
     )
 
     # handle reponse (write file, print to terminal)
@@ -9,6 +9,7 @@ import click
 
 from mldock.config_managers.cli import CliConfigureManager
 import mldock.api.predict as predict_request
+import mldock.api.benchmark as benchmark_request
 from mldock.terminal import (
     ChoiceWithNumbers,
     style_dropdown,
@@ -193,6 +194,12 @@ def build(project_directory, no_cache, tag, stage):
     type=click.STRING,
     multiple=True,
 )
+@click.option(
+    "--content-encoding",
+    help="(Optional) compress payload with content encoding",
+    type=click.Choice(["gzip", "zstd"], case_sensitive=False),
+    default=None,
+)
 def predict(payload, host, **kwargs):
     """
     Command to execute prediction request against ml endpoint
@@ -219,10 +226,130 @@ def predict(payload, host, **kwargs):
                     "response_content_type", "application/json"
                 ),
                 headers=headers,
+                content_encoding=kwargs.get("content_encoding"),
             )
             logger.info(pretty_output)
 
 
+@click.command()
+@click.option(
+    "--payloads",
+    help="Path to directory of payloads, content types are taken from file extensions",
+    required=True,
+    type=click.Path(
+        exists=True,
+        file_okay=False,
+        dir_okay=True,
+        writable=False,
+        readable=True,
+        resolve_path=False,
+        allow_dash=False,
+        path_type=None,
+    ),
+)
+@click.option(
+    "--host",
+    help="host url at which model is served",
+    type=str,
+    default="http://127.0.0.1:8080/invocations",
+)
+@click.option(
+    "--mode",
+    help="closed: concurrent workers send back to back, open: send at a target rate",
+    type=click.Choice(["closed", "open"], case_sensitive=False),
+    default="closed",
+)
+@click.option(
+    "--concurrency",
+    help="concurrent workers, the maximum requests in flight in open mode",
+    type=int,
+    default=4,
+)
+@click.option(
+    "--rate",
+    help="(Optional) target requests per second, required in open mode",
+    type=float,
+    default=None,
+)
+@click.option(
+    "--duration", help="seconds to run the benchmark for", type=float, default=30.0
+)
+@click.option(
+    "--max-requests",
+    help="(Optional) stop after this many requests",
+    type=int,
+    default=None,
+)
+@click.option(
+    "--expected-interval-ms",
+    help="(Optional) expected milliseconds between requests of a closed mode worker, "
+    "corrects latencies for coordinated omission",
+    type=float,
+    default=None,
+)
+@click.option(
+    "--headers",
+    help="(Optional) Authentication to use for request",
+    type=click.STRING,
+    multiple=True,
+)
+@click.option(
+    "--content-encoding",
+    help="(Optional) compress payloads with content encoding",
+    type=click.Choice(["gzip", "zstd"], case_sensitive=False),
+    default=None,
+)
+@click.option(
+    "--output",
+    help="(Optional) Path to save results as json",
+    type=click.Path(
+        exists=False,
+        file_okay=True,
+        dir_okay=False,
+        writable=True,
+        resolve_path=False,
+        allow_dash=False,
+        path_type=None,
+    ),
+)
+def benchmark(payloads, host, **kwargs):
+    """
+    Command to benchmark throughput and latency of ml endpoint
+    """
+    headers = {}
+
+    for header in kwargs.get("headers"):
+        headers.update(json.loads(header))
+
+    expected_interval = kwargs.get("expected_interval_ms")
+    if expected_interval is not None:
+        expected_interval = expected_interval / 1000.0
+
+    try:
+        with ProgressLogger(group="Benchmark", text="Running Requests", spinner="dots"):
+            results = benchmark_request.run_benchmark(
+                host=host,
+                payloads=benchmark_request.load_payloads(
+                    payloads, content_encoding=kwargs.get("content_encoding")
+                ),
+                mode=kwargs.get("mode"),
+                concurrency=kwargs.get("concurrency"),
+                rate=kwargs.get("rate"),
+                duration=kwargs.get("duration"),
+                max_requests=kwargs.get("max_requests"),
+                expected_interval=expected_interval,
+                headers=headers,
+            )
+    except ValueError as exception:
+        raise click.BadParameter(str(exception))
+
+    logger.info(benchmark_request.format_results(results))
+    if kwargs.get("output") is not None:
+        with open(kwargs.get("output"), "w") as file_:
+            json.dump(results, file_, indent=2)
+        logger.info(f"Results saved to {kwargs.get('output')}")
+
+
 @click.command()
 @click.option(
     "--project_directory",
@@ -552,6 +679,7 @@ def add_commands(cli_group: click.group):
     """
     cli_group.add_command(build)
     cli_group.add_command(predict)
+    cli_group.add_command(benchmark)
     cli_group.add_command(train)
     cli_group.add_command(deploy)
     cli_group.add_command(stop)
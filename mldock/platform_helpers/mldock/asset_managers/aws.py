@@ -2,6 +2,7 @@ import s3fs
 from mldock.platform_helpers.mldock.asset_managers.base import BaseEnvArtifactManager
 from mldock.platform_helpers.mldock.storage.pyarrow import (
     download_assets,
+    get_assets_version,
     upload_assets,
 )
 
@@ -32,3 +33,12 @@ class S3EnvArtifactManager(BaseEnvArtifactManager):
             local_path=local_path,
             storage_location=storage_location,
         )
+
+    @staticmethod
+    def assets_version(fs_base_path, storage_location):
+        file_system = s3fs.S3FileSystem()
+        return get_assets_version(
+            file_system,
+            fs_base_path=fs_base_path,
+            storage_location=storage_location,
+        )
@@ -1,4 +1,5 @@
 import abc
+import hashlib
 from pathlib import Path
 import logging
 
@@ -32,6 +33,12 @@ class BaseEnvArtifactManager(abc.ABC):
     def upload_assets(**kwargs):
         raise NotImplementedError("Must implement a upload assets functionality")
 
+    @staticmethod
+    def assets_version(fs_base_path, storage_location):
+        """(Optional) size and version tag (e.g. ETag) per remote asset, None if unsupported"""
+        # pylint: disable=unused-argument
+        return None
+
     def setup_inputs(self):
         """Iterates and downloads assets remoate -> input channels"""
         logger.debug(
@@ -104,11 +111,15 @@ class BaseEnvArtifactManager(abc.ABC):
                     )
                 )
 
-    def setup_model_artifacts(self):
-        """Iterates and downloads assets remoate -> model channel"""
-        logger.debug(
-            "Setup model assets in {}".format(self.custom_environment.model_dir)
-        )
+    def setup_model_artifacts(self, model_dir: str = None):
+        """Iterates and downloads assets remoate -> model channel
+
+        args:
+            model_dir (str): (Optional) directory to download in to, e.g. a staging
+                directory of a new model version. Defaults to the model channel.
+        """
+        model_dir = model_dir or self.custom_environment.model_dir
+        logger.debug("Setup model assets in {}".format(model_dir))
         # only fetch channels of environment prefix MLDOCK_MODEL_INPUT_CHANNEL_
         channels = self.custom_environment.get_model_input_channel_iter()
 
@@ -119,7 +130,7 @@ class BaseEnvArtifactManager(abc.ABC):
             channel_path = (
                 channel["key"].replace("MLDOCK_MODEL_INPUT_CHANNEL_", "").lower()
             )
-            local_channel_path = Path(self.custom_environment.model_dir, channel_path)
+            local_channel_path = Path(model_dir, channel_path)
             try:
                 path_without_scheme = utils.strip_scheme(channel["value"])
                 self.download_assets(
@@ -137,6 +148,24 @@ class BaseEnvArtifactManager(abc.ABC):
                     )
                 )
 
+    def model_artifacts_version(self):
+        """Fingerprint of the remote model channels from the sizes and version tags
+        (e.g. ETags) of their assets, without downloading them
+
+        return:
+            str: fingerprint, None if assets_version is unsupported
+        """
+        digest = hashlib.blake2b(digest_size=16)
+        for channel in self.custom_environment.get_model_input_channel_iter():
+            versions = self.assets_version(
+                fs_base_path=utils.strip_scheme(channel["value"]),
+                storage_location=".",
+            )
+            if versions is None:
+                return None
+            digest.update(repr((channel["key"], sorted(versions, key=str))).encode())
+        return digest.hexdigest()
+
     def cleanup_model_artifacts(self):
         """Iterates and uploads from model channel -> remote"""
         logger.debug(
@@ -2,6 +2,7 @@ import gcsfs
 from mldock.platform_helpers.mldock.asset_managers.base import BaseEnvArtifactManager
 from mldock.platform_helpers.mldock.storage.pyarrow import (
     download_assets,
+    get_assets_version,
     upload_assets,
 )
 
@@ -32,3 +33,12 @@ class GCSEnvArtifactManager(BaseEnvArtifactManager):
             local_path=local_path,
             storage_location=storage_location,
         )
+
+    @staticmethod
+    def assets_version(fs_base_path, storage_location):
+        file_system = gcsfs.GCSFileSystem()
+        return get_assets_version(
+            file_system,
+            fs_base_path=fs_base_path,
+            storage_location=storage_location,
+        )
@@ -4,10 +4,18 @@
     Implements workflows based on the environment and GCP specific code to
     download and upload ML assets e.g. Input data, Models and output data
 """
-from functools import wraps
+import asyncio
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from functools import partial, wraps
+import os
+import threading
+import time
 import traceback
 from pathlib import Path
 
+from mldock.platform_helpers.mldock.inference.headers import content_type_for_path
+from mldock.platform_helpers.mldock.model_service.decorators import write_failure
+
 
 class BaseTrainingContainer:
     """
@@ -60,17 +68,8 @@ class BaseTrainingContainer:
                     *args, self.container_environment, self.container_logger, **kwargs
                 )
             except Exception as exception:
-                # Write out an error file. This will be returned as the failureReason in the
-                # DescribeTrainingJob result.
-                trc = traceback.format_exc()
-                log_file_path = Path(
-                    self.container_environment.output_data_dir, "failure"
-                )
-                with open(log_file_path, "w") as file_:
-                    file_.write(f"Exception during training: {str(exception)}\n{trc}")
-                # Printing this causes the exception to be in the training job logs, as well.
-                self.container_logger.error(
-                    f"Exception during training: {str(exception)}\n{trc}"
+                write_failure(
+                    exception, self.container_environment, self.container_logger
                 )
                 raise
             finally:
@@ -85,9 +84,79 @@ class BaseServingContainer:
     between worker starts & completes
     """
 
-    def __init__(self, container_environment, container_logger):
+    warmup_dir_name = "warmup"
+
+    def __init__(self, container_environment, container_logger, **kwargs):
+        """
+        args:
+            container_environment: environment
+            container_logger: logger
+            executor_workers (int): (Optional) size of the executor running CPU-bound
+                stages. Defaults to MLDOCK_EXECUTOR_WORKERS or the cpu count.
+            executor_type (str): (Optional) "thread" or "process", overrides
+                MLDOCK_EXECUTOR_TYPE. Defaults to MLDOCK_EXECUTOR_TYPE or "thread".
+
+        note:
+            - process executors run functions in child processes, which do not share
+              this process' loaded model, metrics or caches, e.g. the serving templates
+              run a thread executor.
+        """
         self.container_environment = container_environment
         self.container_logger = container_logger
+        self.ready = False
+        self.warmup_duration = None
+        self.load_state = "starting"
+        self.load_progress = 0.0
+        self.load_duration = None
+        self.load_error = None
+        self._load_thread = None
+        self._hot_swap_models = []
+        self.executor_workers = kwargs.get("executor_workers")
+        self.executor_type = kwargs.get("executor_type")
+        self._executor = None
+
+    @property
+    def executor(self):
+        """bounded executor running CPU-bound stages off the event loop, created on first use"""
+        if self._executor is None:
+            env = self.container_environment.environment_variables
+            if self.executor_workers is None:
+                self.executor_workers = env.int(
+                    "MLDOCK_EXECUTOR_WORKERS", os.cpu_count() or 1
+                )
+            env_executor_type = env.str("MLDOCK_EXECUTOR_TYPE", None)
+            if self.executor_type is None:
+                self.executor_type = env_executor_type or "thread"
+            elif env_executor_type not in (None, self.executor_type):
+                self.container_logger.warning(
+                    f"Ignoring MLDOCK_EXECUTOR_TYPE={env_executor_type}, "
+                    f"this container runs a {self.executor_type} executor"
+                )
+
+            if self.executor_type == "process":
+                self._executor = ProcessPoolExecutor(max_workers=self.executor_workers)
+            elif self.executor_type == "thread":
+                self._executor = ThreadPoolExecutor(
+                    max_workers=self.executor_workers,
+                    thread_name_prefix="mldock-executor",
+                )
+            else:
+                raise ValueError(
+                    f"Unsupported executor type '{self.executor_type}', "
+                    "expected 'thread' or 'process'"
+                )
+            self.container_logger.info(
+                f"Started {self.executor_type} executor "
+                f"with {self.executor_workers} worker(s)"
+            )
+        return self._executor
+
+    async def run_in_executor(self, function, *args, **kwargs):
+        """run a CPU-bound function in the executor and await its result"""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(
+            self.executor, partial(function, *args, **kwargs)
+        )
 
     def startup_worker(self):
         """steps to execute when a new worker starts an execution"""
@@ -107,10 +176,192 @@ class BaseServingContainer:
             self.container_environment.setup_model_artifacts()
         self.container_logger.info("Setup Complete")
 
+    @property
+    def warmup_dir(self):
+        """path to warm-up payloads in the model channel"""
+        return Path(self.container_environment.model_dir, self.warmup_dir_name)
+
+    def load_warmup_payloads(self):
+        """
+        Load example payloads from the warm-up directory in the model channel.
+        The request content type is inferred from the file extension.
+
+        return:
+            list: (content_type, payload bytes) tuples
+        """
+        payloads = []
+        if not self.warmup_dir.is_dir():
+            return payloads
+
+        for path in sorted(self.warmup_dir.iterdir()):
+            content_type = content_type_for_path(path)
+            if content_type is None:
+                self.container_logger.info(
+                    f"Skipping warm-up payload with unknown content type: {path.name}"
+                )
+                continue
+            payloads.append((content_type, path.read_bytes()))
+        return payloads
+
+    def warmup(self, invoke, iterations: int = None):
+        """
+        Run example payloads through the full decode/predict/encode path,
+        then mark the container as ready to serve.
+
+        args:
+            invoke (callable): invoke(payload, content_type), runs a request end to end
+            iterations (int): times each payload is run.
+                Defaults to MLDOCK_WARMUP_ITERATIONS or 1.
+        """
+        if iterations is None:
+            iterations = self.container_environment.environment_variables.int(
+                "MLDOCK_WARMUP_ITERATIONS", 1
+            )
+
+        payloads = self.load_warmup_payloads()
+        self.container_logger.info(f"Warming up with {len(payloads)} payload(s)")
+
+        # pylint: disable=import-outside-toplevel
+        from mldock.platform_helpers.mldock.inference.codecs import (
+            UnsupportedContentType,
+        )
+
+        start = time.perf_counter()
+        for content_type, payload in payloads:
+            try:
+                for _ in range(iterations):
+                    invoke(payload, content_type)
+            except UnsupportedContentType as exception:
+                # e.g. images, without an image decoder registered
+                self.container_logger.warning(
+                    f"Skipping warm-up payload without a decoder: {exception}"
+                )
+        self.warmup_duration = time.perf_counter() - start
+
+        self.container_logger.info(f"Warm-up complete in {self.warmup_duration:.3f}s")
+        self.ready = True
+
+    def report_load_progress(self, progress: float):
+        """
+        Report model loading progress, e.g. from a load function reading large artifacts.
+
+        args:
+            progress (float): fraction loaded, between 0 and 1
+        """
+        self.load_progress = min(max(float(progress), 0.0), 1.0)
+
+    def _load(self, load, invoke=None):
+        """load the model, then warm up and mark the container as ready"""
+        self.load_state = "loading"
+        self.container_logger.info("Loading model")
+        start = time.perf_counter()
+        try:
+            load()
+            self.load_duration = time.perf_counter() - start
+            self.load_progress = 1.0
+            self.container_logger.info(f"Model loaded in {self.load_duration:.3f}s")
+            if invoke is None:
+                self.ready = True
+            else:
+                self.warmup(invoke)
+            self.load_state = "ready"
+        except Exception as exception:  # pylint: disable=broad-except
+            self.load_duration = time.perf_counter() - start
+            self.load_error = f"{str(exception)}\n{traceback.format_exc()}"
+            self.load_state = "failed"
+            self.container_logger.error(
+                f"Exception during model loading: {self.load_error}"
+            )
+
+    def load_in_background(self, load, invoke=None):
+        """
+        Load the model in a background thread so the server can answer health
+        checks while it loads. The container becomes ready once loading, and the
+        warm-up with invoke if given, complete.
+
+        args:
+            load (callable): load(), loads the model
+            invoke (callable): (Optional) invoke(payload, content_type), used to warm up
+        return:
+            threading.Thread: the loading thread
+        """
+        self._load_thread = threading.Thread(
+            target=self._load,
+            args=(load, invoke),
+            name="mldock-model-loader",
+            daemon=True,
+        )
+        self._load_thread.start()
+        return self._load_thread
+
+    def wait_until_ready(self, timeout: float = None) -> bool:
+        """
+        Block until background loading completes.
+
+        args:
+            timeout (float): (Optional) seconds to wait
+        return:
+            bool: whether the container is ready
+        """
+        if self._load_thread is not None:
+            self._load_thread.join(timeout)
+        return self.ready
+
+    def status(self) -> dict:
+        """liveness report on model loading state, progress and durations"""
+        return {
+            "state": self.load_state,
+            "ready": self.ready,
+            "load_progress": self.load_progress,
+            "load_duration": self.load_duration,
+            "warmup_duration": self.warmup_duration,
+        }
+
+    def watch_model(
+        self, model, interval: float = None, sync=None, remote_version=None
+    ):
+        """
+        Hot-swap new model versions, see HotSwapModel.poll.
+
+        e.g.
+            serving_container.watch_model(
+                model,
+                sync=artifact_manager.setup_model_artifacts,
+                remote_version=artifact_manager.model_artifacts_version,
+            )
+
+        args:
+            model (HotSwapModel): model serving traffic
+            interval (float): seconds between polls.
+                Defaults to MLDOCK_MODEL_WATCH_INTERVAL, 0 disables watching.
+            sync (callable): (Optional) sync(target_dir), downloads new versions from the
+                remote model channels in to a staging directory. Without sync, model_dir is watched.
+            remote_version (callable): (Optional) remote_version(), fingerprint of the remote
+                model channels, skips downloads of unchanged versions
+        return:
+            bool: whether the model is watched
+        """
+        if interval is None:
+            interval = self.container_environment.environment_variables.float(
+                "MLDOCK_MODEL_WATCH_INTERVAL", 0
+            )
+        if not interval:
+            return False
+        self.container_logger.info(f"Watching for new model versions every {interval}s")
+        model.watch(interval=interval, sync=sync, remote_version=remote_version)
+        self._hot_swap_models.append(model)
+        return True
+
     def cleanup(self):
         """steps to execute when the machine shuts down"""
         # (Optional) instantiate super cleanup to maintain bases functionality
         self.container_logger.info("cleaning instance")
+        for model in self._hot_swap_models:
+            model.stop()
+        self._hot_swap_models = []
+        if self._executor is not None:
+            self._executor.shutdown(wait=True)
+            self._executor = None
 
     def cleanup_worker(self):
         """steps to execute when a new worker completes an execution"""
@@ -131,20 +382,60 @@ class BaseServingContainer:
                     *args, self.container_environment, self.container_logger, **kwargs
                 )
             except Exception as exception:
-                # Write out an error file. This will be returned as the failureReason in the
-                # DescribeTrainingJob result.
-                trc = traceback.format_exc()
-                log_file_path = Path(
-                    self.container_environment.output_data_dir, "failure"
-                )
-                with open(log_file_path, "w") as file_:
-                    file_.write(f"Exception during training: {str(exception)}\n{trc}")
-                # Printing this causes the exception to be in the training job logs, as well.
-                self.container_logger.error(
-                    f"Exception during training: {str(exception)}\n{trc}"
+                write_failure(
+                    exception, self.container_environment, self.container_logger
                 )
                 raise
             finally:
                 self.cleanup_worker()
 
         return func_wrapper
+
+    def wrap_async(self, function):
+        """
+        async execution handler for serving container worflow.
+
+        Coroutine functions (I/O-bound stages) are awaited natively, regular
+        functions (CPU-bound stages) are run in the bounded executor, so the
+        event loop keeps serving /ping and other requests meanwhile.
+
+        note:
+            - process executors can only run module level functions, use
+              run_in_executor with those instead.
+        """
+        if asyncio.iscoroutinefunction(function):
+
+            @wraps(function)
+            async def coroutine_wrapper(*args, **kwargs):
+                """
+                Wrapper coroutine to decorate coroutine function
+                """
+                try:
+                    self.startup_worker()
+
+                    return await function(
+                        *args,
+                        self.container_environment,
+                        self.container_logger,
+                        **kwargs,
+                    )
+                except Exception as exception:
+                    write_failure(
+                        exception, self.container_environment, self.container_logger
+                    )
+                    raise
+                finally:
+                    self.cleanup_worker()
+
+            return coroutine_wrapper
+
+        wrapped_function = self.wrap(function)
+
+        @wraps(function)
+        async def executor_wrapper(*args, **kwargs):
+            """
+            Wrapper coroutine running the decorated function in the executor
+            """
+            return await self.run_in_executor(wrapped_function, *args, **kwargs)
+
+        return executor_wrapper
@@ -170,12 +170,14 @@ class BaseEnvironment:
         pass
 
     @staticmethod
-    def setup_model_artifacts():
+    def setup_model_artifacts(model_dir: str = None):
         """Iterates and downloads assets remoate -> model channel
+        args:
+            model_dir (str): (Optional) directory to download in to. Defaults to the model channel.
         return:
             None
         """
-        # pylint: disable=unnecessary-pass
+        # pylint: disable=unused-argument,unnecessary-pass
         pass
 
     @staticmethod
@@ -0,0 +1,199 @@
+"""
+    CODEC REGISTRY
+
+    Maps request Content-Type and Accept headers to content decoders and encoders,
+    so serving apps can dispatch on the wire format with a single table lookup.
+
+    e.g.
+        registry = default_codec_registry()
+        decoder = registry.decoder_for(request.headers.get("content-type"))
+        media_type, encoder = registry.encoder_for(request.headers.get("accept"))
+        streaming_encoder = registry.streaming_encoder_for(media_type)
+"""
+from functools import lru_cache
+
+from mldock.platform_helpers.mldock.inference.headers import (
+    normalize_media_type,
+    parse_accept_header,
+)
+from mldock.platform_helpers.mldock.inference.content_decoders import (
+    numpy as numpy_decoders,
+    pyarrow as arrow_decoders,
+)
+from mldock.platform_helpers.mldock.inference.content_encoders import (
+    numpy as numpy_encoders,
+    pyarrow as arrow_encoders,
+)
+
+NEGOTIATION_CACHE_SIZE = 256
+
+
+class UnsupportedContentType(Exception):
+    """Raised when no decoder is registered for a request Content-Type"""
+
+
+class NotAcceptable(Exception):
+    """Raised when no registered encoder satisfies a request Accept header"""
+
+
+class CodecRegistry:
+    """
+    Dispatch table of content decoders (keyed by Content-Type) and content
+    encoders (keyed by Accept). Encoders registered first are preferred when
+    a client accepts a wildcard media range.
+    """
+
+    def __init__(self):
+        self.decoders = {}
+        self.encoders = {}
+        self.streaming_encoders = {}
+        self._negotiate = lru_cache(maxsize=NEGOTIATION_CACHE_SIZE)(
+            self._negotiate_encoder
+        )
+
+    def register_decoder(self, content_type: str, decoder):
+        """Register a decoder, a callable taking the request body, for a Content-Type"""
+        self.decoders[normalize_media_type(content_type)] = decoder
+
+    def register_encoder(self, content_type: str, encoder, streaming_encoder=None):
+        """
+        Register an encoder, a callable returning the response body, for a media type.
+
+        args:
+            content_type (str): media type
+            encoder (callable): returns the encoded response body
+            streaming_encoder (callable): (Optional) returns an iterator of response body
+                chunks, so large responses can be streamed without holding the full body
+        """
+        media_type = normalize_media_type(content_type)
+        self.encoders[media_type] = encoder
+        if streaming_encoder is not None:
+            self.streaming_encoders[media_type] = streaming_encoder
+        else:
+            self.streaming_encoders.pop(media_type, None)
+        self._negotiate.cache_clear()
+
+    def decoder_for(self, content_type: str):
+        """
+        Look up the decoder for a request Content-Type header.
+
+        args:
+            content_type (str): request Content-Type header
+        return:
+            callable: decoder
+        """
+        try:
+            return self.decoders[normalize_media_type(content_type or "")]
+        except KeyError as exception:
+            raise UnsupportedContentType(
+                "Unsupported Content-Type '{}'. Supported: {}".format(
+                    content_type, ", ".join(self.decoders)
+                )
+            ) from exception
+
+    def encoder_for(self, accept: str = None, default: str = None):
+        """
+        Negotiate the encoder for a request Accept header.
+
+        Negotiation results are cached per (accept, default) pair, so repeat
+        requests cost a single dictionary lookup.
+
+        args:
+            accept (str): request Accept header. A missing header accepts anything.
+            default (str): media type preferred for wildcard ranges, e.g. the
+                request Content-Type.
+        return:
+            tuple: (media type, encoder)
+        """
+        media_type = self._negotiate(
+            accept or "*/*", normalize_media_type(default) if default else None
+        )
+        return media_type, self.encoders[media_type]
+
+    def streaming_encoder_for(self, media_type: str):
+        """
+        Look up the streaming encoder of a negotiated media type.
+
+        args:
+            media_type (str): media type returned by encoder_for
+        return:
+            callable: streaming encoder, None if the media type has none
+        """
+        return self.streaming_encoders.get(media_type)
+
+    def _negotiate_encoder(self, accept: str, default: str = None) -> str:
+        """
+        select the registered media type best matching the Accept header.
+
+        Each media type takes the q-value of the most specific range matching it
+        (RFC 7231), so e.g. "text/*;q=0, */*" refuses text/csv. Ties go to the
+        more specific range, then the default, then registration order.
+        """
+        media_ranges = parse_accept_header(accept)
+        candidates = list(self.encoders)
+        if default in self.encoders:
+            candidates.remove(default)
+            candidates.insert(0, default)
+
+        best, best_rank = None, None
+        for preference, media_type in enumerate(candidates):
+            match = None
+            for position, (media_range, quality) in enumerate(media_ranges):
+                if media_range == "*/*":
+                    specificity = 0
+                elif media_range.endswith("/*"):
+                    if not media_type.startswith(media_range[:-1]):
+                        continue
+                    specificity = 1
+                elif media_range == media_type:
+                    specificity = 2
+                else:
+                    continue
+                if match is None or specificity > match[0]:
+                    match = (specificity, quality, position)
+            if match is None or match[1] <= 0:
+                continue
+            rank = (-match[1], match[2], preference)
+            if best_rank is None or rank < best_rank:
+                best, best_rank = media_type, rank
+        if best is not None:
+            return best
+
+        raise NotAcceptable(
+            "Not Acceptable '{}'. Supported: {}".format(
+                accept, ", ".join(self.encoders)
+            )
+        )
+
+
+def default_codec_registry():
+    """
+    Build a registry with the numpy content decoders and encoders shipped by mldock.
+
+    return:
+        CodecRegistry: registry for application/json, text/csv, application/x-npy,
+            application/vnd.apache.arrow.stream and application/vnd.apache.parquet
+            (decode only). text/csv responses can be streamed.
+    """
+    registry = CodecRegistry()
+    registry.register_decoder("application/json", numpy_decoders.json_to_numpy)
+    registry.register_decoder("text/csv", numpy_decoders.csv_to_numpy)
+    registry.register_decoder("application/x-npy", numpy_decoders.npy_to_numpy)
+    registry.register_decoder(
+        "application/vnd.apache.arrow.stream", arrow_decoders.arrow_stream_to_numpy
+    )
+    registry.register_decoder(
+        "application/vnd.apache.parquet", numpy_decoders.parquet_to_numpy
+    )
+
+    registry.register_encoder("application/json", numpy_encoders.array_to_json_bytes)
+    registry.register_encoder(
+        "text/csv",
+        numpy_encoders.array_to_csv,
+        streaming_encoder=numpy_encoders.array_to_csv_chunks,
+    )
+    registry.register_encoder("application/x-npy", numpy_encoders.array_to_npy)
+    registry.register_encoder(
+        "application/vnd.apache.arrow.stream", arrow_encoders.array_to_arrow_stream
+    )
+    return registry
@@ -0,0 +1,291 @@
+"""
+    CONTENT ENCODING (COMPRESSION) UTILITIES
+
+    Handle streaming decompression of request bodies according to the
+    Content-Encoding header (before codec dispatch) and compression of
+    response bodies according to the Accept-Encoding header.
+
+    e.g.
+        body = decompress(body, request.headers.get("content-encoding"))
+        encoding = negotiate_content_encoding(request.headers.get("accept-encoding"))
+
+    note:
+        - zstd requires the optional zstandard package.
+        - decompression is bounded by max_size, raising PayloadTooLarge on
+          compression bombs before their output is held in memory.
+"""
+import zlib
+
+from mldock.platform_helpers.mldock.inference.headers import parse_accept_header
+
+IDENTITY = "identity"
+GZIP = "gzip"
+ZSTD = "zstd"
+DECOMPRESS_CHUNK_SIZE = 1 << 20
+# minimum payload size worth compressing, in bytes
+MIN_COMPRESS_SIZE = 1024
+# default limit of a decompressed request body, in bytes
+MAX_DECOMPRESSED_SIZE = 100 * 1024 * 1024
+
+
+class UnsupportedContentEncoding(Exception):
+    """Raised when a Content-Encoding is not supported"""
+
+
+class PayloadTooLarge(Exception):
+    """Raised when a body decompresses to more than the maximum size"""
+
+
+def _zstandard():
+    """import the optional zstandard package"""
+    try:
+        # pylint: disable=import-outside-toplevel
+        import zstandard
+
+        return zstandard
+    except ImportError as exception:
+        raise UnsupportedContentEncoding(
+            "zstd content encoding requires the zstandard package. "
+            "Install with: pip install zstandard"
+        ) from exception
+
+
+def _probe_encodings() -> tuple:
+    """content encodings whose packages are installed, in order of preference"""
+    try:
+        _zstandard()
+        return (ZSTD, GZIP)
+    except UnsupportedContentEncoding:
+        return (GZIP,)
+
+
+# probed once, a failed import of zstandard per request is costly
+SUPPORTED_ENCODINGS = _probe_encodings()
+
+
+def supported_encodings() -> list:
+    """
+    List the content encodings supported in this environment, in order of preference.
+
+    Returns:
+        (list): content encodings
+    """
+    return list(SUPPORTED_ENCODINGS)
+
+
+def _parse_content_encoding(content_encoding: str) -> list:
+    """split a Content-Encoding header in to codings, in the order they were applied"""
+    if not content_encoding:
+        return []
+    return [
+        coding.strip().lower()
+        for coding in content_encoding.split(",")
+        if coding.strip() and coding.strip().lower() != IDENTITY
+    ]
+
+
+class _ChunkReader:
+    """file-like reader of an iterable of chunks"""
+
+    def __init__(self, chunks):
+        self._chunks = iter(chunks)
+
+    def read(self, size=-1):  # pylint: disable=unused-argument
+        """return the next chunk, or b"" when exhausted"""
+        return next(self._chunks, b"")
+
+
+def _limit_size(chunks, max_size: int):
+    """pass chunks through, raising PayloadTooLarge once more than max_size bytes are seen"""
+    size = 0
+    for chunk in chunks:
+        size += len(chunk)
+        if size > max_size:
+            raise PayloadTooLarge(
+                "Decompressed body exceeds the maximum size of {} bytes".format(
+                    max_size
+                )
+            )
+        yield chunk
+
+
+def _iter_decompress_coding(chunks, coding: str):
+    """incrementally decompress chunks encoded with a single coding"""
+    if coding in (GZIP, "x-gzip"):
+        # 16 + MAX_WBITS expects a gzip header and trailer
+        decompressor = zlib.decompressobj(16 + zlib.MAX_WBITS)
+        for chunk in chunks:
+            data = decompressor.decompress(chunk, DECOMPRESS_CHUNK_SIZE)
+            while data:
+                yield data
+                data = decompressor.decompress(
+                    decompressor.unconsumed_tail, DECOMPRESS_CHUNK_SIZE
+                )
+        data = decompressor.flush()
+        if data:
+            yield data
+    elif coding == ZSTD:
+        # output is produced at most DECOMPRESS_CHUNK_SIZE bytes at a time
+        yield from _zstandard().ZstdDecompressor().read_to_iter(
+            _ChunkReader(chunks), write_size=DECOMPRESS_CHUNK_SIZE
+        )
+    else:
+        raise UnsupportedContentEncoding(
+            "Unsupported Content-Encoding '{}'. Supported: {}".format(
+                coding, ", ".join(supported_encodings())
+            )
+        )
+
+
+def iter_decompress(chunks, content_encoding: str = None, max_size: int = None):
+    """
+    Incrementally decompress an iterable of body chunks.
+
+    Args:
+        chunks (Iterable[bytes]): compressed body chunks, e.g. a streamed request body.
+        content_encoding (str): Content-Encoding header. None or identity is a no-op.
+        max_size (int): (Optional) maximum decompressed size in bytes, PayloadTooLarge
+            is raised when exceeded. Defaults to no limit.
+    Returns:
+        (Iterator[bytes]): decompressed body chunks.
+    """
+    codings = _parse_content_encoding(content_encoding)
+    # codings are listed in the order they were applied, so undo them in reverse
+    for coding in reversed(codings):
+        chunks = _iter_decompress_coding(chunks, coding)
+    if codings and max_size is not None:
+        chunks = _limit_size(chunks, max_size)
+    return iter(chunks)
+
+
+def decompress(
+    body: bytes, content_encoding: str = None, max_size: int = MAX_DECOMPRESSED_SIZE
+) -> bytes:
+    """
+    Decompress a request body according to its Content-Encoding header.
+
+    Args:
+        body (bytes): request body.
+        content_encoding (str): Content-Encoding header. None or identity is a no-op.
+        max_size (int): maximum decompressed size in bytes, PayloadTooLarge is raised
+            when exceeded. None for no limit. Defaults to MAX_DECOMPRESSED_SIZE.
+    Returns:
+        (bytes): decompressed body.
+    """
+    if not _parse_content_encoding(content_encoding):
+        return body
+    return b"".join(iter_decompress([body], content_encoding, max_size=max_size))
+
+
+def compress(body, content_encoding: str, level: int = None) -> bytes:
+    """
+    Compress a response (or request) body.
+
+    Args:
+        body (bytes or str): body to compress. str is utf-8 encoded.
+        content_encoding (str): one of gzip, zstd or identity.
+        level (int): (Optional) compression level.
+    Returns:
+        (bytes): compressed body.
+    """
+    if isinstance(body, str):
+        body = body.encode()
+
+    coding = (content_encoding or IDENTITY).strip().lower()
+    if coding == IDENTITY:
+        return body
+    if coding in (GZIP, "x-gzip"):
+        compressor = zlib.compressobj(
+            level if level is not None else 6, zlib.DEFLATED, 16 + zlib.MAX_WBITS
+        )
+        return compressor.compress(body) + compressor.flush()
+    if coding == ZSTD:
+        return (
+            _zstandard()
+            .ZstdCompressor(level=level if level is not None else 3)
+            .compress(body)
+        )
+    raise UnsupportedContentEncoding(
+        "Unsupported Content-Encoding '{}'. Supported: {}".format(
+            content_encoding, ", ".join(supported_encodings())
+        )
+    )
+
+
+def _iter_compressed(chunks, compressor):
+    """compress chunks with a compressobj, flushing once exhausted"""
+    for chunk in chunks:
+        if isinstance(chunk, str):
+            chunk = chunk.encode()
+        data = compressor.compress(chunk)
+        if data:
+            yield data
+    yield compressor.flush()
+
+
+def iter_compress(chunks, content_encoding: str, level: int = None):
+    """
+    Incrementally compress an iterable of body chunks, e.g. a streamed response.
+
+    Args:
+        chunks (Iterable[bytes or str]): body chunks. str chunks are utf-8 encoded.
+        content_encoding (str): one of gzip, zstd or identity.
+        level (int): (Optional) compression level.
+    Returns:
+        (Iterator[bytes or str]): compressed body chunks.
+    """
+    coding = (content_encoding or IDENTITY).strip().lower()
+    if coding == IDENTITY:
+        return iter(chunks)
+    if coding in (GZIP, "x-gzip"):
+        return _iter_compressed(
+            chunks,
+            zlib.compressobj(
+                level if level is not None else 6, zlib.DEFLATED, 16 + zlib.MAX_WBITS
+            ),
+        )
+    if coding == ZSTD:
+        return _iter_compressed(
+            chunks,
+            _zstandard()
+            .ZstdCompressor(level=level if level is not None else 3)
+            .compressobj(),
+        )
+    raise UnsupportedContentEncoding(
+        "Unsupported Content-Encoding '{}'. Supported: {}".format(
+            content_encoding, ", ".join(supported_encodings())
+        )
+    )
+
+
+def negotiate_content_encoding(accept_encoding: str, encodings: list = None):
+    """
+    Select the response content encoding from an Accept-Encoding header.
+
+    Args:
+        accept_encoding (str): request Accept-Encoding header.
+        encodings (list): (Optional) encodings the server may use, in order of
+            preference. Defaults to SUPPORTED_ENCODINGS.
+    Returns:
+        (str): selected encoding, or None to send the body uncompressed.
+    """
+    if not accept_encoding:
+        return None
+    if encodings is None:
+        encodings = SUPPORTED_ENCODINGS
+
+    codings = parse_accept_header(accept_encoding)
+    excluded = {coding for coding, quality in codings if quality <= 0}
+    for coding, quality in codings:
+        if quality <= 0:
+            continue
+        if coding == IDENTITY:
+            return None
+        if coding == "*":
+            candidates = [
+                encoding for encoding in encodings if encoding not in excluded
+            ]
+            return candidates[0] if candidates else None
+        if coding in encodings:
+            return coding
+    return None
@@ -7,19 +7,76 @@
         list of lists -> np.array.
 """
 import io
+from concurrent.futures import ThreadPoolExecutor
+from email.parser import BytesParser
+from email.policy import HTTP
+from functools import partial
 from PIL import Image
 import numpy as np
 
 
-def image_to_numpy(image_bytes, convert: str = None):
+def image_to_numpy(image_bytes, convert: str = None, size: tuple = None):
     """Convert an image bytes string into numpy through PIL.
+
+    When a size is given, JPEGs are decoded directly at a reduced scale
+    (through Image.draft) before being resized to exactly that size.
+
     Args:
         bytes_like (str): bytes serialized image string.
         convert (str): pillow image convert mode
+        size (tuple): (Optional) target (width, height) of the image.
     Returns:
         (np.array): Converted numpy array.
     """
     pillow_image = Image.open(io.BytesIO(image_bytes))
+    if size is not None:
+        # only JPEG supports draft mode, for other formats this is a no-op
+        pillow_image.draft(convert, tuple(size))
     if convert is not None:
         pillow_image = pillow_image.convert(convert)
+    if size is not None and pillow_image.size != tuple(size):
+        pillow_image = pillow_image.resize(tuple(size), resample=Image.BILINEAR)
     return np.asarray(pillow_image)
+
+
+def multipart_to_images(body: bytes, content_type: str):
+    """Split a multipart request body in to the bytes of each part.
+    Args:
+        body (bytes): multipart/form-data or multipart/mixed request body.
+        content_type (str): request Content-Type header, including the boundary.
+    Returns:
+        (list): bytes of each part.
+    """
+    message = BytesParser(policy=HTTP).parsebytes(
+        b"Content-Type: " + content_type.encode() + b"\r\n\r\n" + body
+    )
+    if not message.is_multipart():
+        raise ValueError(
+            "Expected a multipart Content-Type, got '{}' instead".format(content_type)
+        )
+    return [part.get_payload(decode=True) for part in message.iter_parts()]
+
+
+def images_to_numpy(
+    images, convert: str = None, size: tuple = None, max_workers: int = None
+):
+    """Convert many image bytes strings into numpy, decoding them in a thread pool.
+
+    Pillow releases the GIL while decoding, so images are decoded in parallel.
+
+    Args:
+        images (Iterable[bytes]): bytes serialized image strings.
+        convert (str): pillow image convert mode
+        size (tuple): (Optional) target (width, height) of the images.
+        max_workers (int): (Optional) number of decoding threads.
+    Returns:
+        (np.array or list): stacked array of shape (n, height, width[, channels])
+            when a size is given, otherwise a list of arrays.
+    """
+    decode = partial(image_to_numpy, convert=convert, size=size)
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        arrays = list(executor.map(decode, images))
+
+    if size is not None:
+        return np.stack(arrays)
+    return arrays
@@ -0,0 +1,81 @@
+"""
+    JSON LINES CONTENT DECODERS
+
+    Handle incremental Decoding of JSON Lines content (application/jsonlines)
+    from request in to fixed size batches of records.
+
+    e.g.
+        {"a": 1}\\n{"a": 2}\\n -> [[{"a": 1}, {"a": 2}]].
+"""
+import json
+
+DEFAULT_BATCH_SIZE = 1024
+
+
+def _iter_lines_from_buffer(bytes_like):
+    """Iterate over the lines of a bytes buffer without splitting it up front."""
+    data = bytes_like if isinstance(bytes_like, bytes) else bytes(bytes_like)
+    start = 0
+    while start < len(data):
+        end = data.find(b"\n", start)
+        if end == -1:
+            end = len(data)
+        yield data[start:end]
+        start = end + 1
+
+
+def _iter_lines_from_chunks(chunks):
+    """Iterate over the lines of an iterable of byte chunks, e.g. a streamed body."""
+    remainder = b""
+    for chunk in chunks:
+        lines = (remainder + chunk).split(b"\n")
+        remainder = lines.pop()
+        for line in lines:
+            yield line
+    if remainder:
+        yield remainder
+
+
+def iter_json_lines(data):
+    """
+    Parse JSON Lines content one record at a time.
+
+    Args:
+        data (bytes or Iterable[bytes]): JSON Lines serialized data, either as a
+            single buffer or an iterable of byte chunks.
+    Returns:
+        (Iterator): parsed JSON records.
+    """
+    if isinstance(data, (bytes, bytearray, memoryview)):
+        lines = _iter_lines_from_buffer(data)
+    elif isinstance(data, str):
+        lines = _iter_lines_from_buffer(data.encode())
+    else:
+        lines = _iter_lines_from_chunks(data)
+
+    for line in lines:
+        if line.strip():
+            yield json.loads(line)
+
+
+def iter_json_line_batches(data, batch_size: int = DEFAULT_BATCH_SIZE):
+    """
+    Parse JSON Lines content in to batches of at most batch_size records.
+
+    Args:
+        data (bytes or Iterable[bytes]): JSON Lines serialized data.
+        batch_size (int): maximum number of records per batch.
+    Returns:
+        (Iterator[list]): batches of parsed JSON records.
+    """
+    if batch_size < 1:
+        raise ValueError("batch_size must be a positive integer")
+
+    batch = []
+    for record in iter_json_lines(data):
+        batch.append(record)
+        if len(batch) == batch_size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
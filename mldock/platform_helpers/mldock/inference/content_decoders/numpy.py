@@ -6,21 +6,99 @@
     e.g.
         list of lists -> np.array.
 """
+import ast
 import csv
 import io
 import json
+import struct
 import numpy as np
 
+from mldock.platform_helpers.mldock.inference.content_decoders import jsonlines
 
-def npy_to_numpy(npy_array):
+NPY_MAGIC_PREFIX = b"\x93NUMPY"
+NPY_MAGIC_LEN = len(NPY_MAGIC_PREFIX) + 2
+# header length format and text encoding by NPY format version
+NPY_HEADER_FORMATS = {
+    (1, 0): ("<H", "latin1"),
+    (2, 0): ("<I", "latin1"),
+    (3, 0): ("<I", "utf8"),
+}
+
+
+def _read_npy_header(buffer):
+    """Parse the header of an NPY serialized buffer.
+    Args:
+        buffer (memoryview): NPY serialized bytes.
+    Returns:
+        (tuple): shape, fortran_order, dtype and the byte offset of the array data.
+    """
+    if bytes(buffer[: len(NPY_MAGIC_PREFIX)]) != NPY_MAGIC_PREFIX:
+        raise ValueError("Error while decoding npy: payload is not in NPY format")
+
+    version = np.lib.format.read_magic(io.BytesIO(buffer[:NPY_MAGIC_LEN].tobytes()))
+    if version not in NPY_HEADER_FORMATS:
+        raise ValueError(
+            "Error while decoding npy: unsupported format version {}.{}".format(
+                *version
+            )
+        )
+    length_format, encoding = NPY_HEADER_FORMATS[version]
+    header_start = NPY_MAGIC_LEN + struct.calcsize(length_format)
+
+    (header_length,) = struct.unpack(length_format, buffer[NPY_MAGIC_LEN:header_start])
+    data_offset = header_start + header_length
+
+    # only the (small) header is copied, the array data is left in place
+    try:
+        header = ast.literal_eval(
+            buffer[header_start:data_offset].tobytes().decode(encoding)
+        )
+        shape = tuple(int(dim) for dim in header["shape"])
+        fortran_order = bool(header["fortran_order"])
+        dtype = np.lib.format.descr_to_dtype(header["descr"])
+    except (SyntaxError, ValueError, TypeError, KeyError) as exception:
+        raise ValueError(
+            f"Error while decoding npy: invalid header, {exception}"
+        ) from exception
+    return shape, fortran_order, dtype, data_offset
+
+
+def npy_to_numpy(npy_array, allow_pickle: bool = False, writable: bool = False):
     """Convert an NPY array into numpy.
+
+    The header is parsed once and the array is returned as a view over the
+    request bytes, without copying the payload.
+
     Args:
-        npy_array (npy array): NPY serialized array to be converted.
+        npy_array (bytes or memoryview): NPY serialized array to be converted.
+        allow_pickle (bool): allow object arrays, which are unpickled. Defaults to False.
+        writable (bool): return a writable copy instead of a read-only view.
     Returns:
         (np.array): Converted numpy array.
     """
-    stream = io.BytesIO(npy_array)
-    return np.load(stream, allow_pickle=True)
+    buffer = memoryview(npy_array).cast("B")
+    shape, fortran_order, dtype, data_offset = _read_npy_header(buffer)
+
+    if dtype.hasobject:
+        if not allow_pickle:
+            raise ValueError(
+                "Error while decoding npy: object arrays cannot be loaded when "
+                "allow_pickle=False"
+            )
+        stream = io.BytesIO(buffer)
+        return np.load(stream, allow_pickle=True)
+
+    count = int(np.prod(shape, dtype=np.int64))
+    array = np.frombuffer(buffer, dtype=dtype, count=count, offset=data_offset)
+
+    if fortran_order:
+        array = array.reshape(shape[::-1]).transpose()
+    else:
+        array = array.reshape(shape)
+
+    if writable:
+        array = array.copy(order="K")
+    return array
 
 
 def json_to_numpy(json_data):
@@ -36,22 +114,107 @@ def json_to_numpy(json_data):
     return np.array(data)
 
 
-def csv_to_numpy(bytes_like):
+def jsonlines_to_numpy(data, batch_size: int = jsonlines.DEFAULT_BATCH_SIZE):
+    """
+    Incrementally convert JSON Lines content to batches of numpy arrays.
+
+    Args:
+        data (bytes or Iterable[bytes]): JSON Lines serialized data.
+        batch_size (int): maximum number of records per batch.
+    Returns:
+        (Iterator[np.array]): batches of data as Numpy arrays.
+    """
+    for batch in jsonlines.iter_json_line_batches(data, batch_size=batch_size):
+        yield np.array(batch)
+
+
+def parquet_to_numpy(bytes_like, columns: list = None):
+    """
+    Convert Parquet content to a numpy array, reading only the given columns.
+
+    Args:
+        bytes_like (bytes): Parquet serialized data.
+        columns (list): (Optional) names of the columns the model uses. Defaults to all.
+    Returns:
+        (np.array): data as Numpy array, of shape (rows, columns) for several columns.
+    """
+    # pylint: disable=import-outside-toplevel
+    from mldock.platform_helpers.mldock.inference.content_decoders import (
+        pyarrow as arrow_decoders,
+    )
+
+    table = arrow_decoders.parquet_to_table(bytes_like, columns=columns)
+    return arrow_decoders.table_to_numpy(table)
+
+
+def _csv_to_numpy_with_pyarrow(bytes_like, dtype, column_types):
+    """Parse CSV columns in to a numpy array with pyarrow.csv."""
+    # pylint: disable=import-outside-toplevel
+    import pyarrow as pa
+    from pyarrow import csv as pa_csv
+
+    convert_options = pa_csv.ConvertOptions()
+    if column_types is not None:
+        convert_options = pa_csv.ConvertOptions(
+            column_types={
+                "f{}".format(index): pa.from_numpy_dtype(np.dtype(column_type))
+                for index, column_type in enumerate(column_types)
+            }
+        )
+
+    table = pa_csv.read_csv(
+        pa.py_buffer(bytes_like),
+        read_options=pa_csv.ReadOptions(autogenerate_column_names=True),
+        convert_options=convert_options,
+    )
+
+    data = np.empty((table.num_rows, table.num_columns), dtype=dtype, order="C")
+    for index, column in enumerate(table.columns):
+        data[:, index] = column.to_numpy()
+    return data
+
+
+def _csv_to_numpy_with_loadtxt(bytes_like, dtype):
+    """Parse CSV columns in to a numpy array with np.loadtxt."""
+    stream = io.StringIO(bytes(bytes_like).decode())
+    return np.loadtxt(stream, delimiter=",", quotechar='"', dtype=dtype, ndmin=2)
+
+
+def csv_to_numpy(bytes_like, dtype=None, column_types=None):
     """
     Convert a CSV object to a numpy array.
 
+    When neither dtype nor column_types is given, values are returned as strings.
+    Otherwise the CSV is parsed in a vectorized manner (using pyarrow when it is
+    installed) in to a C-contiguous array.
+
     Args:
         bytes_like (str): bytes serialized CSV string.
+        dtype (np.dtype): (Optional) dtype of the returned array.
+        column_types (list): (Optional) dtype of each column, used to parse the CSV.
     Returns:
         (np.array): data as Numpy array.
     """
     try:
-        stream = io.StringIO(bytes_like.decode())
-        reader = csv.reader(
-            stream, delimiter=",", quotechar='"', doublequote=True, strict=True
-        )
-        data = np.array(list(reader)).squeeze()
-        return data
+        if dtype is None and column_types is None:
+            stream = io.StringIO(bytes_like.decode())
+            reader = csv.reader(
+                stream, delimiter=",", quotechar='"', doublequote=True, strict=True
+            )
+            data = np.array(list(reader)).squeeze()
+            return data
+
+        if dtype is None:
+            dtype = np.result_type(*column_types)
+        else:
+            dtype = np.dtype(dtype)
+
+        try:
+            data = _csv_to_numpy_with_pyarrow(bytes_like, dtype, column_types)
+        except ImportError:
+            data = _csv_to_numpy_with_loadtxt(bytes_like, dtype)
+
+        return np.ascontiguousarray(data.squeeze())
 
     except Exception as exception:
         raise Exception(
@@ -10,6 +10,8 @@ import io
 import json
 import pandas as pd
 
+from mldock.platform_helpers.mldock.inference.content_decoders import jsonlines
+
 
 def csv_to_pandas(bytes_like: bytes):
     """
@@ -36,3 +38,66 @@ def json_list_to_pandas(json_data):
     """
     data = json.loads(json_data)
     return pd.DataFrame(data)
+
+
+def jsonlines_to_pandas(data, batch_size: int = jsonlines.DEFAULT_BATCH_SIZE):
+    """
+    Incrementally transforms JSON Lines of flat json objects in to pandas dataframes.
+
+    args:
+        data (bytes or Iterable[bytes]): data as JSON Lines serialized dictionaries.
+        batch_size (int): maximum number of rows per dataframe.
+    return:
+        (Iterator[pd.DataFrame]): batches of data as pandas dataframes
+    """
+    for batch in jsonlines.iter_json_line_batches(data, batch_size=batch_size):
+        yield pd.DataFrame(batch)
+
+
+def _table_to_pandas(table, arrow_dtypes: bool):
+    """convert a pyarrow table to pandas, optionally keeping arrow backed dtypes"""
+    if arrow_dtypes:
+        return table.to_pandas(types_mapper=pd.ArrowDtype)
+    return table.to_pandas(split_blocks=True)
+
+
+def parquet_to_pandas(bytes_like, columns: list = None, arrow_dtypes: bool = True):
+    """
+    Decodes parquet content to pandas dataframe, reading only the given columns.
+
+    args:
+        bytes_like (bytes): parquet serialized data.
+        columns (list): (Optional) names of the columns the model uses. Defaults to all.
+        arrow_dtypes (bool): keep arrow backed dtypes (pd.ArrowDtype) without copying.
+    return:
+        (pd.DataFrame): data as pandas dataframe
+    """
+    # pylint: disable=import-outside-toplevel
+    from mldock.platform_helpers.mldock.inference.content_decoders import (
+        pyarrow as arrow_decoders,
+    )
+
+    table = arrow_decoders.parquet_to_table(bytes_like, columns=columns)
+    return _table_to_pandas(table, arrow_dtypes=arrow_dtypes)
+
+
+def parquet_row_groups_to_pandas(
+    bytes_like, columns: list = None, arrow_dtypes: bool = True
+):
+    """
+    Incrementally decodes parquet content to one pandas dataframe per row group.
+
+    args:
+        bytes_like (bytes): parquet serialized data.
+        columns (list): (Optional) names of the columns the model uses. Defaults to all.
+        arrow_dtypes (bool): keep arrow backed dtypes (pd.ArrowDtype) without copying.
+    return:
+        (Iterator[pd.DataFrame]): data as pandas dataframes
+    """
+    # pylint: disable=import-outside-toplevel
+    from mldock.platform_helpers.mldock.inference.content_decoders import (
+        pyarrow as arrow_decoders,
+    )
+
+    for table in arrow_decoders.iter_parquet_row_groups(bytes_like, columns=columns):
+        yield _table_to_pandas(table, arrow_dtypes=arrow_dtypes)
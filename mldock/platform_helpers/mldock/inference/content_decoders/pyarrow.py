@@ -0,0 +1,129 @@
+"""
+    ARROW CONTENT DECODERS
+
+    Handle Decoding of Arrow IPC stream (application/vnd.apache.arrow.stream) and
+    Parquet content from request in to record batches, numpy arrays or pandas dataframes.
+
+    e.g.
+        arrow stream -> pa.RecordBatch -> np.array.
+"""
+import numpy as np
+import pyarrow as pa
+from pyarrow import parquet as pq
+
+
+def arrow_stream_to_record_batches(bytes_like):
+    """
+    Iterate over the record batches of an Arrow IPC stream.
+
+    The record batches reference the request bytes and are not copied.
+
+    Args:
+        bytes_like (bytes or memoryview): Arrow IPC stream serialized data.
+    Returns:
+        (Iterator[pa.RecordBatch]): record batches in the stream.
+    """
+    reader = pa.ipc.open_stream(pa.py_buffer(bytes_like))
+    for record_batch in reader:
+        yield record_batch
+
+
+def arrow_stream_to_table(bytes_like):
+    """
+    Convert an Arrow IPC stream to a pyarrow table.
+
+    Args:
+        bytes_like (bytes or memoryview): Arrow IPC stream serialized data.
+    Returns:
+        (pa.Table): data as pyarrow table.
+    """
+    reader = pa.ipc.open_stream(pa.py_buffer(bytes_like))
+    return reader.read_all()
+
+
+def _column_to_numpy(column):
+    """Convert a pyarrow column to numpy, zero-copy where arrow allows it."""
+    if column.num_chunks == 1:
+        column = column.chunk(0)
+    else:
+        column = column.combine_chunks()
+    if pa.types.is_fixed_size_list(column.type):
+        values = column.flatten().to_numpy(zero_copy_only=False)
+        return values.reshape(-1, column.type.list_size)
+    return column.to_numpy(zero_copy_only=False)
+
+
+def table_to_numpy(table):
+    """
+    Convert a pyarrow table to a numpy array.
+
+    A table with a single primitive (or fixed size list) column in a single
+    chunk, without nulls, is returned as a view over the arrow buffers.
+    Tables with several columns are stacked as a 2D array of shape
+    (rows, columns).
+
+    Args:
+        table (pa.Table): data as pyarrow table.
+    Returns:
+        (np.array): data as Numpy array.
+    """
+    if table.num_columns == 1:
+        return _column_to_numpy(table.column(0))
+
+    return np.column_stack([_column_to_numpy(column) for column in table.columns])
+
+
+def arrow_stream_to_numpy(bytes_like):
+    """
+    Convert an Arrow IPC stream to a numpy array.
+
+    A stream with a single primitive column in a single batch is returned as
+    a view over the request bytes (see table_to_numpy).
+
+    Args:
+        bytes_like (bytes or memoryview): Arrow IPC stream serialized data.
+    Returns:
+        (np.array): data as Numpy array.
+    """
+    return table_to_numpy(arrow_stream_to_table(bytes_like))
+
+
+def arrow_stream_to_pandas(bytes_like):
+    """
+    Convert an Arrow IPC stream to a pandas dataframe.
+
+    Args:
+        bytes_like (bytes or memoryview): Arrow IPC stream serialized data.
+    Returns:
+        (pd.DataFrame): data as pandas dataframe
+    """
+    table = arrow_stream_to_table(bytes_like)
+    return table.to_pandas(split_blocks=True)
+
+
+def parquet_to_table(bytes_like, columns: list = None):
+    """
+    Convert Parquet content to a pyarrow table, reading only the given columns.
+
+    Args:
+        bytes_like (bytes or memoryview): Parquet serialized data.
+        columns (list): (Optional) names of the columns to read. Defaults to all.
+    Returns:
+        (pa.Table): data as pyarrow table.
+    """
+    return pq.read_table(pa.BufferReader(bytes_like), columns=columns)
+
+
+def iter_parquet_row_groups(bytes_like, columns: list = None):
+    """
+    Iterate over the row groups of Parquet content, reading only the given columns.
+
+    Args:
+        bytes_like (bytes or memoryview): Parquet serialized data.
+        columns (list): (Optional) names of the columns to read. Defaults to all.
+    Returns:
+        (Iterator[pa.Table]): one table per row group.
+    """
+    parquet_file = pq.ParquetFile(pa.BufferReader(bytes_like))
+    for index in range(parquet_file.num_row_groups):
+        yield parquet_file.read_row_group(index, columns=columns)
@@ -21,6 +21,17 @@ import json
 
 import numpy as np
 
+try:
+    # (Optional) install with mldock[fast-json]
+    import orjson
+except ImportError:
+    orjson = None
+
+ORJSON_NUMPY_KINDS = "biuf"
+CSV_CHUNK_SIZE = 4096
+# number of values formatted per operation when serializing arrays to JSON
+JSON_CHUNK_VALUES = 65536
+
 
 def array_to_npy(array_like):
     """Convert an array-like object to the NPY format.
@@ -36,6 +47,42 @@ def array_to_npy(array_like):
     return buffer.getvalue()
 
 
+def array_to_csv_chunks(array_like, quoted=True, chunk_size=CSV_CHUNK_SIZE):
+    """Convert an array like object to CSV, yielding chunks of rows.
+
+    Rows are formatted chunk by chunk with a single format operation per chunk,
+    so the full CSV is never held in memory. The generator can be returned as a
+    streaming response by the serving app, e.g. fastapi's StreamingResponse.
+
+    Args:
+        array_like (np.array or Iterable or int or float): Array-like object to be converted to CSV.
+        quoted (bool): wrap each value in double quotes.
+        chunk_size (int): number of rows formatted per chunk.
+    Returns:
+        (Iterator[str]): chunks of the object serialized to CSV.
+    """
+    data = np.asarray(array_like)
+    if data.ndim == 0:
+        data = data.reshape(1, 1)
+    elif data.ndim == 1:
+        data = data.reshape(-1, 1)
+    elif data.ndim > 2:
+        raise ValueError(
+            "Expected 1D or 2D array, got {}D array instead".format(data.ndim)
+        )
+
+    value_fmt = '"%s"' if quoted else "%s"
+    row_fmt = ",".join([value_fmt] * data.shape[1]) + "\n"
+
+    # numpy scalars keep numpy's shortest repr for low precision floats
+    keep_numpy_scalars = data.dtype.kind == "f" and data.dtype.itemsize < 8
+
+    for start in range(0, data.shape[0], chunk_size):
+        chunk = data[start : start + chunk_size]
+        values = chunk.ravel() if keep_numpy_scalars else chunk.ravel().tolist()
+        yield (row_fmt * chunk.shape[0]) % tuple(values)
+
+
 def array_to_csv(array_like, quoted=True):
     """Convert an array like object to CSV.
     To understand what an array-like object is, please see:
@@ -45,18 +92,7 @@ def array_to_csv(array_like, quoted=True):
     Returns:
         (str): Object serialized to CSV.
     """
-    data = np.array(array_like)
-    if len(data.shape) == 1:
-        data = np.reshape(data, (data.shape[0], 1))
-
-    stream = io.StringIO()
-
-    print(data)
-    if quoted:
-        np.savetxt(stream, data, delimiter=",", fmt='"%s"')
-    else:
-        np.savetxt(stream, data, delimiter=",", fmt="%s")
-    return stream.getvalue()
+    return "".join(array_to_csv_chunks(array_like, quoted=quoted))
 
 
 def array_to_json(array_like):
@@ -78,3 +114,138 @@ def array_to_json(array_like):
         return json.JSONEncoder().default(_array_like)
 
     return json.dumps(array_like, default=default)
+
+
+def _prepare_for_json(obj, precision=None, native_numpy=False):
+    """Recursively round and convert numpy values in obj for JSON serialization.
+    Args:
+        obj: array-like, scalar or nested dicts/lists of array-likes.
+        precision (int): (Optional) number of decimals to round floats to.
+        native_numpy (bool): keep C-contiguous numeric arrays as numpy (orjson backend).
+    Returns:
+        obj ready to be JSON serialized.
+    """
+    if isinstance(obj, dict):
+        return {
+            key: _prepare_for_json(value, precision, native_numpy)
+            for key, value in obj.items()
+        }
+    if isinstance(obj, (list, tuple)):
+        return [_prepare_for_json(value, precision, native_numpy) for value in obj]
+    if isinstance(obj, (np.ndarray, np.generic)):
+        if obj.dtype.kind not in ORJSON_NUMPY_KINDS:
+            return _prepare_for_json(obj.tolist(), precision, native_numpy)
+        if precision is not None and obj.dtype.kind == "f":
+            obj = np.round(obj, precision)
+        if native_numpy and isinstance(obj, np.ndarray):
+            if obj.dtype == np.float16:
+                obj = obj.astype(np.float32)
+            return np.ascontiguousarray(obj)
+        return obj.tolist()
+    if precision is not None and isinstance(obj, float):
+        return round(obj, precision)
+    return obj
+
+
+def _json_float_format(data, precision=None):
+    """
+    printf-style format of a float array's values, with enough digits to
+    round-trip the dtype and a fraction on every value (42.0, not 42).
+    Args:
+        data (np.array): finite float array.
+        precision (int): (Optional) number of decimals floats are rounded to.
+    Returns:
+        (str): format, or None when no single format fits every value.
+    """
+    if precision is not None and precision > 0:
+        return "%.{}f".format(precision)
+    whole = data == np.trunc(data)
+    if whole.all():
+        # whole numbers are formatted exactly with one decimal
+        return "%.1f" if np.abs(data).max() < 2**53 else None
+    if precision is None and not whole.any():
+        return "%.17g" if data.dtype.itemsize >= 8 else "%.9g"
+    # %g would drop the fraction of the whole numbers
+    return None
+
+
+def _numeric_array_to_json_bytes(data, precision=None):
+    """
+    Serialize a finite, numeric 1D or 2D array to JSON with the standard library.
+
+    Values are formatted a block of rows at a time with a single format operation
+    and written in to a bytes buffer, rather than serializing each element.
+    Args:
+        data (np.array): integer or finite float array.
+        precision (int): (Optional) number of decimals floats are rounded to.
+    Returns:
+        (bytes): array serialized to JSON, or None when the values have no common format.
+    """
+    value_fmt = "%d" if data.dtype.kind in "iu" else _json_float_format(data, precision)
+    if value_fmt is None:
+        return None
+    if data.ndim == 1:
+        # items are values
+        item_fmt = value_fmt
+        items_per_block = JSON_CHUNK_VALUES
+    else:
+        # items are rows
+        item_fmt = "[" + ",".join([value_fmt] * data.shape[1]) + "]"
+        items_per_block = max(JSON_CHUNK_VALUES // data.shape[1], 1)
+
+    buffer = io.BytesIO()
+    buffer.write(b"[")
+    for start in range(0, data.shape[0], items_per_block):
+        block = data[start : start + items_per_block]
+        if start:
+            buffer.write(b",")
+        block_fmt = ",".join([item_fmt] * block.shape[0])
+        buffer.write((block_fmt % tuple(block.ravel().tolist())).encode())
+    buffer.write(b"]")
+    return buffer.getvalue()
+
+
+def _is_formattable_array(obj) -> bool:
+    """whether obj can be serialized by _numeric_array_to_json_bytes"""
+    if not isinstance(obj, np.ndarray) or obj.dtype.kind not in "iuf":
+        return False
+    if obj.ndim not in (1, 2) or obj.size == 0:
+        return False
+    # NaN and Infinity are serialized by the json module as non-standard literals
+    return obj.dtype.kind != "f" or bool(np.isfinite(obj).all())
+
+
+def array_to_json_bytes(array_like, precision: int = None):
+    """
+    Convert an array-like object, or nested dicts/lists of array-likes, to JSON bytes.
+
+    Numeric arrays are serialized without materialising every element as a python
+    object when orjson is installed (mldock[fast-json]). Otherwise finite numeric 1D
+    and 2D arrays are formatted in blocks of rows, floats with enough digits to
+    round-trip (0.1 is formatted as 0.10000000000000001), and anything else falls
+    back to the json module. Output is compact (no whitespace). Note, the two
+    backends differ in how they serialize NaN and Infinity (null vs NaN/Infinity).
+
+    Args:
+        array_like (np.array or Iterable or dict or int or float): object to be
+                                                        converted to JSON.
+        precision (int): (Optional) number of decimals to round floats to.
+    Returns:
+        (bytes): Object serialized to JSON.
+    """
+    if orjson is not None:
+        data = _prepare_for_json(array_like, precision=precision, native_numpy=True)
+        return orjson.dumps(
+            data, option=orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS
+        )
+
+    if _is_formattable_array(array_like):
+        data = array_like
+        if precision is not None and data.dtype.kind == "f":
+            data = np.round(data, precision)
+        content = _numeric_array_to_json_bytes(data, precision=precision)
+        if content is not None:
+            return content
+
+    data = _prepare_for_json(array_like, precision=precision)
+    return json.dumps(data, separators=(",", ":")).encode()
@@ -0,0 +1,58 @@
+"""
+    ARROW CONTENT ENCODERS
+
+    Handle Encoding of Content from numpy arrays, pandas dataframes or pyarrow tables
+    in to an Arrow IPC stream (application/vnd.apache.arrow.stream) for response
+"""
+import numpy as np
+import pyarrow as pa
+
+
+def table_to_arrow_stream(table):
+    """Convert a pyarrow table or record batch to an Arrow IPC stream.
+    Args:
+        table (pa.Table or pa.RecordBatch): data to be converted.
+    Returns:
+        (bytes): Arrow IPC stream.
+    """
+    sink = pa.BufferOutputStream()
+    with pa.ipc.new_stream(sink, table.schema) as writer:
+        writer.write(table)
+    return sink.getvalue().to_pybytes()
+
+
+def array_to_arrow_stream(array_like, column_names=None):
+    """Convert an array-like object to an Arrow IPC stream.
+
+    1D arrays are written as a single column, 2D arrays as one column per
+    array column.
+
+    Args:
+        array_like (np.array or Iterable or int or float): Array-like object to be converted.
+        column_names (list): (Optional) names of the columns. Defaults to f0, f1, ...
+    Returns:
+        (bytes): Arrow IPC stream.
+    """
+    data = np.asarray(array_like)
+    if data.ndim < 2:
+        data = data.reshape(-1, 1)
+
+    if column_names is None:
+        column_names = ["f{}".format(index) for index in range(data.shape[1])]
+
+    table = pa.Table.from_arrays(
+        [pa.array(data[:, index]) for index in range(data.shape[1])],
+        names=list(column_names),
+    )
+    return table_to_arrow_stream(table)
+
+
+def dataframe_to_arrow_stream(data_frame):
+    """Convert a pandas dataframe to an Arrow IPC stream.
+    Args:
+        data_frame (pd.DataFrame): dataframe to be converted.
+    Returns:
+        (bytes): Arrow IPC stream.
+    """
+    table = pa.Table.from_pandas(data_frame, preserve_index=False)
+    return table_to_arrow_stream(table)
@@ -0,0 +1,73 @@
+"""
+    HTTP HEADER UTILITIES
+
+    Parse Content-Type, Accept and Accept-Encoding style headers used for
+    content negotiation, and infer the Content-Type of payload files.
+"""
+from pathlib import Path
+
+# maps payload file extensions to request content types
+EXTENSION_CONTENT_TYPES = {
+    ".json": "application/json",
+    ".jsonl": "application/jsonlines",
+    ".csv": "text/csv",
+    ".npy": "application/x-npy",
+    ".arrow": "application/vnd.apache.arrow.stream",
+    ".parquet": "application/vnd.apache.parquet",
+    ".jpg": "image/jpeg",
+    ".jpeg": "image/jpeg",
+    ".png": "image/png",
+}
+
+
+def content_type_for_path(path) -> str:
+    """Infer the Content-Type of a payload file from its extension.
+    Args:
+        path (str or Path): payload file path, e.g. "warmup/request.csv"
+    Returns:
+        (str): content type, e.g. "text/csv", or None for unknown extensions
+    """
+    return EXTENSION_CONTENT_TYPES.get(Path(path).suffix.lower())
+
+
+def normalize_media_type(header_value: str) -> str:
+    """Strip parameters (e.g. charset) and whitespace from a media type and lowercase it.
+    Args:
+        header_value (str): Content-Type or media range, e.g. "text/csv; charset=utf-8"
+    Returns:
+        (str): normalized media type, e.g. "text/csv"
+    """
+    return header_value.split(";", 1)[0].strip().lower()
+
+
+def parse_accept_header(accept: str) -> list:
+    """Parse an Accept header in to media ranges ordered by preference.
+
+    Ranges are ordered by q-value, then by specificity (type/subtype before type/*
+    before */*), then by their order in the header.
+
+    Args:
+        accept (str): Accept header, e.g. "text/csv;q=0.5, application/json"
+    Returns:
+        (list): (media range, q-value) tuples
+    """
+    media_ranges = []
+    for position, part in enumerate(accept.split(",")):
+        media_range = normalize_media_type(part)
+        if not media_range:
+            continue
+        quality = 1.0
+        for param in part.split(";")[1:]:
+            key, _, value = param.partition("=")
+            if key.strip().lower() == "q":
+                try:
+                    quality = float(value.strip())
+                except ValueError:
+                    quality = 0.0
+        specificity = 2 - media_range.count("*")
+        media_ranges.append((-quality, -specificity, position, media_range))
+
+    return [
+        (media_range, -negative_quality)
+        for negative_quality, _, _, media_range in sorted(media_ranges)
+    ]
@@ -0,0 +1,172 @@
+"""
+    MEMORY-MAPPED MODEL ARTIFACTS
+
+    Saves models, e.g. dicts of numpy weights or scikit-learn style estimators,
+    as a pickled skeleton plus a single file of raw array data, described by a
+    manifest. Loading memory-maps the array data read-only, so arrays are
+    views on the page cache rather than copies on the heap, shared by all
+    workers and processes loading the same artifact.
+
+    e.g.
+        save_artifact(model, Path(environment.model_dir, "model"))
+        model = load_artifact(Path(environment.model_dir, "model"))
+
+    note:
+        - arrays are split out with pickle protocol 5 out-of-band buffers, objects
+          that copy their arrays when unpickled (e.g. scikit-learn's cython trees)
+          load correctly but do not share memory.
+        - loading unpickles the skeleton, only load trusted artifacts.
+        - every save writes new data and skeleton files and atomically replaces
+          the manifest, files memory-mapped by loaded models are never rewritten.
+"""
+import json
+import os
+import pickle
+import uuid
+from pathlib import Path
+
+import numpy as np
+
+MANIFEST_FILENAME = "manifest.json"
+# formatted with a unique id per save
+SKELETON_FILENAME = "skeleton-{}.pkl"
+DATA_FILENAME = "arrays-{}.bin"
+# array data offsets are aligned for any dtype and SIMD loads
+ALIGNMENT = 64
+FORMAT_VERSION = 1
+
+
+def _align(offset: int) -> int:
+    """round offset up to the next ALIGNMENT bytes"""
+    return -(-offset // ALIGNMENT) * ALIGNMENT
+
+
+def _saved_files(artifact_dir: Path) -> set:
+    """data and skeleton files of the artifact's current manifest, if any"""
+    try:
+        with open(Path(artifact_dir, MANIFEST_FILENAME)) as file_:
+            manifest = json.load(file_)
+        return {manifest["data"], manifest["skeleton"]}
+    except (OSError, ValueError, KeyError):
+        return set()
+
+
+def _remove_stale_files(artifact_dir: Path, keep: set):
+    """remove data and skeleton files of older saves"""
+    for path in [
+        *artifact_dir.glob("arrays*.bin"),
+        *artifact_dir.glob("skeleton*.pkl"),
+    ]:
+        if path.name in keep:
+            continue
+        try:
+            # memory maps of loaded models keep the unlinked data readable
+            path.unlink()
+        except OSError:
+            # e.g. a mapped file on windows, removed by a later save
+            pass
+
+
+def save_artifact(model, artifact_dir: str) -> dict:
+    """
+    Save a model in a memory-map friendly format.
+
+    args:
+        model: model object, any picklable object holding numpy arrays
+        artifact_dir (str): directory to write the skeleton, array data and manifest to
+    return:
+        dict: manifest
+    """
+    artifact_dir = Path(artifact_dir)
+    artifact_dir.mkdir(parents=True, exist_ok=True)
+    # files of the previous save are kept for loads that already read its manifest
+    previous_files = _saved_files(artifact_dir)
+    save_id = uuid.uuid4().hex[:16]
+    data_filename = DATA_FILENAME.format(save_id)
+    skeleton_filename = SKELETON_FILENAME.format(save_id)
+
+    buffers = []
+    skeleton = pickle.dumps(model, protocol=5, buffer_callback=buffers.append)
+
+    entries = []
+    offset = 0
+    with open(Path(artifact_dir, data_filename), "wb") as file_:
+        for buffer in buffers:
+            view = memoryview(buffer)
+            aligned = _align(offset)
+            file_.write(b"\0" * (aligned - offset))
+            file_.write(buffer.raw())
+            entries.append(
+                {
+                    "offset": aligned,
+                    "nbytes": view.nbytes,
+                    "format": view.format,
+                    "shape": list(view.shape),
+                }
+            )
+            offset = aligned + view.nbytes
+
+    Path(artifact_dir, skeleton_filename).write_bytes(skeleton)
+    manifest = {
+        "format_version": FORMAT_VERSION,
+        "skeleton": skeleton_filename,
+        "data": data_filename,
+        "arrays": entries,
+    }
+    # replaced last, so a manifest marks a complete artifact
+    manifest_path = Path(artifact_dir, MANIFEST_FILENAME)
+    tmp_path = manifest_path.with_name(manifest_path.name + ".tmp")
+    with open(tmp_path, "w") as file_:
+        json.dump(manifest, file_, indent=2)
+    os.replace(tmp_path, manifest_path)
+
+    _remove_stale_files(
+        artifact_dir, keep=previous_files | {data_filename, skeleton_filename}
+    )
+    return manifest
+
+
+def read_manifest(artifact_dir: str) -> dict:
+    """
+    Read an artifact's manifest.
+
+    args:
+        artifact_dir (str): artifact directory
+    return:
+        dict: manifest
+    """
+    with open(Path(artifact_dir, MANIFEST_FILENAME)) as file_:
+        manifest = json.load(file_)
+    if manifest.get("format_version") != FORMAT_VERSION:
+        raise ValueError(
+            "Unsupported model artifact format version: {}".format(
+                manifest.get("format_version")
+            )
+        )
+    return manifest
+
+
+def load_artifact(artifact_dir: str):
+    """
+    Load a model saved with save_artifact, memory-mapping its arrays read-only.
+
+    args:
+        artifact_dir (str): artifact directory
+    return:
+        model object, with numpy arrays backed by the memory-mapped data file
+    """
+    manifest = read_manifest(artifact_dir)
+    data_path = Path(artifact_dir, manifest["data"])
+
+    if data_path.stat().st_size:
+        data = np.memmap(data_path, dtype=np.uint8, mode="r")
+        buffers = [
+            data[entry["offset"] : entry["offset"] + entry["nbytes"]]
+            for entry in manifest["arrays"]
+        ]
+    else:
+        # np.memmap cannot map empty files, all arrays are empty
+        buffers = [np.empty(0, dtype=np.uint8) for _ in manifest["arrays"]]
+
+    skeleton = Path(artifact_dir, manifest["skeleton"]).read_bytes()
+    return pickle.loads(skeleton, buffers=buffers)
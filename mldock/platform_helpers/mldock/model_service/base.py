@@ -1,5 +1,12 @@
 """MODEL BASE CLASS"""
 from abc import ABCMeta, abstractmethod
+import threading
+import time
+
+from mldock.platform_helpers.mldock.model_service.batching import MicroBatcher
+from mldock.platform_helpers.mldock.model_service.memoize import PredictionCache
+from mldock.platform_helpers.mldock.model_service.pipeline import StagePipeline
+from mldock.platform_helpers.mldock.model_service.workers import ForkedWorkerPool
 
 
 class ModelService:
@@ -13,16 +20,59 @@ class ModelService:
 
     model = None
 
-    def __init__(self, model_path: str):
+    def __init__(self, model_path: str, background: bool = False):
         """
         Internal initialize ModelService.
 
         args:
             model_path (str): path to model
+            background (bool): load the model in a background thread. Use is_loaded or
+                wait_until_loaded before calling predict.
         return:
             model object
         """
-        self.model = self.load_model(model_path)
+        self.load_duration = None
+        self.load_error = None
+        self._loaded = threading.Event()
+        if background:
+            threading.Thread(
+                target=self._load,
+                args=(model_path,),
+                name="mldock-model-loader",
+                daemon=True,
+            ).start()
+        else:
+            self._load(model_path, raise_errors=True)
+
+    def _load(self, model_path: str, raise_errors: bool = False):
+        """load the model, recording the load duration and any error"""
+        start = time.perf_counter()
+        try:
+            self.model = self.load_model(model_path)
+        except Exception as exception:  # pylint: disable=broad-except
+            self.load_error = exception
+            if raise_errors:
+                raise
+        finally:
+            self.load_duration = time.perf_counter() - start
+            self._loaded.set()
+
+    @property
+    def is_loaded(self) -> bool:
+        """whether the model finished loading successfully"""
+        return self._loaded.is_set() and self.load_error is None
+
+    def wait_until_loaded(self, timeout: float = None) -> bool:
+        """
+        Block until the model finished loading.
+
+        args:
+            timeout (float): (Optional) seconds to wait
+        return:
+            bool: whether the model loaded successfully
+        """
+        self._loaded.wait(timeout)
+        return self.is_loaded
 
     @staticmethod
     @abstractmethod
@@ -77,3 +127,83 @@ class ModelService:
         """
         # pylint: disable=unnecessary-pass
         pass
+
+    def create_batcher(
+        self, max_batch_size: int = 32, max_wait_ms: float = 5.0, **kwargs
+    ):
+        """
+        Create a micro-batching engine that merges concurrent requests and
+        calls predict once per batch.
+
+        args:
+            max_batch_size (int): maximum number of records per predict call
+            max_wait_ms (float): maximum time to wait for a batch to fill
+        return:
+            MicroBatcher
+        """
+        return MicroBatcher(
+            self.predict,
+            max_batch_size=max_batch_size,
+            max_wait_ms=max_wait_ms,
+            **kwargs
+        )
+
+    def create_worker_pool(self, num_workers: int = None):
+        """
+        Create a pool of forked worker processes running predict, sharing this
+        model service's loaded model copy-on-write. Call start() on the pool
+        before serving requests.
+
+        args:
+            num_workers (int): (Optional) number of worker processes. Defaults to the cpu count.
+        return:
+            ForkedWorkerPool
+        """
+        return ForkedWorkerPool(self.predict, num_workers=num_workers)
+
+    def enable_prediction_cache(self, max_size: int = 1024, ttl: float = None):
+        """
+        Memoize predict, returning cached predictions for repeated inputs.
+        Cached array predictions are returned as read-only views.
+
+        args:
+            max_size (int): maximum number of cached predictions
+            ttl (float): (Optional) seconds after which cached predictions expire
+        return:
+            PredictionCache: the cache, e.g. to report hit/miss counters
+        """
+        prediction_cache = PredictionCache(max_size=max_size, ttl=ttl)
+        self.predict = prediction_cache.memoize(self.predict)
+        return prediction_cache
+
+    def create_pipeline(self, queue_size: int = 4):
+        """
+        Create a pipelined executor overlapping input_transform, predict and
+        output_transform of consecutive batches, with bounded queues between stages.
+
+        args:
+            queue_size (int): maximum number of batches queued in front of each stage
+        return:
+            StagePipeline
+        """
+        return StagePipeline(
+            [
+                ("input_transform", self.input_transform),
+                ("predict", self.predict),
+                ("output_transform", self.output_transform),
+            ],
+            queue_size=queue_size,
+        )
+
+    def instrument(self, latency):
+        """
+        Time input_transform, predict and output_transform on every call.
+
+        args:
+            latency (LatencyMetrics): records stage latencies
+        return:
+            LatencyMetrics
+        """
+        for stage in ("input_transform", "predict", "output_transform"):
+            setattr(self, stage, latency.timed(stage)(getattr(self, stage)))
+        return latency
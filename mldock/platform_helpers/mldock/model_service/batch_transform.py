@@ -0,0 +1,386 @@
+"""
+    OFFLINE BATCH TRANSFORM
+
+    Runs a model service over every file in the input channels, without the
+    HTTP server. Newline delimited files (CSV, JSON Lines) are split in to
+    shards on record boundaries, shards are processed by parallel workers in
+    micro-batches of input_transform, predict and output_transform, and the
+    results are assembled in input order in the output channel. Line delimited
+    results (text/csv, application/jsonlines) are encoded per shard and joined,
+    results of other formats (e.g. application/json) are merged and encoded
+    once per file.
+
+    Every completed shard is checkpointed to disk, so a restarted job skips
+    completed files and shards and resumes where it stopped.
+
+    e.g.
+        transform = BatchTransform.from_environment(model_service, environment)
+        transform.run(environment)
+
+    note:
+        - <input_data_dir>/<channel>/<file> is written to <output_data_dir>/<channel>/<file>.out
+        - CSV files must not have a header row or quoted fields spanning lines.
+"""
+import json
+import logging
+import os
+import pickle
+import shutil
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from functools import partial
+from pathlib import Path
+
+import numpy as np
+
+from mldock.platform_helpers.mldock.inference.codecs import default_codec_registry
+from mldock.platform_helpers.mldock.inference.headers import content_type_for_path
+from mldock.platform_helpers.mldock.inference.content_decoders.numpy import (
+    jsonlines_to_numpy,
+)
+from mldock.platform_helpers.mldock.model_service.batching import concatenate_batches
+from mldock.platform_helpers.mldock.model_service.workers import ForkedWorkerPool
+
+logger = logging.getLogger("mldock")
+
+# content types with one record per line, which can be split in to shards
+SPLITTABLE_CONTENT_TYPES = ("text/csv", "application/jsonlines")
+OUTPUT_SUFFIX = ".out"
+CHECKPOINT_DIR_NAME = ".checkpoint"
+DEFAULT_SHARD_SIZE = 8 * 1024 * 1024
+
+
+def shard_file(path: str, shard_size: int = DEFAULT_SHARD_SIZE) -> list:
+    """
+    Split a newline delimited file in to byte ranges ending on record boundaries.
+
+    args:
+        path (str): file path
+        shard_size (int): approximate shard size in bytes
+    return:
+        list: (start, end) byte offsets of each shard
+    """
+    size = os.path.getsize(path)
+    shards = []
+    start = 0
+    with open(path, "rb") as file_:
+        while start < size:
+            end = min(start + shard_size, size)
+            if end < size:
+                # extend the shard to the end of the record it stops in
+                file_.seek(end - 1)
+                file_.readline()
+                end = file_.tell()
+            shards.append((start, end))
+            start = end
+    return shards
+
+
+def _count_records(data: bytes) -> int:
+    """number of newline delimited records in data"""
+    return data.count(b"\n") + (0 if not data or data.endswith(b"\n") else 1)
+
+
+def _write_atomic(path: Path, content: bytes):
+    """write a file so it either exists complete or not at all"""
+    tmp_path = path.with_name(path.name + ".tmp")
+    tmp_path.write_bytes(content)
+    os.replace(tmp_path, path)
+
+
+class BatchTransform:
+    """Batch transform of input channel files with a model service"""
+
+    # pylint: disable=too-many-instance-attributes,too-many-arguments
+    def __init__(
+        self,
+        model_service,
+        accept: str = "text/csv",
+        batch_size: int = 1024,
+        shard_size: int = DEFAULT_SHARD_SIZE,
+        num_workers: int = None,
+        worker_type: str = "thread",
+        codecs=None,
+    ):
+        """
+        args:
+            model_service (ModelService): model service with a loaded model
+            accept (str): media type results are encoded in
+            batch_size (int): maximum records per predict call
+            shard_size (int): approximate shard size of splittable files, in bytes
+            num_workers (int): (Optional) parallel workers. Defaults to the cpu count.
+            worker_type (str): "thread", or "fork" to run shards in forked processes
+                sharing the model copy-on-write
+            codecs (CodecRegistry): (Optional) decoders and encoders. Defaults to mldock's.
+        """
+        if worker_type not in ("thread", "fork"):
+            raise ValueError(
+                f"Unsupported worker_type '{worker_type}', expected thread or fork"
+            )
+        self.model_service = model_service
+        self.accept = accept
+        self.batch_size = batch_size
+        self.shard_size = shard_size
+        self.num_workers = num_workers or os.cpu_count() or 1
+        self.worker_type = worker_type
+        self.codecs = codecs or default_codec_registry()
+        self.media_type, self.encoder = self.codecs.encoder_for(accept)
+        # encoded shards of other formats cannot be joined, e.g. json documents
+        self.line_delimited = self.media_type in SPLITTABLE_CONTENT_TYPES
+
+    @classmethod
+    def from_environment(cls, model_service, environment, **kwargs):
+        """
+        Create a batch transform configured from MLDOCK_BATCH_ACCEPT, MLDOCK_BATCH_SIZE,
+        MLDOCK_BATCH_SHARD_SIZE, MLDOCK_BATCH_WORKERS and MLDOCK_BATCH_WORKER_TYPE.
+
+        args:
+            model_service (ModelService): model service with a loaded model
+            environment: container environment
+        return:
+            BatchTransform
+        """
+        env = environment.environment_variables
+        return cls(
+            model_service,
+            accept=env.str("MLDOCK_BATCH_ACCEPT", "text/csv"),
+            batch_size=env.int("MLDOCK_BATCH_SIZE", 1024),
+            shard_size=env.int("MLDOCK_BATCH_SHARD_SIZE", DEFAULT_SHARD_SIZE),
+            num_workers=env.int("MLDOCK_BATCH_WORKERS", None),
+            worker_type=env.str("MLDOCK_BATCH_WORKER_TYPE", "thread"),
+            **kwargs,
+        )
+
+    def _batches(self, data: bytes, content_type: str):
+        """decode a shard in to micro-batches of at most batch_size records"""
+        if content_type == "application/jsonlines":
+            yield from jsonlines_to_numpy(data, batch_size=self.batch_size)
+            return
+
+        input_data = self.codecs.decoder_for(content_type)(data)
+        if content_type == "text/csv" and _count_records(data) == 1:
+            # a single row is squeezed to one dimension by the decoder
+            input_data = np.reshape(input_data, (1, -1))
+        for start in range(0, len(input_data), self.batch_size):
+            yield input_data[start : start + self.batch_size]
+
+    def _predict(self, input_data):
+        """run the model service stages on a micro-batch"""
+        model_service = self.model_service
+        return model_service.output_transform(
+            model_service.predict(model_service.input_transform(input_data))
+        )
+
+    def _encode(self, output) -> bytes:
+        """encode results in the accept format"""
+        content = self.encoder(output)
+        if isinstance(content, str):
+            content = content.encode()
+        if self.line_delimited and not content.endswith(b"\n"):
+            # results of consecutive shards are assembled line by line
+            content += b"\n"
+        return content
+
+    def process_shard(self, shard: dict) -> bytes:
+        """
+        Run a shard through the model service.
+
+        args:
+            shard (dict): path, content_type, start and end byte offsets
+        return:
+            bytes: encoded results when line delimited, otherwise the pickled
+                results, merged with the file's other shards before encoding
+        """
+        with open(shard["path"], "rb") as file_:
+            file_.seek(shard["start"])
+            data = file_.read(shard["end"] - shard["start"])
+
+        outputs = [
+            self._predict(batch) for batch in self._batches(data, shard["content_type"])
+        ]
+        if not outputs:
+            return b""
+        output = concatenate_batches(outputs)
+        if not self.line_delimited:
+            return pickle.dumps(output, protocol=pickle.HIGHEST_PROTOCOL)
+        return self._encode(output)
+
+    def _plan(self, path: Path, content_type: str, checkpoint_dir: Path) -> list:
+        """the file's shards, reusing the checkpointed plan of a restarted job"""
+        plan_path = Path(checkpoint_dir, "shards.json")
+        if plan_path.exists():
+            with open(plan_path) as file_:
+                return json.load(file_)
+
+        if content_type in SPLITTABLE_CONTENT_TYPES:
+            ranges = shard_file(path, self.shard_size)
+        else:
+            ranges = [(0, os.path.getsize(path))]
+        shards = [
+            {
+                "index": index,
+                "path": path.as_posix(),
+                "content_type": content_type,
+                "start": start,
+                "end": end,
+            }
+            for index, (start, end) in enumerate(ranges)
+        ]
+        checkpoint_dir.mkdir(parents=True, exist_ok=True)
+        _write_atomic(plan_path, json.dumps(shards).encode())
+        return shards
+
+    def _decodable(self, content_type: str) -> bool:
+        """whether shards of a content type can be decoded"""
+        return (
+            content_type == "application/jsonlines"
+            or content_type in self.codecs.decoders
+        )
+
+    def _files(self, input_dir: Path, output_dir: Path) -> list:
+        """input files still to transform, with their output paths"""
+        files = []
+        for path in sorted(input_dir.rglob("*")):
+            if not path.is_file():
+                continue
+            relative_path = path.relative_to(input_dir)
+            output_path = Path(output_dir, f"{relative_path}{OUTPUT_SUFFIX}")
+            content_type = content_type_for_path(path)
+            if content_type is None:
+                logger.info(f"Skipping file with unknown content type: {path}")
+            elif not self._decodable(content_type):
+                logger.warning(
+                    f"Skipping file without a {content_type} decoder: {path}"
+                )
+            elif output_path.exists():
+                logger.info(f"Skipping completed file: {path}")
+            else:
+                files.append((path, content_type, output_path))
+        return files
+
+    def transform(self, input_dir: str, output_dir: str) -> dict:
+        """
+        Transform every file in a directory, resuming from checkpoints.
+
+        args:
+            input_dir (str): directory of input files
+            output_dir (str): directory to write results to
+        return:
+            dict: number of files and shards processed and resumed
+        """
+        input_dir, output_dir = Path(input_dir), Path(output_dir)
+        stats = {"files": 0, "shards": 0, "resumed_shards": 0}
+        files = []
+        todo = []
+        for path, content_type, output_path in self._files(input_dir, output_dir):
+            checkpoint_dir = Path(
+                output_dir, CHECKPOINT_DIR_NAME, path.relative_to(input_dir)
+            )
+            parts = []
+            for shard in self._plan(path, content_type, checkpoint_dir):
+                part = Path(checkpoint_dir, f"part-{shard['index']:05d}")
+                parts.append(part)
+                if part.exists():
+                    stats["resumed_shards"] += 1
+                else:
+                    todo.append((shard, part))
+            files.append((output_path, checkpoint_dir, parts))
+
+        stats["shards"] = len(todo)
+        logger.info(
+            f"Transforming {len(todo)} shard(s) of {len(files)} file(s), "
+            f"{stats['resumed_shards']} shard(s) already completed"
+        )
+        self._run_shards(todo)
+
+        for output_path, checkpoint_dir, parts in files:
+            self._assemble(output_path, parts)
+            shutil.rmtree(checkpoint_dir)
+            stats["files"] += 1
+        return stats
+
+    def _assemble(self, output_path: Path, parts: list):
+        """write a file's results from its checkpointed shards, in input order"""
+        output_path.parent.mkdir(parents=True, exist_ok=True)
+        if not self.line_delimited:
+            # checkpoints are written by process_shard, not untrusted input
+            outputs = [
+                pickle.loads(part.read_bytes()) for part in parts if part.stat().st_size
+            ]
+            _write_atomic(
+                output_path,
+                self._encode(concatenate_batches(outputs)) if outputs else b"",
+            )
+            return
+
+        tmp_path = output_path.with_name(output_path.name + ".tmp")
+        with open(tmp_path, "wb") as output:
+            for part in parts:
+                with open(part, "rb") as file_:
+                    shutil.copyfileobj(file_, output)
+        os.replace(tmp_path, output_path)
+
+    def _run_shards(self, shards: list):
+        """
+        Process shards in parallel, checkpointing each result as soon as it
+        completes. A failing shard is raised once the others have finished, so
+        their results are kept for a restarted job.
+        """
+        if not shards:
+            return
+        if self.worker_type == "fork":
+            pool = ForkedWorkerPool(self.process_shard, num_workers=self.num_workers)
+            pool.start()
+            submit, close = pool.submit, pool.close
+        else:
+            executor = ThreadPoolExecutor(
+                max_workers=self.num_workers, thread_name_prefix="mldock-batch"
+            )
+            submit = partial(executor.submit, self.process_shard)
+            close = executor.shutdown
+        error = None
+        try:
+            futures = {submit(shard): part for shard, part in shards}
+            for future in as_completed(futures):
+                # drop the result once checkpointed
+                part = futures.pop(future)
+                try:
+                    _write_atomic(part, future.result())
+                except Exception as exception:  # pylint: disable=broad-except
+                    logger.error(f"Failed to transform shard {part}: {exception}")
+                    error = error or exception
+        finally:
+            close()
+        if error is not None:
+            raise error
+
+    def run(self, environment) -> dict:
+        """
+        Transform the files of every input channel in to the output directory.
+
+        args:
+            environment: container environment
+        return:
+            dict: channel -> transform stats
+        """
+        channels = [
+            channel["key"].replace("MLDOCK_INPUT_CHANNEL_", "").lower()
+            for channel in environment.get_input_channel_iter()
+        ]
+        if not channels:
+            # local runs, transform every channel directory
+            channels = sorted(
+                path.name
+                for path in Path(environment.input_data_dir).iterdir()
+                if path.is_dir()
+            )
+
+        results = {}
+        for channel in channels:
+            input_dir = Path(environment.input_data_dir, channel)
+            if not input_dir.is_dir():
+                logger.info(f"Skipping channel {channel}, {input_dir} not found")
+                continue
+            results[channel] = self.transform(
+                input_dir, Path(environment.output_data_dir, channel)
+            )
+        return results
@@ -0,0 +1,202 @@
+"""
+DYNAMIC MICRO-BATCHING
+
+Queues concurrent prediction requests and merges them in to a single batch,
+up to a maximum batch size or maximum wait time, so the model's predict is
+called once per batch. Outputs are split back to each caller.
+
+e.g.
+    batcher = MicroBatcher(model_service.predict, max_batch_size=64, max_wait_ms=5)
+    predictions = batcher.predict(input_data)
+"""
+
+import asyncio
+import logging
+import queue
+import threading
+import time
+from concurrent.futures import Future
+
+import numpy as np
+
+logger = logging.getLogger("mldock")
+
+
+def batch_size(input_data) -> int:
+    """number of records in a request's input data"""
+    return len(input_data)
+
+
+def concatenate_batches(inputs: list):
+    """
+    Merge the input data of many requests in to a single batch.
+
+    args:
+        inputs (list): input data per request, either lists, pandas dataframes or array-likes.
+    return:
+        merged batch of the same type
+    """
+    first = inputs[0]
+    if isinstance(first, list):
+        return [record for input_data in inputs for record in input_data]
+    if hasattr(first, "iloc"):
+        # pylint: disable=import-outside-toplevel
+        import pandas as pd
+
+        return pd.concat(inputs, ignore_index=True)
+    return np.concatenate([np.asarray(input_data) for input_data in inputs], axis=0)
+
+
+def split_batches(outputs, sizes: list) -> list:
+    """
+    Split the outputs of a merged batch back in to outputs per request.
+
+    args:
+        outputs: batch outputs, either lists, pandas objects or array-likes.
+        sizes (list): number of records per request, in batch order.
+    return:
+        list: outputs per request
+    """
+    if hasattr(outputs, "iloc"):
+        outputs = outputs.iloc
+    results = []
+    start = 0
+    for size in sizes:
+        results.append(outputs[start : start + size])
+        start += size
+    return results
+
+
+class MicroBatcher:
+    """
+    Dynamic micro-batching engine around a vectorized predict callable.
+
+    Requests are queued by caller threads (or coroutines) and a background
+    worker merges whatever is queued, up to max_batch_size records, waiting at
+    most max_wait_ms for a batch to fill before calling predict. A request that
+    would overflow a batch starts the next one, only a single request larger
+    than max_batch_size is predicted on as a batch of its own.
+    """
+
+    # pylint: disable=too-many-instance-attributes,too-many-arguments
+    def __init__(
+        self,
+        predict,
+        max_batch_size: int = 32,
+        max_wait_ms: float = 5.0,
+        concatenate=concatenate_batches,
+        split=split_batches,
+    ):
+        if max_batch_size < 1:
+            raise ValueError("max_batch_size must be a positive integer")
+
+        self.predict_fn = predict
+        self.max_batch_size = max_batch_size
+        self.max_wait_ms = max_wait_ms
+        self.concatenate = concatenate
+        self.split = split
+
+        self.batches = 0
+        self.records = 0
+
+        self._queue = queue.Queue()
+        # request that overflowed the previous batch, it starts the next one
+        self._carry = None
+        self._closed = threading.Event()
+        self._worker = threading.Thread(
+            target=self._run, name="mldock-micro-batcher", daemon=True
+        )
+        self._worker.start()
+
+    @property
+    def mean_batch_size(self) -> float:
+        """mean number of records per predict call"""
+        return self.records / self.batches if self.batches else 0.0
+
+    def submit(self, input_data) -> Future:
+        """
+        Queue a request's input data for the next batch.
+
+        args:
+            input_data: records to predict on
+        return:
+            Future: resolves to the request's predictions
+        """
+        if self._closed.is_set():
+            raise RuntimeError("MicroBatcher is closed")
+        future = Future()
+        self._queue.put((input_data, batch_size(input_data), future))
+        return future
+
+    def predict(self, input_data):
+        """predict on input_data as part of a batch, blocking until predictions are ready"""
+        return self.submit(input_data).result()
+
+    async def predict_async(self, input_data):
+        """predict on input_data as part of a batch, without blocking the event loop"""
+        return await asyncio.wrap_future(self.submit(input_data))
+
+    def close(self, timeout: float = None):
+        """stop the batching worker once queued requests are processed"""
+        self._closed.set()
+        self._queue.put(None)
+        self._worker.join(timeout)
+
+    def _collect(self, first) -> list:
+        """collect requests in to a batch until it is full or the wait time elapses"""
+        pending = [first]
+        records = first[1]
+        deadline = time.monotonic() + self.max_wait_ms / 1000.0
+        while records < self.max_batch_size:
+            timeout = deadline - time.monotonic()
+            if timeout <= 0:
+                break
+            try:
+                item = self._queue.get(timeout=timeout)
+            except queue.Empty:
+                break
+            if item is None:
+                # re-queue the close sentinel for the run loop
+                self._queue.put(None)
+                break
+            if records + item[1] > self.max_batch_size:
+                self._carry = item
+                break
+            pending.append(item)
+            records += item[1]
+        return pending
+
+    def _run(self):
+        """batching worker loop"""
+        while True:
+            if self._carry is not None:
+                item, self._carry = self._carry, None
+            else:
+                item = self._queue.get()
+            if item is None:
+                return
+            self._process(self._collect(item))
+
+    def _process(self, pending: list):
+        """run predict once for a batch and resolve each request's future"""
+        inputs, sizes, futures = zip(*pending)
+        try:
+            batch = self.concatenate(list(inputs))
+            outputs = self.predict_fn(batch)
+            if len(outputs) != sum(sizes):
+                raise ValueError(
+                    "predict returned {} outputs for a batch of {} records".format(
+                        len(outputs), sum(sizes)
+                    )
+                )
+            results = self.split(outputs, list(sizes))
+        except Exception as exception:  # pylint: disable=broad-except
+            logger.error("Exception during batch prediction: {}".format(exception))
+            for future in futures:
+                future.set_exception(exception)
+            return
+
+        self.batches += 1
+        self.records += sum(sizes)
+        for future, result in zip(futures, results):
+            future.set_result(result)
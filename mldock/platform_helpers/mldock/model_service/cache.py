@@ -0,0 +1,227 @@
+"""
+    MULTI-MODEL CACHE
+
+    Lazily loads models by model id from the model channel and keeps the most
+    recently used ones in memory, evicting least recently used models when the
+    approximate memory footprint exceeds a budget.
+
+    e.g.
+        models = ModelCache(load_model=MyModelService.load_model, model_dir=environment.model_dir)
+        model = models.get("tenant-a")
+"""
+import logging
+import os
+import sys
+import threading
+from collections import OrderedDict
+from concurrent.futures import Future
+from pathlib import Path
+
+import numpy as np
+
+from mldock.platform_helpers.mldock.model_service.workers import read_rss
+
+logger = logging.getLogger("mldock")
+
+# objects nested deeper than this are not counted towards a model's footprint
+SIZEOF_MAX_DEPTH = 64
+
+
+def estimate_model_size(model) -> int:
+    """
+    Approximate the memory footprint of a model, in bytes.
+
+    Walks the model's object graph summing sys.getsizeof, which includes the data
+    of numpy arrays that own it. Shared objects are counted once. Memory held by
+    native objects, e.g. torch tensors, xgboost boosters or scikit-learn's cython
+    trees, is not visible to the walk, see ModelCache for measuring it.
+
+    args:
+        model: loaded model object
+    return:
+        int: approximate size in bytes
+    """
+    seen = set()
+    size = 0
+    stack = [(model, 0)]
+    while stack:
+        obj, depth = stack.pop()
+        if id(obj) in seen or depth > SIZEOF_MAX_DEPTH:
+            continue
+        seen.add(id(obj))
+
+        size += sys.getsizeof(obj)
+        if isinstance(obj, np.ndarray):
+            # arrays owning their data include it in getsizeof, views count their base
+            if obj.base is not None:
+                stack.append((obj.base, depth + 1))
+            continue
+
+        if isinstance(obj, (str, bytes, bytearray, int, float, bool)):
+            continue
+        if isinstance(obj, dict):
+            children = list(obj.keys()) + list(obj.values())
+        elif isinstance(obj, (list, tuple, set, frozenset)):
+            children = list(obj)
+        else:
+            children = list(getattr(obj, "__dict__", {}).values())
+            children.extend(
+                getattr(obj, slot)
+                for slot in getattr(type(obj), "__slots__", ())
+                if isinstance(slot, str) and hasattr(obj, slot)
+            )
+        stack.extend((child, depth + 1) for child in children)
+    return size
+
+
+class ModelCache:
+    """
+    LRU cache of models keyed by model id, with single-flight loading.
+
+    Concurrent first requests for the same model id trigger a single load, the
+    other callers wait for its result.
+
+    Unless a sizeof callable is given, a model's footprint is the growth of the
+    process' resident set size while loading it, so native allocations count,
+    or its estimate_model_size if larger, e.g. for memory freed by an eviction
+    and reused by the load. Loads running concurrently in other threads skew the
+    measurement, pass sizeof for exact accounting of large native models.
+    """
+
+    # pylint: disable=too-many-instance-attributes
+    def __init__(
+        self,
+        load_model,
+        model_dir: str,
+        memory_budget: int = None,
+        max_models: int = None,
+        sizeof=None,
+    ):
+        """
+        args:
+            load_model (callable): load_model(model_path), e.g. ModelService.load_model
+            model_dir (str): model channel, models are loaded from <model_dir>/<model_id>
+            memory_budget (int): (Optional) approximate memory budget for cached models, in bytes
+            max_models (int): (Optional) maximum number of cached models
+            sizeof (callable): (Optional) returns the memory footprint of a model in bytes,
+                e.g. summing the nbytes of its tensors. Defaults to measuring the load.
+        """
+        self.load_model = load_model
+        self.model_dir = Path(model_dir)
+        self.memory_budget = memory_budget
+        self.max_models = max_models
+        self.sizeof = sizeof
+
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+        self._models = OrderedDict()
+        self._sizes = {}
+        self._loading = {}
+        self._lock = threading.Lock()
+
+    def __contains__(self, model_id: str) -> bool:
+        with self._lock:
+            return model_id in self._models
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._models)
+
+    @property
+    def memory_usage(self) -> int:
+        """approximate memory footprint of the cached models, in bytes"""
+        with self._lock:
+            return sum(self._sizes.values())
+
+    def model_path(self, model_id: str) -> Path:
+        """path to a model's artifacts in the model channel"""
+        path = Path(self.model_dir, model_id)
+        if path.resolve().parent != self.model_dir.resolve():
+            raise ValueError(f"Invalid model id: {model_id}")
+        return path
+
+    def get(self, model_id: str):
+        """
+        Get a model, loading it from the model channel on first use.
+
+        args:
+            model_id (str): id of the model, i.e. its directory in the model channel
+        return:
+            loaded model
+        """
+        with self._lock:
+            if model_id in self._models:
+                self._models.move_to_end(model_id)
+                self.hits += 1
+                return self._models[model_id]
+
+            self.misses += 1
+            future = self._loading.get(model_id)
+            is_loader = future is None
+            if is_loader:
+                future = Future()
+                self._loading[model_id] = future
+
+        if not is_loader:
+            return future.result()
+
+        try:
+            rss_before = read_rss(os.getpid())
+            model = self.load_model(self.model_path(model_id).as_posix())
+            size = self._size(model, rss_before)
+        except Exception as exception:
+            with self._lock:
+                del self._loading[model_id]
+            future.set_exception(exception)
+            raise
+
+        with self._lock:
+            del self._loading[model_id]
+            self._models[model_id] = model
+            self._sizes[model_id] = size
+            self._evict(keep=model_id)
+        logger.info(f"Loaded model {model_id} ({size / 2 ** 20:.1f} MiB)")
+        future.set_result(model)
+        return model
+
+    def _size(self, model, rss_before: int) -> int:
+        """memory footprint of a model loaded when the resident set size was rss_before"""
+        if self.sizeof is not None:
+            return self.sizeof(model)
+        size = estimate_model_size(model)
+        rss_after = read_rss(os.getpid())
+        if rss_before is not None and rss_after is not None:
+            size = max(size, rss_after - rss_before)
+        return size
+
+    def evict(self, model_id: str):
+        """remove a model from the cache"""
+        with self._lock:
+            if model_id in self._models:
+                self._remove(model_id)
+
+    def _remove(self, model_id: str):
+        """remove a model, the lock must be held"""
+        del self._models[model_id]
+        del self._sizes[model_id]
+        self.evictions += 1
+        logger.info(f"Evicted model {model_id}")
+
+    def _over_budget(self) -> bool:
+        """whether the cache exceeds its memory budget or size, the lock must be held"""
+        if self.max_models is not None and len(self._models) > self.max_models:
+            return True
+        if self.memory_budget is not None:
+            return sum(self._sizes.values()) > self.memory_budget
+        return False
+
+    def _evict(self, keep: str):
+        """evict least recently used models until within budget, the lock must be held"""
+        while self._over_budget():
+            model_id = next(iter(self._models))
+            if model_id == keep:
+                # the newest model alone exceeds the budget, keep serving it
+                break
+            self._remove(model_id)
@@ -4,8 +4,11 @@
     Provides a set of decorators for Training and prediction workflows, which include
     error handling and start up and cleanup steps in the workflow management.
 """
+import atexit
 from functools import wraps
 import os
+import threading
+import time
 import traceback
 
 
@@ -29,6 +32,24 @@ def make_decorator(foreign_decorator):
     return new_decorator
 
 
+def write_failure(exception, environment, logger):
+    """
+    Write out an error file and log the exception with its traceback.
+
+    Args:
+        exception (Exception): exception raised in the workflow
+        environment: container environment, providing the output_data_dir
+        logger: container logger
+    """
+    # This will be returned as the failureReason in the DescribeTrainingJob result.
+    trc = traceback.format_exc()
+    log_file_path = os.path.join(environment.output_data_dir, "failure")
+    with open(log_file_path, "w") as file_:
+        file_.write("Exception during training: " + str(exception) + "\n" + trc)
+    # Printing this causes the exception to be in the training job logs, as well.
+    logger.error("Exception during training: " + str(exception) + "\n" + trc)
+
+
 def trainer(container, environment, logger):
     """
     Args:
@@ -51,18 +72,7 @@ def trainer(container, environment, logger):
 
                 function(*args, **kwargs)
             except Exception as exception:
-                # Write out an error file. This will be returned as the failureReason in the
-                # DescribeTrainingJob result.
-                trc = traceback.format_exc()
-                log_file_path = os.path.join(environment.output_data_dir, "failure")
-                with open(log_file_path, "w") as file_:
-                    file_.write(
-                        "Exception during training: " + str(exception) + "\n" + trc
-                    )
-                # Printing this causes the exception to be in the training job logs, as well.
-                logger.error(
-                    "Exception during training: " + str(exception) + "\n" + trc
-                )
+                write_failure(exception, environment, logger)
                 raise
             finally:
                 training.cleanup()
@@ -99,18 +109,7 @@ def predictor(container, environment, logger):
 
                 return function(*args, **kwargs)
             except Exception as exception:
-                # Write out an error file. This will be returned as the failureReason in the
-                # DescribeTrainingJob result.
-                trc = traceback.format_exc()
-                log_file_path = os.path.join(environment.output_data_dir, "failure")
-                with open(log_file_path, "w") as file_:
-                    file_.write(
-                        "Exception during training: " + str(exception) + "\n" + trc
-                    )
-                # Printing this causes the exception to be in the training job logs, as well.
-                logger.error(
-                    "Exception during training: " + str(exception) + "\n" + trc
-                )
+                write_failure(exception, environment, logger)
                 raise
             finally:
                 serving.cleanup_worker()
@@ -120,3 +119,94 @@ def predictor(container, environment, logger):
     # add doc and decorator metadata
     general_decorator = make_decorator(general_decorator)
     return general_decorator
+
+
+def cached_predictor(container, environment, logger):
+    """
+    Args:
+        ServingContainer, environment, logger
+
+    note:
+        - unlike predictor, the serving container is created once per worker process
+          and cached. startup_worker runs on the first call in a worker and
+          cleanup_worker when the worker exits (or on .close()), not on every request.
+        - the decorated function exposes .serving_container(), .close() and
+          .hook_overhead, the seconds spent in the worker hooks.
+    """
+
+    def general_decorator(function):
+        lock = threading.Lock()
+        state = {"pid": None, "serving": None}
+        hook_overhead = {"startup_worker": 0.0, "cleanup_worker": 0.0}
+
+        def close():
+            """run cleanup_worker for the cached serving container of this process"""
+            with lock:
+                serving = state["serving"]
+                if serving is None or state["pid"] != os.getpid():
+                    return
+                state["serving"] = None
+                start = time.perf_counter()
+                serving.cleanup_worker()
+                hook_overhead["cleanup_worker"] = time.perf_counter() - start
+
+        def serving_container():
+            """return the serving container of this process, starting it on first use"""
+            serving = state["serving"]
+            if serving is not None and state["pid"] == os.getpid():
+                return serving
+            with lock:
+                # a forked worker inherits the parent's container, so build its own
+                if state["serving"] is None or state["pid"] != os.getpid():
+                    serving = container(
+                        container_environment=environment, container_logger=logger
+                    )
+                    start = time.perf_counter()
+                    serving.startup_worker()
+                    hook_overhead["startup_worker"] = time.perf_counter() - start
+                    state["pid"] = os.getpid()
+                    state["serving"] = serving
+                    atexit.register(close)
+                return state["serving"]
+
+        @wraps(function)
+        def func_wrapper(*args, **kwargs):
+            """
+            Wrapper function to decorate function
+            """
+            serving_container()
+            try:
+                return function(*args, **kwargs)
+            except Exception as exception:
+                write_failure(exception, environment, logger)
+                raise
+
+        func_wrapper.serving_container = serving_container
+        func_wrapper.close = close
+        func_wrapper.hook_overhead = hook_overhead
+        return func_wrapper
+
+    # add doc and decorator metadata
+    general_decorator = make_decorator(general_decorator)
+    return general_decorator
+
+
+def measure_hook_overhead(container, environment, logger, iterations: int = 100):
+    """
+    Measure the per-request overhead predictor adds by creating the serving
+    container and running startup_worker and cleanup_worker on every call.
+
+    Args:
+        container: ServingContainer class
+        environment: container environment
+        logger: container logger
+        iterations (int): number of simulated requests
+    Returns:
+        float: mean overhead per request in seconds
+    """
+    start = time.perf_counter()
+    for _ in range(iterations):
+        serving = container(container_environment=environment, container_logger=logger)
+        serving.startup_worker()
+        serving.cleanup_worker()
+    return (time.perf_counter() - start) / iterations
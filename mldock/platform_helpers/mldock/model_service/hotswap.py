@@ -0,0 +1,309 @@
+"""
+    MODEL HOT-SWAP
+
+    Watches the model channel for new model versions, loads and warms a new
+    version alongside the current one, switches traffic to it atomically and
+    frees the old version once its in-flight requests have drained.
+
+    New versions are synced in to a staging directory of their own and loaded
+    from there, so the files of the version serving traffic (e.g. memory-mapped
+    arrays) are never rewritten. Versions are fingerprinted by file contents,
+    re-downloading identical artifacts does not trigger a swap.
+
+    e.g.
+        model = HotSwapModel(load_model=MyModelService.load_model, model_dir=environment.model_dir)
+        model.load()
+        model.watch(
+            interval=30,
+            sync=artifact_manager.setup_model_artifacts,
+            remote_version=artifact_manager.model_artifacts_version,
+        )
+
+        with model.acquire() as current:
+            current.predict(input_data)
+"""
+import gc
+import hashlib
+import logging
+import os
+import shutil
+import tempfile
+import threading
+import time
+from contextlib import contextmanager
+from pathlib import Path
+
+logger = logging.getLogger("mldock")
+
+HASH_CHUNK_SIZE = 1 << 20
+
+
+def _file_digest(path: Path) -> str:
+    """hash of a file's contents"""
+    digest = hashlib.blake2b(digest_size=16)
+    with open(path, "rb") as file_:
+        for chunk in iter(lambda: file_.read(HASH_CHUNK_SIZE), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def model_version(model_dir: str, hashes: dict = None):
+    """
+    Fingerprint the artifacts in a model directory from their paths, sizes and
+    contents. Rewriting a file with the same content keeps the fingerprint.
+
+    args:
+        model_dir (str): model channel
+        hashes (dict): (Optional) content hashes by path, size and modification time,
+            kept between calls so unchanged files are not read again
+    return:
+        str: version fingerprint, None if the directory holds no files
+    """
+    digest = hashlib.blake2b(digest_size=16)
+    seen = {}
+    for root, dirs, files in os.walk(model_dir):
+        dirs.sort()
+        for name in sorted(files):
+            path = Path(root, name)
+            try:
+                stat = path.stat()
+                key = (path.as_posix(), stat.st_size, stat.st_mtime_ns)
+                content = (hashes or {}).get(key) or _file_digest(path)
+            except FileNotFoundError:
+                # removed while walking, picked up on the next poll
+                continue
+            seen[key] = content
+            digest.update(
+                f"{path.relative_to(model_dir)}:{stat.st_size}:{content}\n".encode()
+            )
+    if hashes is not None:
+        hashes.clear()
+        hashes.update(seen)
+    return digest.hexdigest() if seen else None
+
+
+class _ModelVersion:
+    """a loaded model version, its directory and its in-flight request count"""
+
+    def __init__(self, model, version: str, path: Path):
+        self.model = model
+        self.version = version
+        self.path = path
+        self.in_flight = 0
+        self.drained = threading.Condition()
+
+
+class HotSwapModel:
+    """
+    Serves the current version of a model, swapping in new versions from the
+    model channel without downtime.
+    """
+
+    # pylint: disable=too-many-instance-attributes
+    def __init__(
+        self,
+        load_model,
+        model_dir: str,
+        warmup=None,
+        unload=None,
+        drain_timeout: float = 30.0,
+        staging_dir: str = None,
+    ):
+        """
+        args:
+            load_model (callable): load_model(model_path), e.g. ModelService.load_model
+            model_dir (str): model channel to watch
+            warmup (callable): (Optional) warmup(model), run on a new version before it takes traffic
+            unload (callable): (Optional) unload(model), run on an old version once drained
+            drain_timeout (float): maximum seconds to wait for in-flight requests on an old version
+            staging_dir (str): (Optional) directory synced versions are kept in, one
+                sub-directory per version. Defaults to .<model_dir name>-versions next to model_dir.
+        """
+        self.load_model = load_model
+        self.model_dir = Path(model_dir)
+        self.warmup = warmup
+        self.unload = unload
+        self.drain_timeout = drain_timeout
+        self.staging_dir = (
+            Path(staging_dir)
+            if staging_dir is not None
+            else Path(self.model_dir.parent, f".{self.model_dir.name}-versions")
+        )
+
+        self.swaps = 0
+        self.last_swap_duration = None
+
+        self._current = None
+        self._hashes = {}
+        self._remote_version = None
+        self._swap_lock = threading.Lock()
+        self._stop = threading.Event()
+        self._watcher = None
+
+    @property
+    def version(self):
+        """version fingerprint of the model serving traffic"""
+        current = self._current
+        return None if current is None else current.version
+
+    @property
+    def model(self):
+        """the model serving traffic"""
+        current = self._current
+        return None if current is None else current.model
+
+    def load(self, model_dir: str = None):
+        """
+        Load the model version in a directory if it differs from the one serving traffic.
+
+        args:
+            model_dir (str): (Optional) directory to load from. Defaults to the model channel.
+        return:
+            bool: whether a new version was swapped in
+        """
+        model_dir = Path(model_dir) if model_dir is not None else self.model_dir
+        with self._swap_lock:
+            version = model_version(model_dir, self._hashes)
+            if version is None or version == self.version:
+                return False
+
+            start = time.perf_counter()
+            model = self.load_model(model_dir.as_posix())
+            if model_version(model_dir, self._hashes) != version:
+                # artifacts changed while loading, retry on the next poll
+                logger.info("Model artifacts changed while loading, skipping swap")
+                return False
+            if self.warmup is not None:
+                self.warmup(model)
+
+            old, self._current = self._current, _ModelVersion(model, version, model_dir)
+            self.swaps += 1
+            self.last_swap_duration = time.perf_counter() - start
+            logger.info(
+                f"Swapped in model version {version} in {self.last_swap_duration:.3f}s"
+            )
+
+        if old is not None:
+            self._retire(old)
+        return True
+
+    def _retire(self, old: _ModelVersion):
+        """wait for in-flight requests on an old version, then free it"""
+        with old.drained:
+            drained = old.drained.wait_for(
+                lambda: old.in_flight == 0, timeout=self.drain_timeout
+            )
+        if not drained:
+            logger.warning(
+                f"Model version {old.version} still has {old.in_flight} "
+                f"in-flight request(s) after {self.drain_timeout}s"
+            )
+        if self.unload is not None:
+            self.unload(old.model)
+        old.model = None
+        gc.collect()
+        if old.path.parent == self.staging_dir:
+            shutil.rmtree(old.path, ignore_errors=True)
+
+    def poll(self, sync=None, remote_version=None):
+        """
+        Check for a new model version and swap it in.
+
+        args:
+            sync (callable): (Optional) sync(target_dir), downloads the model artifacts in to
+                target_dir, a new staging directory. Without sync, the model channel is checked.
+            remote_version (callable): (Optional) remote_version(), fingerprint of the remote
+                artifacts, e.g. from their sizes and ETags. The sync is skipped while it is unchanged.
+        return:
+            bool: whether a new version was swapped in
+        """
+        if sync is None:
+            return self.load()
+
+        remote = remote_version() if remote_version is not None else None
+        if remote is not None and remote == self._remote_version:
+            return False
+
+        self.staging_dir.mkdir(parents=True, exist_ok=True)
+        target_dir = tempfile.mkdtemp(prefix="version-", dir=self.staging_dir)
+        swapped = False
+        try:
+            sync(target_dir)
+            swapped = self.load(target_dir)
+        finally:
+            if not swapped:
+                shutil.rmtree(target_dir, ignore_errors=True)
+        self._remote_version = remote
+        return swapped
+
+    @contextmanager
+    def acquire(self):
+        """
+        Use the current model for the duration of a request. The model is not
+        freed by a swap until the request completes.
+
+        return:
+            model object
+        """
+        while True:
+            current = self._current
+            if current is None:
+                raise RuntimeError("No model version loaded")
+            with current.drained:
+                current.in_flight += 1
+            if self._current is current:
+                break
+            # swapped out before the request was counted, the version may
+            # already be retired, so release it and use the new one
+            self._release(current)
+        try:
+            yield current.model
+        finally:
+            self._release(current)
+
+    @staticmethod
+    def _release(current: _ModelVersion):
+        """end a request on a version, waking its retirement once drained"""
+        with current.drained:
+            current.in_flight -= 1
+            if current.in_flight == 0:
+                current.drained.notify_all()
+
+    def _watch(self, interval: float, sync, remote_version):
+        """poll for new versions until stopped"""
+        while not self._stop.wait(interval):
+            try:
+                self.poll(sync=sync, remote_version=remote_version)
+            except Exception as exception:  # pylint: disable=broad-except
+                # keep serving the current version
+                logger.error(f"Exception during model hot-swap: {str(exception)}")
+
+    def watch(self, interval: float = 30.0, sync=None, remote_version=None):
+        """
+        Poll for new versions in a background thread, see poll.
+
+        args:
+            interval (float): seconds between polls
+            sync (callable): (Optional) sync(target_dir), e.g. an artifact manager's
+                setup_model_artifacts to download new versions from the remote model channels
+            remote_version (callable): (Optional) remote_version(), e.g. an artifact
+                manager's model_artifacts_version, skips downloads of unchanged versions
+        return:
+            threading.Thread: the watcher thread
+        """
+        self._stop.clear()
+        self._watcher = threading.Thread(
+            target=self._watch,
+            args=(interval, sync, remote_version),
+            name="mldock-model-watcher",
+            daemon=True,
+        )
+        self._watcher.start()
+        return self._watcher
+
+    def stop(self):
+        """stop watching the model channel"""
+        self._stop.set()
+        if self._watcher is not None:
+            self._watcher.join()
+            self._watcher = None
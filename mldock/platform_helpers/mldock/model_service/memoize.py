@@ -0,0 +1,235 @@
+"""
+    PREDICTION MEMOIZATION
+
+    Caches predictions (or encoded responses) keyed by a hash of the decoded
+    input, or of the raw request body and its content type, so repeated
+    payloads are not recomputed. The cache is bounded in size and entries
+    expire after a time to live, evicting least recently used entries first.
+
+    Cached numpy arrays are read-only, hits return read-only views of them and
+    copies of other mutable values, so callers mutating a result cannot corrupt
+    later hits.
+
+    e.g.
+        prediction_cache = PredictionCache(max_size=10000, ttl=300)
+
+        @prediction_cache.memoize(key=payload_key)
+        def invoke(payload, content_type, accept=None):
+            ...
+"""
+import copy
+import hashlib
+import pickle
+import threading
+import time
+from collections import OrderedDict
+from functools import wraps
+
+import numpy as np
+
+
+def _digest(*parts) -> str:
+    """hash byte strings in to a cache key"""
+    hasher = hashlib.blake2b(digest_size=20)
+    for part in parts:
+        hasher.update(len(part).to_bytes(8, "little"))
+        hasher.update(part)
+    return hasher.hexdigest()
+
+
+def payload_key(payload, content_type: str = None, accept: str = None) -> str:
+    """
+    Cache key for a raw request body, its content type and the accepted response type.
+
+    args:
+        payload (bytes or str): request body
+        content_type (str): request Content-Type header
+        accept (str): request Accept header
+    return:
+        str: cache key
+    """
+    if isinstance(payload, str):
+        payload = payload.encode()
+    return _digest(
+        memoryview(payload).cast("B"),
+        (content_type or "").encode(),
+        (accept or "").encode(),
+    )
+
+
+def input_key(input_data) -> str:
+    """
+    Cache key for decoded input data.
+
+    Numpy arrays are hashed by dtype, shape and data. Other inputs (e.g. lists,
+    dicts or dataframes) are hashed by their pickled bytes.
+
+    args:
+        input_data: decoded input data
+    return:
+        str: cache key
+    """
+    if isinstance(input_data, np.ndarray) and input_data.dtype.kind not in "OV":
+        data = np.ascontiguousarray(input_data)
+        return _digest(
+            data.dtype.str.encode(),
+            repr(data.shape).encode(),
+            memoryview(data).cast("B"),
+        )
+    return _digest(pickle.dumps(input_data, protocol=4))
+
+
+# values returned on cache hits as they are
+IMMUTABLE_TYPES = (bytes, str, int, float, complex, bool, type(None), frozenset)
+
+
+def _read_only(value):
+    """a copy of value to cache, with numpy arrays made read-only"""
+    if isinstance(value, np.ndarray):
+        value = value.copy()
+        value.flags.writeable = False
+        return value
+    if isinstance(value, tuple):
+        return tuple(_read_only(item) for item in value)
+    if isinstance(value, IMMUTABLE_TYPES):
+        return value
+    return copy.deepcopy(value)
+
+
+def _share(value):
+    """a cached value safe to return on a hit"""
+    if isinstance(value, np.ndarray):
+        # views of a read-only array cannot be made writeable
+        return value.view()
+    if isinstance(value, tuple):
+        return tuple(_share(item) for item in value)
+    if isinstance(value, IMMUTABLE_TYPES):
+        return value
+    return copy.deepcopy(value)
+
+
+class PredictionCache:
+    """
+    Thread-safe LRU cache with a time to live, counting hits and misses.
+    A max_size of 0 disables caching.
+    """
+
+    def __init__(self, max_size: int = 1024, ttl: float = None):
+        """
+        args:
+            max_size (int): maximum number of cached entries, 0 disables the cache
+            ttl (float): (Optional) seconds after which entries expire
+        """
+        self.max_size = max_size
+        self.ttl = ttl
+
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_environment(cls, environment):
+        """
+        Create a cache configured from MLDOCK_PREDICTION_CACHE_SIZE (default 0, disabled)
+        and MLDOCK_PREDICTION_CACHE_TTL (seconds, default no expiry).
+
+        args:
+            environment: container environment
+        return:
+            PredictionCache
+        """
+        env = environment.environment_variables
+        ttl = env.float("MLDOCK_PREDICTION_CACHE_TTL", None)
+        return cls(max_size=env.int("MLDOCK_PREDICTION_CACHE_SIZE", 0), ttl=ttl)
+
+    @property
+    def enabled(self) -> bool:
+        """whether the cache stores entries"""
+        return self.max_size > 0
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._entries)
+
+    def stats(self) -> dict:
+        """hit/miss counters and size of the cache"""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "size": len(self._entries),
+                "max_size": self.max_size,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "hit_ratio": self.hits / lookups if lookups else 0.0,
+            }
+
+    def get(self, key, default=None):
+        """get a cached value, counting a hit or miss. Arrays are read-only views."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                expires_at, value = entry
+                if expires_at is None or expires_at > time.monotonic():
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                    return _share(value)
+                del self._entries[key]
+                self.evictions += 1
+            self.misses += 1
+            return default
+
+    def put(self, key, value):
+        """cache a copy of a value, evicting least recently used entries over max_size"""
+        if not self.enabled:
+            return
+        value = _read_only(value)
+        expires_at = time.monotonic() + self.ttl if self.ttl is not None else None
+        with self._lock:
+            self._entries[key] = (expires_at, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def clear(self):
+        """remove every cached entry"""
+        with self._lock:
+            self._entries.clear()
+
+    def memoize(self, function=None, key=input_key):
+        """
+        Decorate a function to cache its results by key(*args, **kwargs).
+        Can be used as @cache.memoize or @cache.memoize(key=payload_key).
+
+        args:
+            function (callable): function to memoize, e.g. ModelService.predict
+            key (callable): computes the cache key from the function's arguments
+        return:
+            decorated function
+        """
+        if function is None:
+            return lambda function_: self.memoize(function_, key=key)
+
+        missing = object()
+
+        @wraps(function)
+        def func_wrapper(*args, **kwargs):
+            """
+            Wrapper function to decorate function
+            """
+            if not self.enabled:
+                return function(*args, **kwargs)
+
+            cache_key = key(*args, **kwargs)
+            result = self.get(cache_key, default=missing)
+            if result is missing:
+                result = function(*args, **kwargs)
+                self.put(cache_key, result)
+            return result
+
+        func_wrapper.prediction_cache = self
+        return func_wrapper
@@ -0,0 +1,170 @@
+"""
+PIPELINED STAGE EXECUTION
+
+Runs a sequence of stages, e.g. input_transform, predict and output_transform,
+each in its own worker thread connected by bounded queues, so that while one
+batch is in predict the next is being transformed and the previous one
+post-processed. Results keep submission order.
+
+e.g.
+    pipeline = model_service.create_pipeline(queue_size=4)
+    for predictions in pipeline.map(batches):
+        ...
+"""
+
+import asyncio
+import logging
+import queue
+import threading
+import time
+from collections import deque
+from concurrent.futures import Future
+
+logger = logging.getLogger("mldock")
+
+
+class _Stage:
+    """a pipeline stage, its input queue and busy time"""
+
+    def __init__(self, name: str, function, queue_size: int):
+        self.name = name
+        self.function = function
+        self.queue = queue.Queue(maxsize=queue_size)
+        self.busy_seconds = 0.0
+        self.items = 0
+        self.thread = None
+
+
+class StagePipeline:
+    """
+    Pipelined executor of stages, each running in a worker thread.
+
+    Stages overlap when they release the GIL, e.g. in numpy, pyarrow or
+    framework calls. The bounded queues apply backpressure, submit blocks
+    while the first stage's queue is full.
+    """
+
+    def __init__(self, stages: list, queue_size: int = 4):
+        """
+        args:
+            stages (list): (name, function) pairs, each function takes the previous stage's output
+            queue_size (int): maximum number of items queued in front of each stage
+        """
+        if not stages:
+            raise ValueError("StagePipeline requires at least one stage")
+        if queue_size < 1:
+            raise ValueError("queue_size must be a positive integer")
+
+        self.stages = [_Stage(name, function, queue_size) for name, function in stages]
+        self._closed = threading.Event()
+        self._started = time.perf_counter()
+        for index, stage in enumerate(self.stages):
+            stage.thread = threading.Thread(
+                target=self._run,
+                args=(index,),
+                name=f"mldock-pipeline-{stage.name}",
+                daemon=True,
+            )
+            stage.thread.start()
+
+    def submit(self, item) -> Future:
+        """
+        Queue an item for the first stage.
+
+        args:
+            item: input to the first stage
+        return:
+            Future: resolves to the last stage's output
+        """
+        if self._closed.is_set():
+            raise RuntimeError("StagePipeline is closed")
+        future = Future()
+        self.stages[0].queue.put((item, future))
+        return future
+
+    def run(self, item):
+        """run an item through all stages, blocking until the output is ready"""
+        return self.submit(item).result()
+
+    async def run_async(self, item):
+        """run an item through all stages, without blocking the event loop"""
+        return await asyncio.wrap_future(self.submit(item))
+
+    def map(self, items):
+        """
+        Stream items through the pipeline, keeping at most one queue's worth
+        of items in flight per stage.
+
+        args:
+            items (iterable): inputs to the first stage
+        return:
+            generator: last stage outputs, in order
+        """
+        max_in_flight = sum(stage.queue.maxsize + 1 for stage in self.stages)
+        in_flight = deque()
+        for item in items:
+            in_flight.append(self.submit(item))
+            if len(in_flight) >= max_in_flight:
+                yield in_flight.popleft().result()
+        while in_flight:
+            yield in_flight.popleft().result()
+
+    def stats(self) -> dict:
+        """
+        Per-stage utilisation, the fraction of wall time a stage was busy.
+        The stage with the highest utilisation bounds throughput.
+
+        return:
+            dict: stage name -> {"items", "busy_seconds", "utilisation", "queued"}
+        """
+        elapsed = time.perf_counter() - self._started
+        return {
+            stage.name: {
+                "items": stage.items,
+                "busy_seconds": stage.busy_seconds,
+                "utilisation": stage.busy_seconds / elapsed if elapsed else 0.0,
+                "queued": stage.queue.qsize(),
+            }
+            for stage in self.stages
+        }
+
+    def close(self, timeout: float = None):
+        """stop the stage workers once queued items are processed"""
+        self._closed.set()
+        self.stages[0].queue.put(None)
+        for stage in self.stages:
+            stage.thread.join(timeout)
+
+    def _run(self, index: int):
+        """stage worker loop, passing outputs to the next stage's queue"""
+        stage = self.stages[index]
+        next_queue = (
+            self.stages[index + 1].queue if index + 1 < len(self.stages) else None
+        )
+        while True:
+            entry = stage.queue.get()
+            if entry is None:
+                if next_queue is not None:
+                    next_queue.put(None)
+                return
+
+            item, future = entry
+            start = time.perf_counter()
+            try:
+                output = stage.function(item)
+            except Exception as exception:  # pylint: disable=broad-except
+                logger.error(
+                    "Exception during pipeline stage {}: {}".format(
+                        stage.name, exception
+                    )
+                )
+                future.set_exception(exception)
+                continue
+            finally:
+                stage.busy_seconds += time.perf_counter() - start
+                stage.items += 1
+
+            if next_queue is None:
+                future.set_result(output)
+            else:
+                next_queue.put((output, future))
@@ -0,0 +1,354 @@
+"""
+    FORKED INFERENCE WORKERS
+
+    Runs CPU-bound predict calls in forked worker processes, so one container
+    can use every core without each worker loading its own copy of the model.
+
+    The model is loaded once in the parent process and gc.freeze() moves it out
+    of the garbage collector's reach before forking, so the workers share the
+    model's memory pages copy-on-write. Requests are dispatched to idle workers
+    over a pipe per worker. A worker that dies, e.g. killed out of memory, fails
+    the request it was running with WorkerDiedError and is replaced by a new fork.
+
+    e.g.
+        model_service = MyModelService(model_path)
+        pool = ForkedWorkerPool(model_service.predict, num_workers=4)
+        pool.start()
+        predictions = pool.predict(input_data)
+
+    note:
+        - start the pool before starting any other threads, forking a process
+          with running threads can deadlock the child. Replacement workers are
+          forked by the dispatcher thread, predict should not rely on locks held
+          by other threads, e.g. logging from a worker.
+        - only supported on platforms with fork (linux, macOS).
+"""
+import asyncio
+import gc
+import itertools
+import logging
+import multiprocessing
+import os
+import pickle
+import threading
+import time
+import traceback
+from collections import deque
+from concurrent.futures import Future
+from multiprocessing.connection import wait
+
+logger = logging.getLogger("mldock")
+
+
+def read_rss(pid: int) -> int:
+    """resident set size of a process in bytes, None if /proc is unavailable"""
+    try:
+        with open(f"/proc/{pid}/statm", "r") as file_:
+            resident_pages = int(file_.read().split()[1])
+    except (OSError, IndexError, ValueError):
+        return None
+    return resident_pages * os.sysconf("SC_PAGE_SIZE")
+
+
+def read_cpu_seconds(pid: int) -> float:
+    """user + system cpu time of a process in seconds, None if /proc is unavailable"""
+    try:
+        with open(f"/proc/{pid}/stat", "r") as file_:
+            # fields after the parenthesised command name, utime & stime are 14th & 15th
+            fields = file_.read().rsplit(")", 1)[1].split()
+    except (OSError, IndexError):
+        return None
+    return (int(fields[11]) + int(fields[12])) / os.sysconf("SC_CLK_TCK")
+
+
+class WorkerDiedError(RuntimeError):
+    """Raised for a request whose worker process died while running it"""
+
+
+def _picklable_exception(exception: Exception) -> Exception:
+    """make sure an exception raised in a worker can be sent back to the parent"""
+    try:
+        pickle.dumps(exception)
+        return exception
+    except Exception:  # pylint: disable=broad-except
+        return RuntimeError(
+            "".join(traceback.format_exception_only(type(exception), exception))
+        )
+
+
+def _worker_loop(predict, connection):
+    """worker process loop, runs predict for each request received on connection"""
+    while True:
+        try:
+            item = connection.recv()
+        except EOFError:
+            return
+        if item is None:
+            return
+        request_id, input_data = item
+        try:
+            response = (request_id, True, predict(input_data))
+        except Exception as exception:  # pylint: disable=broad-except
+            response = (request_id, False, _picklable_exception(exception))
+        try:
+            connection.send(response)
+        except Exception as exception:  # pylint: disable=broad-except
+            # e.g. unpicklable predictions, nothing was sent
+            connection.send((request_id, False, _picklable_exception(exception)))
+
+
+class _Worker:
+    """a worker process, the parent's end of its pipe and the request it is running"""
+
+    def __init__(self, index: int, process, connection):
+        self.index = index
+        self.process = process
+        self.connection = connection
+        self.request_id = None
+
+
+class ForkedWorkerPool:
+    """
+    Pool of forked worker processes sharing the parent's model memory copy-on-write.
+    """
+
+    # pylint: disable=too-many-instance-attributes
+    def __init__(self, predict, num_workers: int = None):
+        """
+        args:
+            predict (callable): predict(input_data), closed over a model loaded in this process
+            num_workers (int): (Optional) number of worker processes. Defaults to the cpu count.
+        """
+        if not hasattr(os, "fork"):
+            raise RuntimeError(
+                "ForkedWorkerPool requires a platform that supports fork"
+            )
+
+        self.predict_fn = predict
+        self.num_workers = num_workers or os.cpu_count() or 1
+        # workers replaced after dying
+        self.restarts = 0
+
+        self._context = multiprocessing.get_context("fork")
+        self._workers = []
+        self._pending = deque()
+        self._futures = {}
+        self._request_ids = itertools.count()
+        self._lock = threading.Lock()
+        self._closing = threading.Event()
+        self._wakeup_reader, self._wakeup_writer = self._context.Pipe(duplex=False)
+        self._dispatcher = None
+        self._cpu_samples = {}
+
+    def start(self):
+        """freeze the parent's heap and fork the worker processes"""
+        # move the loaded model to the permanent generation, so the garbage
+        # collector does not touch (and copy) its pages in the workers
+        gc.collect()
+        gc.freeze()
+
+        self._workers = [self._spawn(index) for index in range(self.num_workers)]
+
+        self._dispatcher = threading.Thread(
+            target=self._dispatch, name="mldock-worker-dispatcher", daemon=True
+        )
+        self._dispatcher.start()
+        logger.info(f"Started {self.num_workers} inference worker(s)")
+        return self
+
+    def submit(self, input_data) -> Future:
+        """
+        Queue input data for the next free worker.
+
+        args:
+            input_data: records to predict on, must be picklable
+        return:
+            Future: resolves to the predictions
+        """
+        if self._dispatcher is None:
+            raise RuntimeError("ForkedWorkerPool is not started")
+        if self._closing.is_set():
+            raise RuntimeError("ForkedWorkerPool is closed")
+
+        future = Future()
+        with self._lock:
+            request_id = next(self._request_ids)
+            self._futures[request_id] = future
+            self._pending.append((request_id, input_data))
+            self._assign()
+        return future
+
+    def predict(self, input_data):
+        """predict on input_data in a worker process, blocking until predictions are ready"""
+        return self.submit(input_data).result()
+
+    async def predict_async(self, input_data):
+        """predict on input_data in a worker process, without blocking the event loop"""
+        return await asyncio.wrap_future(self.submit(input_data))
+
+    def worker_stats(self) -> list:
+        """
+        Report per worker resident memory and core utilisation.
+
+        Core utilisation is the fraction of one core used since the previous call
+        (or since the worker started).
+
+        return:
+            list: dicts of pid, alive, rss_bytes, cpu_seconds & cpu_utilisation per worker
+        """
+        now = time.monotonic()
+        with self._lock:
+            processes = [worker.process for worker in self._workers]
+        stats = []
+        for process in processes:
+            cpu_seconds = read_cpu_seconds(process.pid)
+            previous_cpu, previous_time = self._cpu_samples.get(
+                process.pid, (0.0, None)
+            )
+            utilisation = None
+            if cpu_seconds is not None and previous_time is not None:
+                utilisation = (cpu_seconds - previous_cpu) / max(
+                    now - previous_time, 1e-9
+                )
+            if cpu_seconds is not None:
+                self._cpu_samples[process.pid] = (cpu_seconds, now)
+            stats.append(
+                {
+                    "pid": process.pid,
+                    "alive": process.is_alive(),
+                    "rss_bytes": read_rss(process.pid),
+                    "cpu_seconds": cpu_seconds,
+                    "cpu_utilisation": utilisation,
+                }
+            )
+        return stats
+
+    def close(self, timeout: float = None):
+        """stop the workers once queued requests are processed"""
+        self._closing.set()
+        if self._dispatcher is not None:
+            self._wakeup_writer.send(None)
+            self._dispatcher.join(timeout)
+        for worker in self._workers:
+            worker.process.join(timeout)
+        gc.unfreeze()
+
+    def _spawn(self, index: int) -> _Worker:
+        """fork a worker process"""
+        connection, child_connection = self._context.Pipe()
+        process = self._context.Process(
+            target=_worker_loop,
+            args=(self.predict_fn, child_connection),
+            name=f"mldock-inference-worker-{index}",
+            daemon=True,
+        )
+        process.start()
+        child_connection.close()
+        self._cpu_samples[process.pid] = (
+            read_cpu_seconds(process.pid) or 0.0,
+            time.monotonic(),
+        )
+        return _Worker(index, process, connection)
+
+    def _assign(self):
+        """send pending requests to idle workers, the lock must be held"""
+        for worker in self._workers:
+            if not self._pending:
+                return
+            if worker.request_id is not None:
+                continue
+            request_id, input_data = self._pending.popleft()
+            try:
+                worker.connection.send((request_id, input_data))
+            except (OSError, EOFError):
+                # the worker died, the dispatcher replaces it
+                self._pending.appendleft((request_id, input_data))
+                continue
+            except Exception as exception:  # pylint: disable=broad-except
+                # e.g. unpicklable input data
+                self._futures.pop(request_id).set_exception(exception)
+                continue
+            worker.request_id = request_id
+
+    def _resolve(self, worker: _Worker, response):
+        """resolve the future of a worker's response, the lock must be held"""
+        request_id, success, result = response
+        worker.request_id = None
+        future = self._futures.pop(request_id)
+        if success:
+            future.set_result(result)
+        else:
+            future.set_exception(result)
+
+    def _replace(self, worker: _Worker):
+        """fail the request of a dead worker and fork a replacement"""
+        with self._lock:
+            if worker not in self._workers:
+                return
+            try:
+                # responses sent before the worker died
+                while worker.connection.poll():
+                    self._resolve(worker, worker.connection.recv())
+            except (OSError, EOFError):
+                pass
+            if worker.process.is_alive():
+                worker.process.kill()
+            worker.process.join()
+            worker.connection.close()
+            self._workers.remove(worker)
+
+            message = (
+                f"Inference worker {worker.process.pid} died "
+                f"with exit code {worker.process.exitcode}"
+            )
+            logger.error(message)
+            if worker.request_id is not None:
+                self._futures.pop(worker.request_id).set_exception(
+                    WorkerDiedError(f"{message} while running the request")
+                )
+            if not self._closing.is_set() or self._pending:
+                self._workers.append(self._spawn(worker.index))
+                self.restarts += 1
+            self._assign()
+
+    def _stop_if_idle(self) -> bool:
+        """stop the workers once no requests are pending or running"""
+        with self._lock:
+            if self._pending or any(
+                worker.request_id is not None for worker in self._workers
+            ):
+                return False
+            for worker in self._workers:
+                try:
+                    worker.connection.send(None)
+                except (OSError, EOFError):
+                    pass
+        return True
+
+    def _dispatch(self):
+        """resolve futures with the responses of the workers, replacing dead workers"""
+        while True:
+            if self._closing.is_set() and self._stop_if_idle():
+                return
+            with self._lock:
+                workers = list(self._workers)
+            connections = {worker.connection: worker for worker in workers}
+            sentinels = {worker.process.sentinel: worker for worker in workers}
+            ready = wait(list(connections) + list(sentinels) + [self._wakeup_reader])
+
+            for obj in ready:
+                if obj is self._wakeup_reader:
+                    self._wakeup_reader.recv()
+                elif obj in connections:
+                    worker = connections[obj]
+                    try:
+                        # only this thread reads worker connections
+                        response = worker.connection.recv()
+                    except (OSError, EOFError):
+                        self._replace(worker)
+                        continue
+                    with self._lock:
+                        self._resolve(worker, response)
+                        self._assign()
+                else:
+                    self._replace(sentinels[obj])
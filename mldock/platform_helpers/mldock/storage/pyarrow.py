@@ -8,6 +8,9 @@ from mldock.platform_helpers import utils
 
 logger = logging.getLogger("mldock")
 
+# file info fields identifying a remote file's content or version, by preference
+VERSION_TAG_FIELDS = ("ETag", "etag", "md5Hash", "crc32c", "generation", "mtime")
+
 
 def get_file_info(file_system: fs.FileSystem, artifacts_base_path: str):
     """Get file(s) info for download from pyarrow.fs.FileSystem
@@ -41,6 +44,40 @@ def get_file_info(file_system: fs.FileSystem, artifacts_base_path: str):
     return files
 
 
+def get_assets_version(
+    file_system: fs.FileSystem, fs_base_path: str, storage_location: str
+):
+    """Get the size and version tag (e.g. ETag) of the file(s) download_assets downloads,
+    from the file system's listing, without downloading them
+
+    Args:
+        file_system (fs.FileSystem): a pyarrow supported file system object
+        fs_base_path (str): base path including bucket name if remote filesystem
+        storage_location (str): relative location to base path
+
+    Returns:
+        List[tuple]: (path, size, version tag) per file
+    """
+    artifacts_base_path = Path(fs_base_path, storage_location).as_posix()
+    files = get_file_info(
+        file_system=file_system, artifacts_base_path=artifacts_base_path
+    )
+
+    versions = []
+    for file in files:
+        if isinstance(file_system, fs.LocalFileSystem):
+            info = file_system.get_file_info(file)
+            versions.append((file, info.size, info.mtime_ns))
+        else:
+            info = file_system.info(file)
+            tag = next(
+                (str(info[field]) for field in VERSION_TAG_FIELDS if info.get(field)),
+                None,
+            )
+            versions.append((file, info.get("size"), tag))
+    return versions
+
+
 def upload_assets(
     file_system: fs.FileSystem,
     fs_base_path: str,
@@ -0,0 +1,229 @@
+"""
+    LATENCY HISTOGRAMS
+
+    Fixed memory, HDR-style latency histograms per serving stage, e.g. decode,
+    input_transform, predict, output_transform and encode, with percentile
+    snapshots and export in Prometheus text format.
+
+    Recording is lock-free, each thread records in to its own counts which are
+    only merged when a snapshot is taken.
+
+    e.g.
+        latency = LatencyMetrics()
+        with latency.time("decode"):
+            input_data = decoder(payload)
+        latency.snapshot()["decode"]["p99"]
+"""
+import threading
+import time
+from contextlib import contextmanager
+from functools import wraps
+
+# sub-buckets per power of two, bounds the relative error to 1 / SUB_BUCKETS
+SUB_BUCKET_BITS = 6
+# latencies above this are recorded in the highest bucket
+MAX_TRACKABLE_SECONDS = 60.0
+QUANTILES = (("p50", 0.5), ("p90", 0.9), ("p99", 0.99), ("p999", 0.999))
+
+
+class LatencyHistogram:
+    """
+    Log-linear histogram of latencies with nanosecond resolution.
+
+    Values below 2 * 2^SUB_BUCKET_BITS nanoseconds are counted exactly, above
+    that each power of two is split in to 2^SUB_BUCKET_BITS linear sub-buckets,
+    so memory is fixed (~2k counters per thread) and percentiles are accurate
+    to within ~1.6%.
+    """
+
+    def __init__(self, max_seconds: float = MAX_TRACKABLE_SECONDS):
+        """
+        args:
+            max_seconds (float): highest trackable latency
+        """
+        self.sub_buckets = 1 << SUB_BUCKET_BITS
+        self.max_index = self._index(int(max_seconds * 1e9))
+        self._local = threading.local()
+        self._shards = []
+        self._shards_lock = threading.Lock()
+
+    def _index(self, nanoseconds: int) -> int:
+        """bucket index of a latency in nanoseconds"""
+        exponent = nanoseconds.bit_length() - SUB_BUCKET_BITS - 1
+        if exponent <= 0:
+            return nanoseconds
+        return exponent * self.sub_buckets + (nanoseconds >> exponent)
+
+    def _value(self, index: int) -> float:
+        """midpoint of a bucket, in seconds"""
+        if index < 2 * self.sub_buckets:
+            return index / 1e9
+        exponent = index // self.sub_buckets - 1
+        lower = (index - exponent * self.sub_buckets) << exponent
+        return (lower + (1 << (exponent - 1))) / 1e9
+
+    def _shard(self) -> list:
+        """this thread's [counts, sum of seconds, max seconds]"""
+        shard = getattr(self._local, "shard", None)
+        if shard is None:
+            shard = [[0] * (self.max_index + 1), 0.0, 0.0]
+            self._local.shard = shard
+            # taken once per thread, never when recording
+            with self._shards_lock:
+                self._shards.append(shard)
+        return shard
+
+    def record(self, seconds: float):
+        """
+        Record a latency.
+
+        args:
+            seconds (float): latency in seconds
+        """
+        shard = self._shard()
+        index = self._index(max(int(seconds * 1e9), 0))
+        shard[0][min(index, self.max_index)] += 1
+        shard[1] += seconds
+        if seconds > shard[2]:
+            shard[2] = seconds
+
+    def merged(self):
+        """
+        Merge the counts recorded by all threads.
+
+        return:
+            tuple: (counts, count, sum of seconds, max seconds)
+        """
+        with self._shards_lock:
+            shards = list(self._shards)
+        counts = [0] * (self.max_index + 1)
+        total = 0.0
+        maximum = 0.0
+        for shard_counts, shard_sum, shard_max in shards:
+            for index, count in enumerate(shard_counts):
+                if count:
+                    counts[index] += count
+            total += shard_sum
+            maximum = max(maximum, shard_max)
+        return counts, sum(counts), total, maximum
+
+    def buckets(self) -> list:
+        """
+        Non-empty buckets of the histogram.
+
+        return:
+            list: (latency in seconds, count) pairs, in increasing latency
+        """
+        counts = self.merged()[0]
+        return [
+            (self._value(index), count) for index, count in enumerate(counts) if count
+        ]
+
+    def snapshot(self) -> dict:
+        """
+        Summarise the recorded latencies.
+
+        return:
+            dict: count, sum, max and p50/p90/p99/p999 latencies in seconds
+        """
+        counts, count, total, maximum = self.merged()
+        snapshot = {"count": count, "sum": total, "max": maximum}
+        targets = [(name, quantile * count) for name, quantile in QUANTILES]
+        cumulative = 0
+        for index, bucket_count in enumerate(counts):
+            if not bucket_count:
+                continue
+            cumulative += bucket_count
+            while targets and cumulative >= targets[0][1]:
+                snapshot[targets.pop(0)[0]] = min(self._value(index), maximum)
+        for name, _ in targets:
+            snapshot[name] = 0.0
+        return snapshot
+
+
+class LatencyMetrics:
+    """Latency histograms by stage name"""
+
+    def __init__(self, max_seconds: float = MAX_TRACKABLE_SECONDS):
+        """
+        args:
+            max_seconds (float): highest trackable latency
+        """
+        self.max_seconds = max_seconds
+        self._histograms = {}
+        self._lock = threading.Lock()
+
+    def histogram(self, stage: str) -> LatencyHistogram:
+        """return the histogram of a stage, creating it on first use"""
+        histogram = self._histograms.get(stage)
+        if histogram is None:
+            with self._lock:
+                histogram = self._histograms.setdefault(
+                    stage, LatencyHistogram(max_seconds=self.max_seconds)
+                )
+        return histogram
+
+    def record(self, stage: str, seconds: float):
+        """record a stage latency in seconds"""
+        self.histogram(stage).record(seconds)
+
+    @contextmanager
+    def time(self, stage: str):
+        """time the enclosed block as a stage"""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.histogram(stage).record(time.perf_counter() - start)
+
+    def timed(self, stage: str):
+        """decorator timing every call of a function as a stage"""
+
+        def decorator(function):
+            histogram = self.histogram(stage)
+
+            @wraps(function)
+            def func_wrapper(*args, **kwargs):
+                start = time.perf_counter()
+                try:
+                    return function(*args, **kwargs)
+                finally:
+                    histogram.record(time.perf_counter() - start)
+
+            return func_wrapper
+
+        return decorator
+
+    def snapshot(self) -> dict:
+        """
+        Percentile snapshots of every stage.
+
+        return:
+            dict: stage -> snapshot, see LatencyHistogram.snapshot
+        """
+        with self._lock:
+            histograms = dict(self._histograms)
+        return {stage: histogram.snapshot() for stage, histogram in histograms.items()}
+
+    def to_prometheus(self, name: str = "mldock_stage_latency_seconds") -> str:
+        """
+        Export the stage latencies as Prometheus summaries, in text exposition format.
+
+        args:
+            name (str): metric name
+        return:
+            str: metrics text
+        """
+        lines = [
+            f"# HELP {name} Latency of serving stages in seconds.",
+            f"# TYPE {name} summary",
+        ]
+        for stage, snapshot in sorted(self.snapshot().items()):
+            for quantile_name, quantile in QUANTILES:
+                lines.append(
+                    f'{name}{{stage="{stage}",quantile="{quantile}"}} '
+                    f"{snapshot[quantile_name]:.9f}"
+                )
+            lines.append(f'{name}_sum{{stage="{stage}"}} {snapshot["sum"]:.9f}')
+            lines.append(f'{name}_count{{stage="{stage}"}} {snapshot["count"]}')
+        return "\n".join(lines) + "\n"
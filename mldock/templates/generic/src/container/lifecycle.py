@@ -27,6 +27,10 @@ training_container = TrainingContainer(
 )
 
 # init Serving Container
+# CPU-bound stages run in executor threads, sharing this process' model, metrics
+# and prediction cache, MLDOCK_EXECUTOR_TYPE=process is not supported here.
 serving_container = ServingContainer(
-    container_environment=environment, container_logger=logger
+    container_environment=environment,
+    container_logger=logger,
+    executor_type="thread",
 )
@@ -4,18 +4,59 @@
     modify to implement the scoring for your own algorithm.
 """
 import numpy as np
-from fastapi import FastAPI, Request, HTTPException
-from mldock.platform_helpers.mldock.inference.content_encoders import (
-    numpy as content_encoders,
+from fastapi import FastAPI, Request, Response, HTTPException
+from fastapi.responses import StreamingResponse
+from mldock.platform_helpers.mldock.inference.codecs import (
+    default_codec_registry,
+    NotAcceptable,
+    UnsupportedContentType,
 )
+from mldock.platform_helpers.mldock.inference.compression import (
+    compress,
+    decompress,
+    iter_compress,
+    negotiate_content_encoding,
+    PayloadTooLarge,
+    UnsupportedContentEncoding,
+    MAX_DECOMPRESSED_SIZE,
+    MIN_COMPRESS_SIZE,
+)
+from mldock.platform_helpers.mldock.model_service.memoize import (
+    PredictionCache,
+    payload_key,
+)
+from mldock.platform_helpers.mldock.tracking.latency import LatencyMetrics
 from src.container.lifecycle import serving_container
 
 app = FastAPI()
 
+# content type -> decoder & accept -> encoder dispatch table.
+# (Optional) register your own codecs, e.g. codecs.register_decoder("image/jpeg", ...)
+codecs = default_codec_registry()
+
+# per-stage latency histograms, exported on /metrics
+latency = LatencyMetrics()
+
+# limit of decompressed request bodies, larger bodies are rejected with 413.
+max_decompressed_size = (
+    serving_container.container_environment.environment_variables.int(
+        "MLDOCK_MAX_DECOMPRESSED_SIZE", MAX_DECOMPRESSED_SIZE
+    )
+)
+
+# memoizes encoded responses of repeated payloads.
+# (Optional) enable with MLDOCK_PREDICTION_CACHE_SIZE & MLDOCK_PREDICTION_CACHE_TTL
+prediction_cache = PredictionCache.from_environment(
+    serving_container.container_environment
+)
+
 
 @app.on_event("startup")
 def startup_event():
-    serving_container.startup()
+    # set up the instance & load the model in the background, then run payloads
+    # in <model_dir>/warmup through invoke, bypassing the prediction cache so
+    # every iteration runs the model. /ping reports not ready until all complete.
+    serving_container.load_in_background(load_model, invoke=invoke.__wrapped__)
 
 
 @app.on_event("shutdown")
@@ -23,6 +64,15 @@ def shutdown_event():
     serving_container.cleanup()
 
 
+def load_model():
+    """Load model artifacts, runs in a background thread at startup"""
+    # set up the instance, e.g. download model artifacts in prod
+    serving_container.startup()
+    # TODO load model, optionally reporting progress of large models with
+    # serving_container.report_load_progress(fraction)
+    serving_container.report_load_progress(1.0)
+
+
 # serving workflow utilties
 @serving_container.wrap
 def handler(json_input, environment, logger, **kwargs):
@@ -43,24 +93,108 @@ def handler(json_input, environment, logger, **kwargs):
     return results
 
 
+def predict(payload, content_type, accept=None):
+    """Decode a payload and run the handler on it"""
+    decoder = codecs.decoder_for(content_type)
+    media_type, encoder = codecs.encoder_for(accept, default=content_type)
+    with latency.time("decode"):
+        input_data = decoder(payload)
+    with latency.time("predict"):
+        results = handler(input_data)
+    return media_type, encoder, results
+
+
+@prediction_cache.memoize(key=payload_key)
+def invoke(payload, content_type, accept=None):
+    """Decode a payload, run the handler on it and encode the results"""
+    media_type, encoder, results = predict(payload, content_type, accept)
+    with latency.time("encode"):
+        content = encoder(results)
+    return media_type, content
+
+
+def invoke_streaming(payload, content_type, accept=None):
+    """
+    Like invoke, but media types with a streaming encoder (e.g. text/csv) are
+    encoded chunk by chunk while the response is sent, so the full body is never
+    held in memory. Streamed results cannot be memoized, used when the
+    prediction cache is disabled.
+    """
+    media_type, encoder, results = predict(payload, content_type, accept)
+    streaming_encoder = codecs.streaming_encoder_for(media_type)
+    if streaming_encoder is not None:
+        return media_type, streaming_encoder(results)
+    with latency.time("encode"):
+        content = encoder(results)
+    return media_type, content
+
+
 # Serving Endpoints
 @app.get("/ping")
 async def ping():
     """Determine if the container is working and healthy"""
-    return {"message": "ping!pong!"}
+    if not serving_container.ready:
+        raise HTTPException(status_code=503, detail=serving_container.status())
+    return {"message": "ping!pong!", **serving_container.status()}
+
+
+@app.get("/live")
+async def live():
+    """Determine if the container is alive, including while the model is loading"""
+    status = serving_container.status()
+    if status["state"] == "failed":
+        raise HTTPException(status_code=500, detail=status)
+    return status
+
+
+@app.get("/metrics")
+async def metrics():
+    """Export per-stage latency percentiles in Prometheus text format"""
+    return Response(
+        content=latency.to_prometheus(), media_type="text/plain; version=0.0.4"
+    )
 
 
 @app.post("/invocations")
 async def transformation(request: Request):
-    """Do an inference on a single batch of data. In this sample server, we take data as JSON"""
-    if request.headers["content-type"] == "application/json":
-        data = await request.body()
-        print(data)
-
-        results = handler(np.array(data))
-        return content_encoders.array_to_json(results)
-    else:
-        raise HTTPException(
-            status_code=415,
-            detail={"message": "This predictor only supports JSON or CSV data"},
+    """Do an inference on a single batch of data, decoded and encoded according to the request headers"""
+    try:
+        body = await request.body()
+        body_encoding = request.headers.get("content-encoding")
+        if body_encoding:
+            # decompress off the event loop, bounded against compression bombs
+            body = await serving_container.run_in_executor(
+                decompress, body, body_encoding, max_decompressed_size
+            )
+        # run the CPU-bound decode/predict/encode path off the event loop
+        with latency.time("invocation"):
+            media_type, content = await serving_container.run_in_executor(
+                invoke if prediction_cache.enabled else invoke_streaming,
+                body,
+                request.headers.get("content-type"),
+                request.headers.get("accept"),
+            )
+    except (UnsupportedContentType, UnsupportedContentEncoding) as exception:
+        raise HTTPException(status_code=415, detail={"message": str(exception)})
+    except NotAcceptable as exception:
+        raise HTTPException(status_code=406, detail={"message": str(exception)})
+    except PayloadTooLarge as exception:
+        raise HTTPException(status_code=413, detail={"message": str(exception)})
+
+    headers = {}
+    content_encoding = negotiate_content_encoding(
+        request.headers.get("accept-encoding")
+    )
+    if not isinstance(content, (bytes, str)):
+        # streamed chunks are encoded (and compressed) in starlette's threadpool
+        if content_encoding is not None:
+            content = iter_compress(content, content_encoding)
+            headers["Content-Encoding"] = content_encoding
+        return StreamingResponse(content, media_type=media_type, headers=headers)
+    if content_encoding is not None and len(content) >= MIN_COMPRESS_SIZE:
+        # compress off the event loop, large responses would block /ping
+        content = await serving_container.run_in_executor(
+            compress, content, content_encoding
         )
+        headers["Content-Encoding"] = content_encoding
+    return Response(content=content, media_type=media_type, headers=headers)
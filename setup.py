@@ -61,7 +61,8 @@ setuptools.setup(
             'wheel'
         ],
         'sagemaker': ['sagemaker-training'],
-        'inference': ['pandas', 'numpy', 'protobuf>=3.1', 'Pillow'],
+        'inference': ['pandas', 'numpy', 'protobuf>=3.1', 'Pillow', 'pyarrow'],
+        'fast-json': ['orjson'],
         'testing': ['responses', 'dataclasses'],
     },
     entry_points="""
@@ -73,7 +74,7 @@ setuptools.setup(
         "Development Status :: 2 - Pre-Alpha",
         "Intended Audience :: Developers",
         "License :: OSI Approved :: MIT License",
-        "Programming Language :: Python :: 3.6"
+        "Programming Language :: Python :: 3.8"
     ],
-    python_requires='>=3.6',
+    python_requires='>=3.8',
 )
@@ -0,0 +1,135 @@
+"""Test Benchmark API"""
+import gzip
+import time
+from pathlib import Path
+
+import pytest
+from mock import MagicMock
+import responses
+
+from mldock.api.benchmark import (
+    load_payloads,
+    run_benchmark,
+    format_results,
+    _Recorder,
+)
+
+HOST = "http://nothing-to-see-here/invocations"
+
+
+@pytest.fixture
+def payload_dir(tmp_path):
+    """directory of payloads"""
+    Path(tmp_path, "a.json").write_text('{"a": 1}')
+    Path(tmp_path, "b.csv").write_text("1,2\n")
+    Path(tmp_path, "README.md").write_text("ignored")
+    return tmp_path
+
+
+class MockResponse:
+    def __init__(self, status_code):
+        self.status_code = status_code
+
+
+class TestBenchmarkAPI:
+    @staticmethod
+    def test_load_payloads(payload_dir):
+
+        payloads = load_payloads(payload_dir, content_encoding="gzip")
+
+        assert [payload[0] for payload in payloads] == ["application/json", "text/csv"]
+        assert gzip.decompress(payloads[0][1]) == b'{"a": 1}'
+        assert payloads[1][2] == {
+            "Content-Type": "text/csv",
+            "Content-Encoding": "gzip",
+        }
+
+    @staticmethod
+    def test_load_payloads_without_payloads(tmp_path):
+
+        with pytest.raises(ValueError):
+            load_payloads(tmp_path)
+
+    @staticmethod
+    @responses.activate
+    def test_closed_loop(payload_dir):
+
+        responses.add(responses.POST, HOST, json={"result": "success"}, status=200)
+
+        results = run_benchmark(
+            host=HOST,
+            payloads=load_payloads(payload_dir),
+            mode="closed",
+            concurrency=2,
+            max_requests=20,
+            duration=10,
+        )
+
+        assert results["requests"] == 20
+        assert results["errors"] == 0
+        assert results["latency"]["count"] == 20
+        assert sum(bucket["count"] for bucket in results["latency"]["histogram"]) == 20
+        assert results["throughput"] > 0
+        assert "closed-loop benchmark" in format_results(results)
+
+    @staticmethod
+    def test_open_loop_counts_queueing_delay(payload_dir):
+        """latency of requests queued behind a slow server includes the wait"""
+        client = MagicMock()
+
+        def slow_post(**kwargs):
+            time.sleep(0.05)
+            return MockResponse(200)
+
+        client.post.side_effect = slow_post
+
+        results = run_benchmark(
+            host=HOST,
+            payloads=load_payloads(payload_dir),
+            mode="open",
+            concurrency=1,
+            rate=100,
+            max_requests=10,
+            duration=10,
+            client=client,
+        )
+
+        assert results["requests"] == 10
+        # the last request is scheduled at 0.09s but only sent after ~0.45s
+        assert results["latency"]["max"] > 0.3
+        assert results["service_time"]["max"] < 0.2
+
+    @staticmethod
+    def test_errors_are_counted(payload_dir):
+
+        client = MagicMock()
+        client.post.side_effect = [MockResponse(200), MockResponse(500), OSError()]
+
+        results = run_benchmark(
+            host=HOST,
+            payloads=load_payloads(payload_dir),
+            concurrency=1,
+            max_requests=3,
+            client=client,
+        )
+
+        assert results["errors"] == 2
+        assert results["error_rate"] == pytest.approx(2 / 3)
+        assert results["status_codes"] == {"200": 1, "500": 1, "None": 1}
+
+    @staticmethod
+    def test_open_loop_requires_rate(payload_dir):
+
+        with pytest.raises(ValueError):
+            run_benchmark(host=HOST, payloads=load_payloads(payload_dir), mode="open")
+
+    @staticmethod
+    def test_coordinated_omission_correction():
+
+        recorder = _Recorder(expected_interval=0.01)
+
+        recorder.record(200, 0.05, 0.05)
+
+        # 0.05s stalls the worker for the requests due at 0.04s, 0.03s, 0.02s and 0.01s
+        assert recorder.latency.snapshot()["count"] == 5
+        assert recorder.service_time.snapshot()["count"] == 1
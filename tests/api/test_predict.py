@@ -1,12 +1,20 @@
 """Test Predict API calls"""
 import io
+import gzip
+import json
 from PIL import Image
 from dataclasses import dataclass
 import tempfile
 from pathlib import Path
 import pytest
-from mock import patch
-from mldock.api.predict import send_image_jpeg, send_csv, send_json, handle_prediction
+from mock import patch, MagicMock
+from mldock.api.predict import (
+    send_image_jpeg,
+    send_csv,
+    send_json,
+    handle_prediction,
+    PredictClient,
+)
 import responses
 import requests
 
@@ -286,3 +294,79 @@ class TestPredictAPI:
             assert (
                 kwargs == validation_kwargs
             ), "Failure. URL and Headers are incorrect."
+
+    @staticmethod
+    def test_handle_prediction_send_json_with_content_encoding():
+
+        with patch("mldock.api.predict.execute_request") as mock_execute_request:
+            mock_execute_request.return_value = MockResponse(
+                json_data={"result": "success"}, status_code=200
+            )
+            _ = handle_prediction(
+                host="http://nothing-to-see-here/invocations",
+                request="tests/api/fixtures/payload.json",
+                response_file=None,
+                request_content_type="application/json",
+                response_content_type="application/json",
+                content_encoding="gzip",
+            )
+
+            _, kwargs = list(mock_execute_request.call_args)
+
+            assert kwargs["headers"] == {
+                "Content-Type": "application/json",
+                "Content-Encoding": "gzip",
+            }
+            with open("tests/api/fixtures/payload.json", "r") as file_:
+                expected = json.load(file_)
+            assert json.loads(gzip.decompress(kwargs["data"])) == expected
+
+    @staticmethod
+    def test_handle_prediction_with_client():
+
+        client = MagicMock()
+        client.post.return_value = MockResponse(
+            json_data={"result": "success"}, status_code=200
+        )
+        with patch("mldock.api.predict.execute_request") as mock_execute_request:
+            for _ in range(3):
+                result = handle_prediction(
+                    host="http://nothing-to-see-here/invocations",
+                    request="tests/api/fixtures/payload.json",
+                    client=client,
+                )
+
+            mock_execute_request.assert_not_called()
+        assert result == {"result": "success"}
+        assert client.post.call_count == 3
+        _, kwargs = list(client.post.call_args)
+        assert kwargs["url"] == "http://nothing-to-see-here/invocations"
+        assert kwargs["headers"] == {"Content-Type": "application/json"}
+
+
+class TestPredictClient:
+    @staticmethod
+    @responses.activate
+    def test_client_reuses_session_with_timeouts():
+
+        responses.add(
+            responses.POST,
+            "http://nothing-to-see-here/invocations",
+            json={"result": "success"},
+            status=200,
+        )
+        with PredictClient(
+            pool_size=2, connect_timeout=1.0, read_timeout=5.0
+        ) as client:
+            for _ in range(2):
+                response = client.post(
+                    url="http://nothing-to-see-here/invocations",
+                    headers={"Content-Type": "application/json"},
+                    data="{}",
+                )
+                assert response.json() == {"result": "success"}
+
+            adapter = client.session.get_adapter("http://nothing-to-see-here")
+            assert adapter._pool_maxsize == 2
+        assert len(responses.calls) == 2
+        assert client.timeout == (1.0, 5.0)
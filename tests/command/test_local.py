@@ -1,6 +1,7 @@
 """Test local cli commands"""
 from pathlib import Path
 import tempfile
+import json
 from mock import patch
 from click.testing import CliRunner
 
@@ -69,3 +70,51 @@ class TestLocalCommands:
             assert (
                 requirements_path == mldock_config["requirements_dir"]
             ), "Failed to get correct requirements directory for build"
+
+    @staticmethod
+    @patch("mldock.command.local.benchmark_request.run_benchmark")
+    def test_benchmark_saves_results(run_benchmark_mock):
+        """test benchmark runs with the payloads and saves results as json"""
+        run_benchmark_mock.return_value = {
+            "host": "http://127.0.0.1:8080/invocations",
+            "mode": "open",
+            "requests": 10,
+            "duration": 1.0,
+            "throughput": 10.0,
+            "error_rate": 0.0,
+            "latency": {
+                key: 0.01 for key in ("mean", "p50", "p90", "p99", "p999", "max")
+            },
+            "service_time": {
+                key: 0.01 for key in ("mean", "p50", "p90", "p99", "p999", "max")
+            },
+        }
+        runner = CliRunner()
+
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            Path(tmp_dir, "payload.json").write_text("{}")
+            output = Path(tmp_dir, "results.json")
+
+            result = runner.invoke(
+                cli=cli,
+                args=[
+                    "local",
+                    "benchmark",
+                    "--payloads",
+                    tmp_dir,
+                    "--mode",
+                    "open",
+                    "--rate",
+                    "10",
+                    "--output",
+                    output.as_posix(),
+                ],
+            )
+
+            assert result.exit_code == 0, result.output
+            assert json.loads(output.read_text())["requests"] == 10
+
+        _, kwargs = run_benchmark_mock.call_args
+        assert kwargs["mode"] == "open"
+        assert kwargs["rate"] == 10.0
+        assert kwargs["payloads"][0][0] == "application/json"
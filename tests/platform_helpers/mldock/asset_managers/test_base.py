@@ -6,6 +6,7 @@ from mock import patch
 from pyarrow import fs
 from mldock.platform_helpers.mldock.storage.pyarrow import (
     download_assets,
+    get_assets_version,
     upload_assets,
 )
 
@@ -27,6 +28,13 @@ class ExampleLocalEnvArtifactManager(BaseEnvArtifactManager):
         file_system = fs.LocalFileSystem()
         upload_assets(file_system, **kwargs)
 
+    @staticmethod
+    def assets_version(fs_base_path, storage_location):
+        file_system = fs.LocalFileSystem()
+        return get_assets_version(
+            file_system, fs_base_path=fs_base_path, storage_location=storage_location
+        )
+
 
 class TestBaseEnvArtifactManager:
     """test base environment artifact manager"""
@@ -114,3 +122,30 @@ class TestBaseEnvArtifactManager:
             ).exists(), "Failure."
 
             output_tempdir.cleanup()
+
+    def test_setup_model_artifacts_in_staging_dir(self):
+        """test model artifacts are downloaded in to a given directory, versioned by the remote assets"""
+        with tempfile.TemporaryDirectory() as remote_tempdir:
+            with tempfile.TemporaryDirectory() as staging_tempdir:
+                txtfile = Path(remote_tempdir, "model.txt")
+                _ = self.__create_textfile(txtfile)
+
+                with patch(
+                    "mldock.platform_helpers.mldock.asset_managers.base.environment.BaseEnvironment"
+                ) as base_environment:
+                    base_environment.return_value.get_model_input_channel_iter.return_value = [
+                        {
+                            "key": "MLDOCK_MODEL_INPUT_CHANNEL_EXAMPLE",
+                            "value": remote_tempdir,
+                        }
+                    ]
+                    artifact_manager = ExampleLocalEnvArtifactManager()
+                    version = artifact_manager.model_artifacts_version()
+                    artifact_manager.setup_model_artifacts(staging_tempdir)
+
+                    assert version == artifact_manager.model_artifacts_version()
+                    with open(txtfile, "a") as file:
+                        file.write(" again")
+                    assert version != artifact_manager.model_artifacts_version()
+
+                assert Path(staging_tempdir, "example/model.txt").exists(), "Failure."
@@ -0,0 +1,291 @@
+"""TEST CONTAINER UTILITIES"""
+import asyncio
+import logging
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+import mock
+from mock import MagicMock
+import pytest
+
+from mldock.platform_helpers.mldock.configuration.container import (
+    BaseServingContainer,
+)
+from mldock.platform_helpers.mldock.inference.codecs import default_codec_registry
+
+
+@pytest.fixture
+def model_dir():
+    """temporary model channel"""
+    with tempfile.TemporaryDirectory() as tempdir:
+        yield Path(tempdir)
+
+
+@pytest.fixture
+def serving_container(model_dir):
+    """serving container with a mocked environment"""
+    environment = MagicMock()
+    environment.model_dir = model_dir
+    environment.environment_variables.int.return_value = 1
+    return BaseServingContainer(
+        container_environment=environment, container_logger=logging.getLogger()
+    )
+
+
+class TestBaseServingContainer:
+    """Collection of tests to test base serving container"""
+
+    @staticmethod
+    def test_load_warmup_payloads(serving_container, model_dir):
+        """Test warm-up payloads are loaded with content types from extensions"""
+        warmup_dir = Path(model_dir, "warmup")
+        warmup_dir.mkdir()
+        Path(warmup_dir, "a.json").write_bytes(b"[1, 2]")
+        Path(warmup_dir, "b.csv").write_bytes(b"1,2\n")
+        Path(warmup_dir, "README.md").write_bytes(b"ignored")
+
+        actual = serving_container.load_warmup_payloads()
+
+        assert actual == [("application/json", b"[1, 2]"), ("text/csv", b"1,2\n")]
+
+    @staticmethod
+    def test_warmup_runs_payloads_and_marks_ready(serving_container, model_dir):
+        """Test warm-up invokes every payload, records duration and marks ready"""
+        warmup_dir = Path(model_dir, "warmup")
+        warmup_dir.mkdir()
+        Path(warmup_dir, "a.json").write_bytes(b"[1, 2]")
+        invoke = MagicMock()
+
+        assert not serving_container.ready
+        serving_container.warmup(invoke, iterations=3)
+
+        assert invoke.call_count == 3
+        invoke.assert_called_with(b"[1, 2]", "application/json")
+        assert serving_container.ready
+        assert serving_container.warmup_duration >= 0
+
+    @staticmethod
+    def test_warmup_skips_payloads_without_a_decoder(serving_container, model_dir):
+        """Test payloads without a registered decoder, e.g. images, are skipped"""
+        warmup_dir = Path(model_dir, "warmup")
+        warmup_dir.mkdir()
+        Path(warmup_dir, "a.json").write_bytes(b"[1, 2]")
+        Path(warmup_dir, "b.png").write_bytes(b"\x89PNG")
+        codecs = default_codec_registry()
+        decoded = []
+
+        def invoke(payload, content_type):
+            decoded.append(codecs.decoder_for(content_type)(payload))
+
+        serving_container.warmup(invoke)
+
+        assert [value.tolist() for value in decoded] == [[1, 2]]
+        assert serving_container.ready
+
+    @staticmethod
+    def test_warmup_without_payloads_marks_ready(serving_container):
+        """Test containers without warm-up payloads become ready"""
+        invoke = MagicMock()
+
+        serving_container.warmup(invoke)
+
+        invoke.assert_not_called()
+        assert serving_container.ready
+
+    @staticmethod
+    def test_warmup_failure_is_not_ready(serving_container, model_dir):
+        """Test a failing warm-up payload keeps the container not ready"""
+        warmup_dir = Path(model_dir, "warmup")
+        warmup_dir.mkdir()
+        Path(warmup_dir, "a.json").write_bytes(b"[1, 2]")
+
+        with pytest.raises(ValueError):
+            serving_container.warmup(MagicMock(side_effect=ValueError("bad model")))
+
+        assert not serving_container.ready
+
+
+class TestBaseServingContainerLoading:
+    """Collection of tests to test base serving container background loading"""
+
+    @staticmethod
+    def test_load_in_background_gates_readiness(serving_container):
+        """Test the container is alive but not ready while the model loads"""
+        release = threading.Event()
+
+        def load():
+            serving_container.report_load_progress(0.5)
+            release.wait(5)
+
+        serving_container.load_in_background(load)
+        time.sleep(0.05)
+
+        status = serving_container.status()
+        assert status["state"] == "loading"
+        assert status["load_progress"] == 0.5
+        assert not serving_container.ready
+
+        release.set()
+
+        assert serving_container.wait_until_ready(5)
+        status = serving_container.status()
+        assert status["state"] == "ready"
+        assert status["load_progress"] == 1.0
+        assert status["load_duration"] >= 0
+
+    @staticmethod
+    def test_load_in_background_warms_up(serving_container, model_dir):
+        """Test the container warms up with invoke once the model has loaded"""
+        warmup_dir = Path(model_dir, "warmup")
+        warmup_dir.mkdir()
+        Path(warmup_dir, "a.json").write_bytes(b"[1, 2]")
+        invoke = MagicMock()
+
+        serving_container.load_in_background(MagicMock(), invoke=invoke)
+
+        assert serving_container.wait_until_ready(5)
+        invoke.assert_called_once_with(b"[1, 2]", "application/json")
+        assert serving_container.warmup_duration >= 0
+
+    @staticmethod
+    def test_load_in_background_failure(serving_container):
+        """Test a failing load is reported and keeps the container not ready"""
+        serving_container.load_in_background(
+            MagicMock(side_effect=OSError("missing model"))
+        )
+
+        assert not serving_container.wait_until_ready(5)
+        assert serving_container.status()["state"] == "failed"
+        assert "missing model" in serving_container.load_error
+
+    @staticmethod
+    def test_watch_model(serving_container):
+        """Test models are watched with the given model artifact sync"""
+        model = MagicMock()
+        artifact_manager = MagicMock()
+
+        assert not serving_container.watch_model(model, interval=0)
+        assert serving_container.watch_model(
+            model,
+            interval=5,
+            sync=artifact_manager.setup_model_artifacts,
+            remote_version=artifact_manager.model_artifacts_version,
+        )
+
+        model.watch.assert_called_once_with(
+            interval=5,
+            sync=artifact_manager.setup_model_artifacts,
+            remote_version=artifact_manager.model_artifacts_version,
+        )
+        serving_container.cleanup()
+        model.stop.assert_called_once()
+
+
+@pytest.fixture
+def async_serving_container(model_dir):
+    """serving container with a bounded thread executor"""
+    environment = MagicMock()
+    environment.model_dir = model_dir
+    environment.output_data_dir = model_dir
+    container = BaseServingContainer(
+        container_environment=environment,
+        container_logger=logging.getLogger(),
+        executor_workers=2,
+        executor_type="thread",
+    )
+    yield container
+    container.cleanup()
+
+
+class TestBaseServingContainerAsync:
+    """Collection of tests to test base serving container async execution"""
+
+    @staticmethod
+    def test_wrap_async_runs_sync_functions_in_executor(async_serving_container):
+        """Test regular functions run in executor threads, off the event loop"""
+
+        @async_serving_container.wrap_async
+        def handler(input_data, environment, logger):
+            return input_data, threading.current_thread().name
+
+        actual, thread_name = asyncio.run(handler([1, 2]))
+
+        assert actual == [1, 2]
+        assert thread_name.startswith("mldock-executor")
+
+    @staticmethod
+    def test_wrap_async_does_not_block_event_loop(async_serving_container):
+        """Test the event loop keeps running while a handler is busy"""
+
+        @async_serving_container.wrap_async
+        def handler(input_data, environment, logger):
+            time.sleep(0.2)
+            return input_data
+
+        async def run():
+            ticks = 0
+            task = asyncio.ensure_future(handler(1))
+            while not task.done():
+                ticks += 1
+                await asyncio.sleep(0.01)
+            return ticks
+
+        assert asyncio.run(run()) > 5
+
+    @staticmethod
+    def test_wrap_async_awaits_coroutines(async_serving_container):
+        """Test coroutine functions are awaited natively"""
+
+        @async_serving_container.wrap_async
+        async def handler(input_data, environment, logger):
+            await asyncio.sleep(0)
+            return input_data
+
+        assert asyncio.run(handler(42)) == 42
+
+    @staticmethod
+    def test_wrap_async_writes_failure_file(async_serving_container, model_dir):
+        """Test exceptions are raised and written to the failure file"""
+
+        @async_serving_container.wrap_async
+        def handler(input_data, environment, logger):
+            raise ValueError("bad input")
+
+        with pytest.raises(ValueError):
+            asyncio.run(handler(None))
+
+        assert "bad input" in Path(model_dir, "failure").read_text()
+
+    @staticmethod
+    def test_executor_size_from_environment(model_dir):
+        """Test executor size and type are read from the environment by default"""
+        environment = MagicMock()
+        environment.environment_variables.int.return_value = 3
+        environment.environment_variables.str.return_value = "thread"
+        container = BaseServingContainer(
+            container_environment=environment, container_logger=logging.getLogger()
+        )
+
+        assert container.executor._max_workers == 3
+        environment.environment_variables.int.assert_called_with(
+            "MLDOCK_EXECUTOR_WORKERS", mock.ANY
+        )
+        container.cleanup()
+
+    @staticmethod
+    def test_executor_type_overrides_environment(model_dir, caplog):
+        """Test an explicit executor type ignores MLDOCK_EXECUTOR_TYPE with a warning"""
+        environment = MagicMock()
+        environment.environment_variables.int.return_value = 1
+        environment.environment_variables.str.return_value = "process"
+        container = BaseServingContainer(
+            container_environment=environment,
+            container_logger=logging.getLogger(),
+            executor_type="thread",
+        )
+
+        assert container.executor._thread_name_prefix == "mldock-executor"
+        assert "Ignoring MLDOCK_EXECUTOR_TYPE=process" in caplog.text
+        container.cleanup()
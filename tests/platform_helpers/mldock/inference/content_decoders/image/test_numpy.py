@@ -14,6 +14,7 @@
 # Disclaimer: This code can be found here: https://github.com/aws/sagemaker-training-toolkit/blob/master/test/unit/test_encoder.py
 #
 import io
+from mock import patch
 import pytest
 import numpy as np
 from PIL import Image
@@ -45,3 +46,69 @@ class TestNumpyImageDecoders:
         actual = numpy_image_decoders.image_to_numpy(image_bytes)
 
         np.testing.assert_equal(actual, image_array)
+
+
+@pytest.fixture
+def jpeg_bytes():
+    """large jpeg image as bytes string"""
+    buffer = io.BytesIO()
+    Image.new("RGB", (1024, 768), color=(200, 10, 10)).save(buffer, format="JPEG")
+    return buffer.getvalue()
+
+
+class TestNumpyBatchImageDecoders:
+    """Tests the numpy batch image decoder methods"""
+
+    @staticmethod
+    def test_image_to_numpy_with_size(jpeg_bytes):
+        """test images are decoded at the target size"""
+        actual = numpy_image_decoders.image_to_numpy(
+            jpeg_bytes, convert="RGB", size=(224, 224)
+        )
+
+        assert actual.shape == (224, 224, 3)
+
+    @staticmethod
+    def test_image_to_numpy_with_size_uses_draft(jpeg_bytes):
+        """test jpeg images are decoded at reduced scale before resizing"""
+        with patch.object(Image.Image, "resize", autospec=True) as resize:
+            numpy_image_decoders.image_to_numpy(jpeg_bytes, size=(256, 192))
+
+        resize.assert_not_called()
+
+    @staticmethod
+    def test_images_to_numpy(image_bytes, image_array):
+        """test many images are decoded to a list of arrays"""
+        actual = numpy_image_decoders.images_to_numpy([image_bytes] * 3, max_workers=2)
+
+        assert len(actual) == 3
+        for array in actual:
+            np.testing.assert_equal(array, image_array)
+
+    @staticmethod
+    def test_images_to_numpy_with_size(image_bytes, jpeg_bytes):
+        """test many images are decoded in to a stacked batch"""
+        actual = numpy_image_decoders.images_to_numpy(
+            [image_bytes, jpeg_bytes], convert="RGB", size=(32, 16)
+        )
+
+        assert actual.shape == (2, 16, 32, 3)
+
+    @staticmethod
+    def test_multipart_to_images(image_bytes, jpeg_bytes):
+        """test a multipart body is split in to image bytes"""
+        boundary = "mldock-boundary"
+        body = b""
+        for index, blob in enumerate([image_bytes, jpeg_bytes]):
+            body += (
+                '--{}\r\nContent-Disposition: form-data; name="image{}"\r\n'
+                "Content-Type: application/octet-stream\r\n\r\n".format(boundary, index)
+            ).encode()
+            body += blob + b"\r\n"
+        body += "--{}--\r\n".format(boundary).encode()
+
+        actual = numpy_image_decoders.multipart_to_images(
+            body, "multipart/form-data; boundary={}".format(boundary)
+        )
+
+        assert actual == [image_bytes, jpeg_bytes]
@@ -0,0 +1,66 @@
+"""Tests the json lines decoders"""
+import numpy as np
+import pandas as pd
+import pytest
+
+from mldock.platform_helpers.mldock.inference.content_decoders import (
+    jsonlines as jsonlines_decoders,
+    numpy as numpy_decoders,
+    pandas as pandas_decoders,
+)
+
+
+class TestJsonLinesDecoders:
+    """Tests the json lines decoder methods"""
+
+    @staticmethod
+    @pytest.mark.parametrize(
+        "target",
+        [
+            b'{"a": 1}\n{"a": 2}\n{"a": 3}\n',
+            b'{"a": 1}\n{"a": 2}\n\n{"a": 3}',
+            [b'{"a": 1}\n{"a"', b': 2}\n{"a": 3}\n'],
+            [b'{"a": 1}\n', b'{"a": 2}\n', b'{"a": 3}'],
+        ],
+    )
+    def test_iter_json_lines(target):
+        """test json lines are parsed from buffers and chunked bodies"""
+        actual = list(jsonlines_decoders.iter_json_lines(target))
+
+        assert actual == [{"a": 1}, {"a": 2}, {"a": 3}]
+
+    @staticmethod
+    def test_iter_json_line_batches():
+        """test json lines are grouped in to fixed size batches"""
+        target = b"".join(b"[%d]\n" % index for index in range(5))
+
+        actual = list(jsonlines_decoders.iter_json_line_batches(target, batch_size=2))
+
+        assert actual == [[[0], [1]], [[2], [3]], [[4]]]
+
+    @staticmethod
+    def test_iter_json_line_batches_rejects_invalid_batch_size():
+        """test batch size must be positive"""
+        with pytest.raises(ValueError):
+            list(jsonlines_decoders.iter_json_line_batches(b"[1]\n", batch_size=0))
+
+    @staticmethod
+    def test_jsonlines_to_numpy():
+        """test json lines are decoded to batches of numpy arrays"""
+        target = b"[1, 2]\n[3, 4]\n[5, 6]\n"
+
+        actual = list(numpy_decoders.jsonlines_to_numpy(target, batch_size=2))
+
+        assert len(actual) == 2
+        np.testing.assert_equal(actual[0], np.array([[1, 2], [3, 4]]))
+        np.testing.assert_equal(actual[1], np.array([[5, 6]]))
+
+    @staticmethod
+    def test_jsonlines_to_pandas():
+        """test json lines are decoded to batches of pandas dataframes"""
+        target = b'{"col": 42}\n{"col": 6}\n{"col": 9}\n'
+
+        actual = list(pandas_decoders.jsonlines_to_pandas(target, batch_size=2))
+
+        pd.testing.assert_frame_equal(actual[0], pd.DataFrame({"col": [42, 6]}))
+        pd.testing.assert_frame_equal(actual[1], pd.DataFrame({"col": [9]}))
@@ -14,6 +14,7 @@
 # Disclaimer: This code can be found here: https://github.com/aws/sagemaker-training-toolkit/blob/master/test/unit/test_encoder.py
 #
 import io
+from mock import patch
 import pytest
 import numpy as np
 from PIL import Image
@@ -53,7 +54,7 @@ class TestNumpyDecoders:
             [42.0, 6.0, 9.0],
             ["42", "6", "9"],
             ["42", "6", "9"],
-            {42: {"6": 9.0}},
+            [[1.0, 2.0], [3.0, 4.0]],
         ),
     )
     def test_npy_to_numpy(target):
@@ -65,6 +66,91 @@ class TestNumpyDecoders:
 
         np.testing.assert_equal(actual, np.array(target))
 
+    @staticmethod
+    def test_npy_to_numpy_returns_read_only_view():
+        """test npy data is decoded without copying the request bytes"""
+        target = np.arange(12, dtype=np.float32).reshape(3, 4)
+        buffer = io.BytesIO()
+        np.save(buffer, target)
+        input_data = buffer.getvalue()
+
+        actual = numpy_decoders.npy_to_numpy(memoryview(input_data))
+
+        np.testing.assert_equal(actual, target)
+        assert not actual.flags.writeable
+        assert np.shares_memory(actual, np.frombuffer(input_data, dtype=np.uint8))
+
+    @staticmethod
+    @pytest.mark.parametrize(
+        "target",
+        (
+            np.asfortranarray(np.arange(6).reshape(2, 3)),
+            np.array(42.0),
+            np.zeros((0, 3)),
+        ),
+    )
+    def test_npy_to_numpy_writable_copy(target):
+        """test npy data is decoded as a writable copy when requested"""
+        buffer = io.BytesIO()
+        np.save(buffer, target)
+
+        actual = numpy_decoders.npy_to_numpy(buffer.getvalue(), writable=True)
+
+        np.testing.assert_equal(actual, target)
+        assert actual.shape == target.shape
+        assert actual.flags.writeable
+
+    @staticmethod
+    def test_npy_to_numpy_refuses_object_arrays():
+        """test object arrays are only unpickled when allow_pickle=True"""
+        target = {42: {"6": 9.0}}
+        buffer = io.BytesIO()
+        np.save(buffer, target)
+        input_data = buffer.getvalue()
+
+        with pytest.raises(ValueError):
+            numpy_decoders.npy_to_numpy(input_data)
+
+        actual = numpy_decoders.npy_to_numpy(input_data, allow_pickle=True)
+        np.testing.assert_equal(actual, np.array(target))
+
+    @staticmethod
+    @pytest.mark.parametrize(
+        "version, target",
+        [
+            ((1, 0), np.arange(6.0).reshape(2, 3)),
+            ((2, 0), np.arange(6.0).reshape(2, 3)),
+            ((3, 0), np.zeros(3, dtype=[("caf\u00e9", "<f4"), ("\u00fc", "<i8")])),
+        ],
+    )
+    def test_npy_to_numpy_format_versions(version, target):
+        """test every NPY format version is decoded, with utf8 headers in 3.0"""
+        buffer = io.BytesIO()
+        np.lib.format.write_array(buffer, target, version=version)
+
+        actual = numpy_decoders.npy_to_numpy(buffer.getvalue())
+
+        assert actual.dtype == target.dtype
+        np.testing.assert_equal(actual, target)
+
+    @staticmethod
+    @pytest.mark.parametrize("version", [b"\x00\x00", b"\x04\x00", b"\x02\x01"])
+    def test_npy_to_numpy_rejects_unsupported_versions(version):
+        """test unknown NPY format versions are rejected"""
+        buffer = io.BytesIO()
+        np.lib.format.write_array(buffer, np.arange(3), version=(2, 0))
+        input_data = bytearray(buffer.getvalue())
+        input_data[6:8] = version
+
+        with pytest.raises(ValueError, match="unsupported format version"):
+            numpy_decoders.npy_to_numpy(bytes(input_data))
+
+    @staticmethod
+    def test_npy_to_numpy_rejects_non_npy_payload():
+        """test payloads without the NPY magic string are rejected"""
+        with pytest.raises(ValueError):
+            numpy_decoders.npy_to_numpy(b"[42, 6, 9]")
+
     @staticmethod
     @pytest.mark.parametrize(
         "target, expected",
@@ -97,3 +183,50 @@ class TestNumpyDecoders:
         actual = numpy_decoders.csv_to_numpy(target)
 
         np.testing.assert_equal(actual, expected)
+
+    @staticmethod
+    @pytest.mark.parametrize(
+        "target, dtype, column_types, expected",
+        [
+            (b"42\n6\n9\n", np.int64, None, np.array([42, 6, 9])),
+            (b"42.0\n6.0\n9.0\n", np.float32, None, np.array([42, 6, 9], np.float32)),
+            (
+                b"1,2.5\n3,4.5\n",
+                None,
+                [np.int32, np.float64],
+                np.array([[1.0, 2.5], [3.0, 4.5]]),
+            ),
+            (
+                b'"1","2"\n"3","4"\n',
+                np.float64,
+                [np.int64, np.int64],
+                np.array([[1.0, 2.0], [3.0, 4.0]]),
+            ),
+        ],
+    )
+    def test_csv_to_numpy_with_dtype(target, dtype, column_types, expected):
+        """test csv data is decoded to a numeric, C-contiguous numpy array"""
+        actual = numpy_decoders.csv_to_numpy(
+            target, dtype=dtype, column_types=column_types
+        )
+
+        np.testing.assert_equal(actual, expected)
+        assert actual.dtype == expected.dtype
+        assert actual.flags.c_contiguous
+
+    @staticmethod
+    def test_csv_to_numpy_with_dtype_without_pyarrow():
+        """test csv data falls back to np.loadtxt when pyarrow is unavailable"""
+        with patch.object(
+            numpy_decoders, "_csv_to_numpy_with_pyarrow", side_effect=ImportError
+        ):
+            actual = numpy_decoders.csv_to_numpy(b'1,"2"\n3,4\n', dtype=np.float64)
+
+        np.testing.assert_equal(actual, np.array([[1.0, 2.0], [3.0, 4.0]]))
+        assert actual.flags.c_contiguous
+
+    @staticmethod
+    def test_csv_to_numpy_with_dtype_raises_on_invalid_values():
+        """test non numeric csv data raises when a numeric dtype is requested"""
+        with pytest.raises(Exception, match="Error while decoding csv"):
+            numpy_decoders.csv_to_numpy(b"a\nb\n", dtype=np.float64)
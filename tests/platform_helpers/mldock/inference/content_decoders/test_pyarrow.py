@@ -0,0 +1,151 @@
+"""Tests the arrow stream decoders"""
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+from pyarrow import parquet as pq
+import pytest
+
+from mldock.platform_helpers.mldock.inference.content_decoders import (
+    numpy as numpy_decoders,
+    pandas as pandas_decoders,
+    pyarrow as arrow_decoders,
+)
+
+
+def make_stream(table):
+    """serialize a table as arrow ipc stream"""
+    sink = pa.BufferOutputStream()
+    with pa.ipc.new_stream(sink, table.schema) as writer:
+        writer.write_table(table)
+    return sink.getvalue().to_pybytes()
+
+
+class TestArrowDecoders:
+    """Tests the arrow decoder methods"""
+
+    @staticmethod
+    def test_arrow_stream_to_record_batches():
+        """test arrow stream is decoded to record batches"""
+        table = pa.table({"col": [42, 6, 9]})
+
+        actual = list(arrow_decoders.arrow_stream_to_record_batches(make_stream(table)))
+
+        assert len(actual) == 1
+        assert actual[0].equals(table.to_batches()[0])
+
+    @staticmethod
+    @pytest.mark.parametrize(
+        "table, expected",
+        [
+            (pa.table({"col": [42, 6, 9]}), np.array([42, 6, 9])),
+            (pa.table({"col": [42.0, 6.0, 9.0]}), np.array([42.0, 6.0, 9.0])),
+            (
+                pa.table({"a": [1.0, 3.0], "b": [2.0, 4.0]}),
+                np.array([[1.0, 2.0], [3.0, 4.0]]),
+            ),
+            (
+                pa.table(
+                    {
+                        "tensor": pa.FixedSizeListArray.from_arrays(
+                            pa.array([1, 2, 3, 4, 5, 6]), 3
+                        )
+                    }
+                ),
+                np.array([[1, 2, 3], [4, 5, 6]]),
+            ),
+        ],
+    )
+    def test_arrow_stream_to_numpy(table, expected):
+        """test arrow stream is correctly decoded to numpy array"""
+        actual = arrow_decoders.arrow_stream_to_numpy(make_stream(table))
+
+        np.testing.assert_equal(actual, expected)
+
+    @staticmethod
+    def test_arrow_stream_to_numpy_is_zero_copy():
+        """test a single primitive column is a view over the request bytes"""
+        payload = make_stream(pa.table({"col": np.arange(1024, dtype=np.float64)}))
+
+        actual = arrow_decoders.arrow_stream_to_numpy(payload)
+
+        assert np.shares_memory(actual, np.frombuffer(payload, dtype=np.uint8))
+
+    @staticmethod
+    def test_arrow_stream_to_pandas():
+        """test arrow stream is correctly decoded to pandas dataframe"""
+        expected = pd.DataFrame({"a": [42, 6, 9], "b": [1.0, 2.0, 3.0]})
+        payload = make_stream(pa.Table.from_pandas(expected, preserve_index=False))
+
+        actual = arrow_decoders.arrow_stream_to_pandas(payload)
+
+        pd.testing.assert_frame_equal(actual, expected)
+
+
+@pytest.fixture
+def parquet_bytes():
+    """wide table serialized as parquet with two row groups"""
+    table = pa.table({"a": [1, 2, 3, 4], "b": [0.5, 1.5, 2.5, 3.5], "c": list("wxyz")})
+    sink = pa.BufferOutputStream()
+    pq.write_table(table, sink, row_group_size=2)
+    return sink.getvalue().to_pybytes()
+
+
+class TestParquetDecoders:
+    """Tests the parquet decoder methods"""
+
+    @staticmethod
+    def test_parquet_to_table_projects_columns(parquet_bytes):
+        """test only the requested columns are read"""
+        actual = arrow_decoders.parquet_to_table(parquet_bytes, columns=["b", "a"])
+
+        assert actual.column_names == ["b", "a"]
+        assert actual.num_rows == 4
+
+    @staticmethod
+    def test_iter_parquet_row_groups(parquet_bytes):
+        """test row groups are read one at a time"""
+        actual = list(
+            arrow_decoders.iter_parquet_row_groups(parquet_bytes, columns=["a"])
+        )
+
+        assert [table.column("a").to_pylist() for table in actual] == [[1, 2], [3, 4]]
+
+    @staticmethod
+    def test_parquet_to_numpy(parquet_bytes):
+        """test parquet content is decoded to numpy array"""
+        actual = numpy_decoders.parquet_to_numpy(parquet_bytes, columns=["a", "b"])
+
+        np.testing.assert_equal(
+            actual, np.array([[1.0, 0.5], [2.0, 1.5], [3.0, 2.5], [4.0, 3.5]])
+        )
+
+    @staticmethod
+    def test_parquet_to_pandas(parquet_bytes):
+        """test parquet content is decoded to arrow backed pandas dataframe"""
+        actual = pandas_decoders.parquet_to_pandas(parquet_bytes, columns=["a", "c"])
+
+        assert list(actual.columns) == ["a", "c"]
+        assert isinstance(actual["a"].dtype, pd.ArrowDtype)
+        assert actual["c"].tolist() == list("wxyz")
+
+    @staticmethod
+    def test_parquet_to_pandas_without_arrow_dtypes(parquet_bytes):
+        """test parquet content is decoded to numpy backed pandas dataframe"""
+        actual = pandas_decoders.parquet_to_pandas(
+            parquet_bytes, columns=["a", "b"], arrow_dtypes=False
+        )
+
+        pd.testing.assert_frame_equal(
+            actual, pd.DataFrame({"a": [1, 2, 3, 4], "b": [0.5, 1.5, 2.5, 3.5]})
+        )
+
+    @staticmethod
+    def test_parquet_row_groups_to_pandas(parquet_bytes):
+        """test parquet row groups are decoded to one dataframe each"""
+        actual = list(
+            pandas_decoders.parquet_row_groups_to_pandas(
+                parquet_bytes, columns=["b"], arrow_dtypes=False
+            )
+        )
+
+        assert [frame["b"].tolist() for frame in actual] == [[0.5, 1.5], [2.5, 3.5]]
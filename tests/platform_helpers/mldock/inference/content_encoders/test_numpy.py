@@ -15,6 +15,7 @@
 #
 import io
 import itertools
+import json
 
 from mock import Mock, patch
 import numpy as np
@@ -97,3 +98,91 @@ class TestNumpyEncoders:
             np.array(target).astype(str), quoted=quoted
         )
         np.testing.assert_equal(actual, expected)
+
+    @staticmethod
+    @pytest.mark.parametrize("backend", [numpy_encoders.orjson, None])
+    @pytest.mark.parametrize(
+        "target, expected",
+        [
+            ([42, 6, 9], b"[42,6,9]"),
+            (np.array([42, 6, 9]), b"[42,6,9]"),
+            (np.array([42.0, 6.0, 9.0], dtype=np.float32), b"[42.0,6.0,9.0]"),
+            (np.arange(6).reshape(2, 3).T, b"[[0,3],[1,4],[2,5]]"),
+            (np.array(["42", "6", "9"]), b'["42","6","9"]'),
+            (np.array([True, False]), b"[true,false]"),
+            ({42: {"6": 9.0}}, b'{"42":{"6":9.0}}'),
+            (np.array({42: {"6": 9.0}}), b'{"42":{"6":9.0}}'),
+            (
+                {"scores": np.array([0.5, 1.5]), "label": np.int64(1)},
+                b'{"scores":[0.5,1.5],"label":1}',
+            ),
+        ],
+    )
+    def test_array_to_json_bytes(target, expected, backend):
+        """test numpy arrays are correctly encoded as json bytes by both backends"""
+        with patch.object(numpy_encoders, "orjson", backend):
+            actual = numpy_encoders.array_to_json_bytes(target)
+
+        assert actual == expected
+
+    @staticmethod
+    @pytest.mark.parametrize("backend", [numpy_encoders.orjson, None])
+    def test_array_to_json_bytes_with_precision(backend):
+        """test floats are rounded to the requested precision"""
+        target = {"scores": np.array([1 / 3, 2 / 3]), "bias": 0.123456}
+
+        with patch.object(numpy_encoders, "orjson", backend):
+            actual = numpy_encoders.array_to_json_bytes(target, precision=3)
+
+        assert actual == b'{"scores":[0.333,0.667],"bias":0.123}'
+
+    @staticmethod
+    @pytest.mark.parametrize(
+        "target",
+        [
+            np.arange(-70000, 70000).reshape(-1, 7),
+            np.random.RandomState(0).rand(1000, 130),
+            np.random.RandomState(0).rand(70000).astype(np.float32),
+            np.array([[1.0, 2.0], [-3.0, 1e22]]),
+            np.array([0.5, 2.0, 1e-7]),
+        ],
+    )
+    def test_array_to_json_bytes_without_orjson(target):
+        """test numeric arrays formatted by the standard library round-trip exactly as floats"""
+        with patch.object(numpy_encoders, "orjson", None):
+            actual = json.loads(numpy_encoders.array_to_json_bytes(target))
+
+        np.testing.assert_array_equal(np.array(actual, dtype=target.dtype), target)
+        assert all(
+            isinstance(value, type(target.ravel()[0].item()))
+            for value in np.ravel(np.array(actual, dtype=object))
+        )
+
+    @staticmethod
+    @pytest.mark.parametrize(
+        "target, expected, quoted",
+        [
+            ([[1, 2], [3, 4], [5, 6]], ["1,2\n3,4\n", "5,6\n"], False),
+            ([[1, 2], [3, 4], [5, 6]], ['"1","2"\n"3","4"\n', '"5","6"\n'], True),
+            (
+                np.array([0.1, 0.2, 0.3], dtype=np.float32),
+                ["0.1\n0.2\n", "0.3\n"],
+                False,
+            ),
+            (42, ["42\n"], False),
+        ],
+    )
+    def test_array_to_csv_chunks(target, expected, quoted):
+        """test numpy arrays are encoded as csv in chunks of rows"""
+        actual = list(
+            numpy_encoders.array_to_csv_chunks(target, quoted=quoted, chunk_size=2)
+        )
+
+        assert actual == expected
+
+    @staticmethod
+    def test_array_to_csv_does_not_print(capsys):
+        """test encoding csv does not write the array to stdout"""
+        numpy_encoders.array_to_csv(np.arange(10))
+
+        assert capsys.readouterr().out == ""
@@ -0,0 +1,52 @@
+"""Tests the arrow stream encoders"""
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pytest
+
+from mldock.platform_helpers.mldock.inference.content_encoders import (
+    pyarrow as arrow_encoders,
+)
+
+
+def read_stream(bytes_like):
+    """deserialize an arrow ipc stream as table"""
+    return pa.ipc.open_stream(pa.py_buffer(bytes_like)).read_all()
+
+
+class TestArrowEncoders:
+    """Tests the arrow encoder methods"""
+
+    @staticmethod
+    @pytest.mark.parametrize(
+        "target, expected",
+        [
+            ([42, 6, 9], pa.table({"f0": [42, 6, 9]})),
+            ([42.0, 6.0, 9.0], pa.table({"f0": [42.0, 6.0, 9.0]})),
+            (["42", "6", "9"], pa.table({"f0": ["42", "6", "9"]})),
+            ([[1.0, 2.0], [3.0, 4.0]], pa.table({"f0": [1.0, 3.0], "f1": [2.0, 4.0]})),
+        ],
+    )
+    def test_array_to_arrow_stream(target, expected):
+        """test numpy arrays are correctly encoded as arrow stream"""
+        actual = arrow_encoders.array_to_arrow_stream(np.array(target))
+
+        assert read_stream(actual).equals(expected)
+
+    @staticmethod
+    def test_array_to_arrow_stream_with_column_names():
+        """test column names are set on the encoded arrow stream"""
+        actual = arrow_encoders.array_to_arrow_stream(
+            np.array([0.1, 0.9]), column_names=["score"]
+        )
+
+        assert read_stream(actual).column_names == ["score"]
+
+    @staticmethod
+    def test_dataframe_to_arrow_stream():
+        """test pandas dataframes are correctly encoded as arrow stream"""
+        target = pd.DataFrame({"a": [42, 6, 9], "b": ["x", "y", "z"]})
+
+        actual = arrow_encoders.dataframe_to_arrow_stream(target)
+
+        pd.testing.assert_frame_equal(read_stream(actual).to_pandas(), target)
@@ -0,0 +1,153 @@
+"""Tests the codec registry"""
+import numpy as np
+import pytest
+
+from mldock.platform_helpers.mldock.inference.codecs import (
+    CodecRegistry,
+    NotAcceptable,
+    UnsupportedContentType,
+    default_codec_registry,
+    parse_accept_header,
+)
+from mldock.platform_helpers.mldock.inference.headers import content_type_for_path
+
+
+@pytest.fixture
+def registry():
+    """registry with json, csv and npy encoders"""
+    codecs = CodecRegistry()
+    codecs.register_decoder("application/json", lambda body: "json")
+    codecs.register_encoder("application/json", lambda data: "json")
+    codecs.register_encoder("text/csv", lambda data: "csv")
+    codecs.register_encoder("application/x-npy", lambda data: "npy")
+    return codecs
+
+
+class TestCodecRegistry:
+    """Tests the codec registry methods"""
+
+    @staticmethod
+    def test_parse_accept_header():
+        """test media ranges are ordered by q-value and specificity"""
+        actual = parse_accept_header(
+            "*/*;q=0.1, text/*, text/csv, application/json;q=0.5"
+        )
+
+        assert actual == [
+            ("text/csv", 1.0),
+            ("text/*", 1.0),
+            ("application/json", 0.5),
+            ("*/*", 0.1),
+        ]
+
+    @staticmethod
+    @pytest.mark.parametrize(
+        "path, expected",
+        [
+            ("warmup/a.csv", "text/csv"),
+            ("warmup/A.JSONL", "application/jsonlines"),
+            ("warmup/cat.jpg", "image/jpeg"),
+            ("warmup/README.md", None),
+        ],
+    )
+    def test_content_type_for_path(path, expected):
+        """test payload content types are inferred from file extensions"""
+        assert content_type_for_path(path) == expected
+
+    @staticmethod
+    @pytest.mark.parametrize(
+        "content_type",
+        ["application/json", "Application/JSON", "application/json; charset=utf-8"],
+    )
+    def test_decoder_for(registry, content_type):
+        """test decoders are looked up by normalized content type"""
+        assert registry.decoder_for(content_type)(b"") == "json"
+
+    @staticmethod
+    @pytest.mark.parametrize("content_type", ["text/plain", None])
+    def test_decoder_for_unsupported_content_type(registry, content_type):
+        """test unknown content types raise UnsupportedContentType"""
+        with pytest.raises(UnsupportedContentType):
+            registry.decoder_for(content_type)
+
+    @staticmethod
+    @pytest.mark.parametrize(
+        "accept, default, expected",
+        [
+            (None, None, "application/json"),
+            (None, "text/csv", "text/csv"),
+            ("*/*", "application/x-npy", "application/x-npy"),
+            ("text/csv", "application/json", "text/csv"),
+            ("application/json;q=0.4, text/csv;q=0.9", None, "text/csv"),
+            ("text/*, application/json;q=0.1", None, "text/csv"),
+            ("application/json;q=0, */*", None, "text/csv"),
+            ("image/png, application/x-npy;q=0.2", None, "application/x-npy"),
+            ("text/*;q=0, */*", "text/csv", "application/json"),
+            ("*/*;q=0, text/csv;q=0.1", "application/json", "text/csv"),
+            ("text/*;q=0.5, text/csv;q=0, */*;q=0.1", None, "application/json"),
+        ],
+    )
+    def test_encoder_for(registry, accept, default, expected):
+        """test encoders are negotiated from the accept header"""
+        media_type, encoder = registry.encoder_for(accept, default=default)
+
+        assert media_type == expected
+        assert encoder is registry.encoders[expected]
+
+    @staticmethod
+    @pytest.mark.parametrize(
+        "accept", ["image/png", "*/*;q=0", "application/*;q=0, text/*;q=0"]
+    )
+    def test_encoder_for_not_acceptable(registry, accept):
+        """test unsatisfiable accept headers raise NotAcceptable"""
+        with pytest.raises(NotAcceptable):
+            registry.encoder_for(accept)
+
+    @staticmethod
+    def test_register_encoder_resets_negotiation_cache(registry):
+        """test registering a codec is visible to cached negotiations"""
+        with pytest.raises(NotAcceptable):
+            registry.encoder_for("image/png")
+
+        registry.register_encoder("image/png", lambda data: "png")
+
+        assert registry.encoder_for("image/png")[0] == "image/png"
+
+    @staticmethod
+    def test_streaming_encoder_for():
+        """test csv responses can be streamed in chunks, other media types cannot"""
+        codecs = default_codec_registry()
+        expected = np.arange(6).reshape(3, 2)
+
+        streaming_encoder = codecs.streaming_encoder_for("text/csv")
+        chunks = list(streaming_encoder(expected, chunk_size=2))
+
+        assert len(chunks) == 2
+        assert "".join(chunks) == codecs.encoder_for("text/csv")[1](expected)
+        assert codecs.streaming_encoder_for("application/json") is None
+
+        codecs.register_encoder("text/csv", lambda data: "csv")
+        assert codecs.streaming_encoder_for("text/csv") is None
+
+    @staticmethod
+    @pytest.mark.parametrize(
+        "content_type",
+        [
+            "application/json",
+            "text/csv",
+            "application/x-npy",
+            "application/vnd.apache.arrow.stream",
+        ],
+    )
+    def test_default_codec_registry_round_trip(content_type):
+        """test default codecs decode what they encode"""
+        codecs = default_codec_registry()
+        expected = np.array([42.0, 6.0, 9.0])
+
+        media_type, encoder = codecs.encoder_for(content_type)
+        body = encoder(expected)
+        if isinstance(body, str):
+            body = body.encode()
+        actual = codecs.decoder_for(media_type)(body)
+
+        np.testing.assert_equal(np.asarray(actual, dtype=float), expected)
@@ -0,0 +1,128 @@
+"""Tests the content encoding utilities"""
+import gzip
+
+from mock import patch
+import pytest
+
+from mldock.platform_helpers.mldock.inference import compression
+
+
+class TestCompression:
+    """Tests the compression methods"""
+
+    @staticmethod
+    @pytest.mark.parametrize("content_encoding", [None, "", "identity"])
+    def test_decompress_identity(content_encoding):
+        """test bodies without content encoding are returned as is"""
+        assert compression.decompress(b"42,6,9", content_encoding) == b"42,6,9"
+
+    @staticmethod
+    @pytest.mark.parametrize("content_encoding", ["gzip", "GZIP", "x-gzip"])
+    def test_decompress_gzip(content_encoding):
+        """test gzip bodies are decompressed"""
+        body = gzip.compress(b"42,6,9\n" * 1000)
+
+        assert compression.decompress(body, content_encoding) == b"42,6,9\n" * 1000
+
+    @staticmethod
+    def test_iter_decompress_streams_chunks():
+        """test compressed chunks are decompressed incrementally"""
+        payload = bytes(range(256)) * 20000
+        body = gzip.compress(payload)
+        chunks = [body[index : index + 4096] for index in range(0, len(body), 4096)]
+
+        with patch.object(compression, "DECOMPRESS_CHUNK_SIZE", 65536):
+            actual = list(compression.iter_decompress(chunks, "gzip"))
+
+        assert max(len(chunk) for chunk in actual) <= 65536
+        assert b"".join(actual) == payload
+
+    @staticmethod
+    def test_decompress_multiple_codings():
+        """test codings are undone in reverse order of application"""
+        body = gzip.compress(gzip.compress(b"payload"))
+
+        assert compression.decompress(body, "gzip, gzip") == b"payload"
+
+    @staticmethod
+    def test_decompress_rejects_bodies_over_max_size():
+        """test decompression stops with PayloadTooLarge once max_size is exceeded"""
+        body = gzip.compress(b"\0" * (8 << 20))
+
+        with patch.object(compression, "DECOMPRESS_CHUNK_SIZE", 65536):
+            chunks = compression.iter_decompress([body], "gzip", max_size=1 << 20)
+            with pytest.raises(compression.PayloadTooLarge):
+                for chunk in chunks:
+                    assert len(chunk) <= 65536
+
+        with pytest.raises(compression.PayloadTooLarge):
+            compression.decompress(body, "gzip", max_size=1 << 20)
+        assert compression.decompress(body, "gzip", max_size=8 << 20) == b"\0" * (
+            8 << 20
+        )
+
+    @staticmethod
+    def test_decompress_unsupported_encoding():
+        """test unknown content encodings raise UnsupportedContentEncoding"""
+        with pytest.raises(compression.UnsupportedContentEncoding):
+            compression.decompress(b"payload", "br")
+
+    @staticmethod
+    @pytest.mark.parametrize("body", [b"42,6,9\n" * 100, "42,6,9\n" * 100])
+    def test_compress_gzip(body):
+        """test bodies are gzip compressed"""
+        actual = compression.compress(body, "gzip")
+
+        assert gzip.decompress(actual) == b"42,6,9\n" * 100
+
+    @staticmethod
+    def test_iter_compress_gzip():
+        """test streamed chunks are gzip compressed as a single body"""
+        actual = compression.iter_compress(["42,6,9\n"] * 100, "gzip")
+
+        assert gzip.decompress(b"".join(actual)) == b"42,6,9\n" * 100
+
+    @staticmethod
+    def test_iter_compress_unsupported_encoding():
+        """test unknown content encodings are rejected before streaming"""
+        with pytest.raises(compression.UnsupportedContentEncoding):
+            compression.iter_compress([b"payload"], "br")
+
+    @staticmethod
+    def test_compress_zstd_round_trip():
+        """test zstd bodies round trip when zstandard is installed"""
+        pytest.importorskip("zstandard")
+        actual = compression.compress(b"payload" * 100, "zstd")
+
+        assert compression.decompress(actual, "zstd") == b"payload" * 100
+
+    @staticmethod
+    @pytest.mark.parametrize(
+        "accept_encoding, expected",
+        [
+            (None, None),
+            ("identity", None),
+            ("gzip", "gzip"),
+            ("gzip, deflate, br", "gzip"),
+            ("br, zstd;q=0.9, gzip;q=0.5", "zstd"),
+            ("*", "zstd"),
+            ("zstd;q=0, *", "gzip"),
+            ("deflate", None),
+        ],
+    )
+    def test_negotiate_content_encoding(accept_encoding, expected):
+        """test response encoding is negotiated from accept-encoding"""
+        actual = compression.negotiate_content_encoding(
+            accept_encoding, encodings=["zstd", "gzip"]
+        )
+
+        assert actual == expected
+
+    @staticmethod
+    def test_negotiate_content_encoding_does_not_probe_packages():
+        """test supported encodings are probed once, not per request"""
+        with patch.object(compression, "_zstandard") as zstandard:
+            actual = compression.negotiate_content_encoding("gzip, deflate")
+
+        assert actual == "gzip"
+        zstandard.assert_not_called()
@@ -0,0 +1,97 @@
+"""Tests the memory-mapped model artifacts"""
+import json
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+from mldock.platform_helpers.mldock.model_service import artifacts
+
+
+class Embeddings:
+    """scikit-learn style model holding fitted arrays as attributes"""
+
+    def __init__(self, table, bias):
+        self.table_ = table
+        self.bias_ = bias
+        self.name = "embeddings"
+
+    def predict(self, ids):
+        return self.table_[ids] + self.bias_
+
+
+def is_memory_mapped(array) -> bool:
+    """whether an array is a view on a memory-mapped file"""
+    while array is not None:
+        if isinstance(array, np.memmap):
+            return True
+        array = getattr(array, "base", None)
+    return False
+
+
+class TestArtifacts:
+    """Tests saving and loading memory-mapped artifacts"""
+
+    @staticmethod
+    def test_round_trip_arrays(tmp_path):
+        """test a dict of weights is loaded as read-only memory-mapped arrays"""
+        weights = {
+            "dense": np.arange(12, dtype=np.float32).reshape(3, 4),
+            "fortran": np.asfortranarray(np.arange(6, dtype=np.int64).reshape(2, 3)),
+            "empty": np.empty(0, dtype=np.float64),
+        }
+
+        artifacts.save_artifact(weights, tmp_path)
+        loaded = artifacts.load_artifact(tmp_path)
+
+        for name, array in weights.items():
+            np.testing.assert_array_equal(loaded[name], array)
+            assert loaded[name].dtype == array.dtype
+            assert not loaded[name].flags.writeable
+        assert is_memory_mapped(loaded["dense"])
+        assert loaded["fortran"].flags.f_contiguous
+
+    @staticmethod
+    def test_round_trip_model(tmp_path):
+        """test a model object's array attributes are memory-mapped"""
+        model = Embeddings(np.random.rand(100, 8), np.ones(8))
+
+        manifest = artifacts.save_artifact(model, tmp_path)
+        loaded = artifacts.load_artifact(tmp_path)
+
+        assert loaded.name == "embeddings"
+        np.testing.assert_array_equal(loaded.predict([1, 5]), model.predict([1, 5]))
+        assert is_memory_mapped(loaded.table_)
+        assert [entry["shape"] for entry in manifest["arrays"]] == [[100, 8], [8]]
+        assert all(
+            entry["offset"] % artifacts.ALIGNMENT == 0 for entry in manifest["arrays"]
+        )
+
+    @staticmethod
+    def test_save_over_loaded_artifact(tmp_path):
+        """test saving over an artifact keeps models loaded from it readable"""
+        artifacts.save_artifact({"a": np.arange(1000.0)}, tmp_path)
+        first = artifacts.load_artifact(tmp_path)
+        artifacts.save_artifact({"a": np.ones(10)}, tmp_path)
+        second = artifacts.load_artifact(tmp_path)
+        artifacts.save_artifact({"a": np.zeros(10)}, tmp_path)
+
+        np.testing.assert_array_equal(first["a"], np.arange(1000.0))
+        np.testing.assert_array_equal(second["a"], np.ones(10))
+        np.testing.assert_array_equal(
+            artifacts.load_artifact(tmp_path)["a"], np.zeros(10)
+        )
+        # the current and previous saves are kept
+        assert len(list(tmp_path.glob("arrays*.bin"))) == 2
+
+    @staticmethod
+    def test_unsupported_format_version(tmp_path):
+        """test artifacts in an unknown format are rejected"""
+        artifacts.save_artifact({"a": np.ones(2)}, tmp_path)
+        manifest_path = Path(tmp_path, artifacts.MANIFEST_FILENAME)
+        manifest = json.loads(manifest_path.read_text())
+        manifest["format_version"] = 99
+        manifest_path.write_text(json.dumps(manifest))
+
+        with pytest.raises(ValueError):
+            artifacts.load_artifact(tmp_path)
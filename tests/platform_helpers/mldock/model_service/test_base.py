@@ -0,0 +1,77 @@
+"""Tests the model service base class"""
+import threading
+
+import pytest
+
+from mldock.platform_helpers.mldock.model_service.base import ModelService
+from mldock.platform_helpers.mldock.tracking.latency import LatencyMetrics
+
+
+class SlowService(ModelService):
+    """model service whose load blocks until released"""
+
+    release = threading.Event()
+
+    @classmethod
+    def load_model(cls, model_path: str):
+        if model_path == "missing":
+            raise OSError("missing model")
+        cls.release.wait(5)
+        return model_path
+
+    def predict(self, input_data):
+        return input_data
+
+
+class TestModelService:
+    """Tests model service loading"""
+
+    @staticmethod
+    def test_loads_synchronously_by_default():
+        """test the model is loaded in __init__"""
+        SlowService.release.set()
+
+        service = SlowService(model_path="model")
+
+        assert service.is_loaded
+        assert service.model == "model"
+        assert service.load_duration >= 0
+
+    @staticmethod
+    def test_loads_in_background():
+        """test background loading returns before the model is loaded"""
+        SlowService.release.clear()
+
+        service = SlowService(model_path="model", background=True)
+
+        assert not service.is_loaded
+        SlowService.release.set()
+        assert service.wait_until_loaded(5)
+        assert service.model == "model"
+
+    @staticmethod
+    def test_background_load_failure():
+        """test background loading errors are recorded, not raised"""
+        service = SlowService(model_path="missing", background=True)
+
+        assert not service.wait_until_loaded(5)
+        assert isinstance(service.load_error, OSError)
+
+        with pytest.raises(OSError):
+            SlowService(model_path="missing")
+
+    @staticmethod
+    def test_instrument():
+        """test model service stages are timed"""
+        SlowService.release.set()
+        service = SlowService(model_path="model")
+        latency = service.instrument(LatencyMetrics())
+
+        assert service.predict(1) == 1
+        service.input_transform([1])
+        service.output_transform([1])
+
+        snapshot = latency.snapshot()
+        assert snapshot["predict"]["count"] == 1
+        assert snapshot["input_transform"]["count"] == 1
+        assert snapshot["output_transform"]["count"] == 1
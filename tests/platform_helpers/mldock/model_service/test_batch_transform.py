@@ -0,0 +1,230 @@
+"""Tests the offline batch transform"""
+import json
+from pathlib import Path
+
+import numpy as np
+import pytest
+from mock import MagicMock
+
+from mldock.platform_helpers.mldock.inference.codecs import default_codec_registry
+from mldock.platform_helpers.mldock.model_service import batch_transform
+from mldock.platform_helpers.mldock.model_service.base import ModelService
+
+
+class SumService(ModelService):
+    """model service summing each record"""
+
+    batches = []
+
+    @staticmethod
+    def load_model(model_path: str):
+        return None
+
+    def predict(self, input_data):
+        self.batches.append(len(input_data))
+        return input_data.sum(axis=1)
+
+    @staticmethod
+    def input_transform(input_data, **kwargs):
+        return np.asarray(input_data, dtype=float)
+
+    @staticmethod
+    def output_transform(predictions, **kwargs):
+        return predictions.reshape(-1, 1)
+
+
+@pytest.fixture(name="model_service")
+def fixture_model_service():
+    """model service with a fresh record of batch sizes"""
+    service = SumService(model_path="model")
+    service.batches = []
+    return service
+
+
+def write_csv(path: Path, rows: int):
+    """write a CSV file with rows of (index, 1)"""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text("".join(f"{index},1\n" for index in range(rows)))
+
+
+def read_results(path: Path) -> list:
+    """read one quoted result per line"""
+    return [float(line.strip('"')) for line in path.read_text().splitlines()]
+
+
+class TestShardFile:
+    """Tests splitting files on record boundaries"""
+
+    @staticmethod
+    def test_shards_end_on_record_boundaries(tmp_path):
+        """test shards cover the file and end on newlines"""
+        path = Path(tmp_path, "input.csv")
+        write_csv(path, 100)
+        data = path.read_bytes()
+
+        shards = batch_transform.shard_file(path, shard_size=50)
+
+        assert len(shards) > 1
+        assert shards[0][0] == 0 and shards[-1][1] == len(data)
+        for (_, end), (start, _) in zip(shards, shards[1:]):
+            assert end == start
+            assert data[end - 1 : end] == b"\n"
+
+
+class TestBatchTransform:
+    """Tests the batch transform"""
+
+    @staticmethod
+    def test_transform_in_order(tmp_path, model_service):
+        """test results are written in input order, in micro-batches"""
+        write_csv(Path(tmp_path, "input", "a.csv"), 100)
+        write_csv(Path(tmp_path, "input", "nested", "b.csv"), 1)
+        transform = batch_transform.BatchTransform(
+            model_service, batch_size=8, shard_size=64, num_workers=4
+        )
+
+        stats = transform.transform(Path(tmp_path, "input"), Path(tmp_path, "output"))
+
+        assert read_results(Path(tmp_path, "output", "a.csv.out")) == [
+            index + 1.0 for index in range(100)
+        ]
+        assert read_results(Path(tmp_path, "output", "nested", "b.csv.out")) == [1.0]
+        assert stats["files"] == 2 and stats["shards"] > 2
+        assert max(model_service.batches) <= 8
+        assert not Path(
+            tmp_path, "output", batch_transform.CHECKPOINT_DIR_NAME, "a.csv"
+        ).exists()
+
+    @staticmethod
+    @pytest.mark.parametrize(
+        "accept, worker_type",
+        [
+            ("application/json", "thread"),
+            ("application/x-npy", "thread"),
+            ("application/vnd.apache.arrow.stream", "thread"),
+            ("application/json", "fork"),
+        ],
+    )
+    def test_transform_document_formats(tmp_path, model_service, accept, worker_type):
+        """test shards of non line delimited formats are merged in to one document"""
+        write_csv(Path(tmp_path, "input", "a.csv"), 100)
+        transform = batch_transform.BatchTransform(
+            model_service,
+            accept=accept,
+            shard_size=200,
+            num_workers=2,
+            worker_type=worker_type,
+        )
+
+        stats = transform.transform(Path(tmp_path, "input"), Path(tmp_path, "output"))
+
+        content = Path(tmp_path, "output", "a.csv.out").read_bytes()
+        actual = default_codec_registry().decoder_for(accept)(content)
+        assert stats["shards"] > 2
+        np.testing.assert_array_equal(
+            np.asarray(actual, dtype=float).ravel(), np.arange(100) + 1.0
+        )
+
+    @staticmethod
+    def test_transform_jsonlines(tmp_path, model_service):
+        """test JSON Lines files are transformed"""
+        path = Path(tmp_path, "input", "a.jsonl")
+        path.parent.mkdir()
+        path.write_text("".join(json.dumps([index, 2]) + "\n" for index in range(10)))
+        transform = batch_transform.BatchTransform(model_service, batch_size=3)
+
+        transform.transform(Path(tmp_path, "input"), Path(tmp_path, "output"))
+
+        assert read_results(Path(tmp_path, "output", "a.jsonl.out")) == [
+            index + 2.0 for index in range(10)
+        ]
+
+    @staticmethod
+    def test_resumes_from_checkpoint(tmp_path, model_service):
+        """test a restarted job only processes shards without a checkpoint"""
+        write_csv(Path(tmp_path, "input", "a.csv"), 100)
+        transform = batch_transform.BatchTransform(
+            model_service, shard_size=64, num_workers=1
+        )
+        transform.process_shard = MagicMock(
+            side_effect=[b"done\n", RuntimeError("preempted")]
+        )
+
+        with pytest.raises(RuntimeError):
+            transform.transform(Path(tmp_path, "input"), Path(tmp_path, "output"))
+
+        transform = batch_transform.BatchTransform(model_service, shard_size=1024)
+        stats = transform.transform(Path(tmp_path, "input"), Path(tmp_path, "output"))
+
+        results = Path(tmp_path, "output", "a.csv.out").read_text().splitlines()
+        _, first_shard_end = batch_transform.shard_file(
+            Path(tmp_path, "input", "a.csv"), shard_size=64
+        )[0]
+        first_shard_rows = (
+            Path(tmp_path, "input", "a.csv").read_bytes()[:first_shard_end].count(b"\n")
+        )
+        assert stats["resumed_shards"] == 1
+        assert results[0] == "done"
+        assert [float(line.strip('"')) for line in results[1:]] == [
+            index + 1.0 for index in range(first_shard_rows, 100)
+        ]
+
+    @staticmethod
+    def test_checkpoints_shards_completed_after_a_failure(tmp_path, model_service):
+        """test shards completing after a failed shard are still checkpointed"""
+        write_csv(Path(tmp_path, "input", "a.csv"), 100)
+        transform = batch_transform.BatchTransform(
+            model_service, shard_size=64, num_workers=1
+        )
+        transform.process_shard = MagicMock(
+            side_effect=lambda shard: b"done\n" if shard["index"] else 1 / 0
+        )
+
+        with pytest.raises(ZeroDivisionError):
+            transform.transform(Path(tmp_path, "input"), Path(tmp_path, "output"))
+
+        checkpoint_dir = Path(tmp_path, "output", ".checkpoint", "a.csv")
+        shards = len(batch_transform.shard_file(Path(tmp_path, "input", "a.csv"), 64))
+        assert shards > 2
+        assert sorted(path.name for path in checkpoint_dir.glob("part-*")) == [
+            f"part-{index:05d}" for index in range(1, shards)
+        ]
+
+    @staticmethod
+    def test_skips_completed_files(tmp_path, model_service):
+        """test files with results are not transformed again"""
+        write_csv(Path(tmp_path, "input", "a.csv"), 10)
+        transform = batch_transform.BatchTransform(model_service)
+        transform.transform(Path(tmp_path, "input"), Path(tmp_path, "output"))
+
+        stats = transform.transform(Path(tmp_path, "input"), Path(tmp_path, "output"))
+
+        assert stats["files"] == 0
+
+    @staticmethod
+    def test_skips_files_without_a_decoder(tmp_path, model_service):
+        """test files without a registered decoder, e.g. images, are skipped"""
+        write_csv(Path(tmp_path, "input", "a.csv"), 3)
+        Path(tmp_path, "input", "b.png").write_bytes(b"\x89PNG")
+        transform = batch_transform.BatchTransform(model_service)
+
+        stats = transform.transform(Path(tmp_path, "input"), Path(tmp_path, "output"))
+
+        assert stats["files"] == 1
+        assert not Path(tmp_path, "output", "b.png.out").exists()
+
+    @staticmethod
+    def test_run_over_input_channels(tmp_path, model_service):
+        """test every input channel is transformed in to the output directory"""
+        write_csv(Path(tmp_path, "input", "scoring", "a.csv"), 5)
+        environment = MagicMock()
+        environment.input_data_dir = Path(tmp_path, "input")
+        environment.output_data_dir = Path(tmp_path, "output")
+        environment.get_input_channel_iter.return_value = [
+            {"key": "MLDOCK_INPUT_CHANNEL_SCORING", "value": "s3://bucket/scoring"}
+        ]
+
+        results = batch_transform.BatchTransform(model_service).run(environment)
+
+        assert results["scoring"]["files"] == 1
+        assert Path(tmp_path, "output", "scoring", "a.csv.out").exists()
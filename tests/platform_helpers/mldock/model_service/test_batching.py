@@ -0,0 +1,146 @@
+"""Tests the micro-batching engine"""
+
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+import threading
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from mldock.platform_helpers.mldock.model_service import batching
+from mldock.platform_helpers.mldock.model_service.base import ModelService
+
+
+class DoublingService(ModelService):
+    """model service that doubles its inputs"""
+
+    calls = None
+
+    @staticmethod
+    def load_model(model_path: str):
+        return None
+
+    def predict(self, input_data):
+        self.calls.append(len(input_data))
+        return np.asarray(input_data) * 2
+
+
+@pytest.fixture
+def service():
+    """model service recording batch sizes"""
+    model_service = DoublingService(model_path="model")
+    model_service.calls = []
+    return model_service
+
+
+class TestMicroBatcher:
+    """Tests the micro-batching methods"""
+
+    @staticmethod
+    @pytest.mark.parametrize(
+        "inputs, expected",
+        [
+            ([[1, 2], [3]], [1, 2, 3]),
+            ([np.array([[1], [2]]), np.array([[3]])], np.array([[1], [2], [3]])),
+            (
+                [pd.DataFrame({"a": [1, 2]}), pd.DataFrame({"a": [3]})],
+                pd.DataFrame({"a": [1, 2, 3]}),
+            ),
+        ],
+    )
+    def test_concatenate_and_split_batches(inputs, expected):
+        """test batches merge and split back per request"""
+        merged = batching.concatenate_batches(inputs)
+        np.testing.assert_equal(np.asarray(merged), np.asarray(expected))
+
+        actual = batching.split_batches(merged, [len(item) for item in inputs])
+        for result, item in zip(actual, inputs):
+            np.testing.assert_equal(np.asarray(result), np.asarray(item))
+
+    @staticmethod
+    def test_concurrent_requests_share_a_predict_call(service):
+        """test concurrent requests are merged in to one batch"""
+        batcher = service.create_batcher(max_batch_size=8, max_wait_ms=500)
+        requests = [np.array([index, index]) for index in range(4)]
+
+        with ThreadPoolExecutor(max_workers=4) as executor:
+            actual = list(executor.map(batcher.predict, requests))
+        batcher.close()
+
+        for result, request in zip(actual, requests):
+            np.testing.assert_equal(result, request * 2)
+        assert service.calls == [8]
+        assert batcher.mean_batch_size == 8
+
+    @staticmethod
+    def test_batches_respect_max_batch_size(service):
+        """test batches are flushed once max_batch_size records are queued"""
+        batcher = service.create_batcher(max_batch_size=2, max_wait_ms=1000)
+
+        futures = [batcher.submit([index]) for index in range(4)]
+        actual = [future.result(timeout=5) for future in futures]
+        batcher.close()
+
+        np.testing.assert_equal(actual, [[0], [2], [4], [6]])
+        assert service.calls == [2, 2]
+
+    @staticmethod
+    def test_overflowing_requests_start_the_next_batch(service):
+        """test a request that would overflow a batch is carried to the next one"""
+        batcher = service.create_batcher(max_batch_size=4, max_wait_ms=200)
+
+        futures = [
+            batcher.submit(request) for request in ([1, 2, 3], [4, 5], [6, 7], [8] * 6)
+        ]
+        actual = [future.result(timeout=5) for future in futures]
+        batcher.close()
+
+        np.testing.assert_equal(actual[:3], [[2, 4, 6], [8, 10], [12, 14]])
+        # only a single request larger than max_batch_size exceeds it
+        assert service.calls == [3, 4, 6]
+
+    @staticmethod
+    def test_predict_output_length_must_match_the_batch():
+        """test predict returning the wrong number of outputs fails the batch"""
+        batcher = batching.MicroBatcher(lambda batch: batch[:1], max_wait_ms=1)
+
+        with pytest.raises(ValueError, match="1 outputs for a batch of 2 records"):
+            batcher.predict([1, 2])
+        batcher.close()
+
+    @staticmethod
+    def test_predict_async(service):
+        """test coroutines can await batched predictions"""
+        batcher = service.create_batcher(max_batch_size=4, max_wait_ms=50)
+
+        async def run():
+            return await asyncio.gather(
+                batcher.predict_async([1]), batcher.predict_async([2])
+            )
+
+        actual = asyncio.run(run())
+        batcher.close()
+
+        np.testing.assert_equal(actual, [[2], [4]])
+
+    @staticmethod
+    def test_predict_errors_propagate_to_each_request():
+        """test a failed predict call fails every request in the batch"""
+        release = threading.Event()
+
+        def predict(input_data):
+            release.wait(5)
+            raise ValueError("model failure")
+
+        batcher = batching.MicroBatcher(predict, max_batch_size=2, max_wait_ms=1000)
+        futures = [batcher.submit([1]), batcher.submit([2])]
+        release.set()
+
+        for future in futures:
+            with pytest.raises(ValueError, match="model failure"):
+                future.result(timeout=5)
+        batcher.close()
+
+        with pytest.raises(RuntimeError):
+            batcher.submit([3])
@@ -0,0 +1,153 @@
+"""Tests the multi-model cache"""
+from concurrent.futures import ThreadPoolExecutor
+import tempfile
+import threading
+import time
+
+from mock import patch
+import numpy as np
+import pytest
+
+from mldock.platform_helpers.mldock.model_service import cache as model_cache
+from mldock.platform_helpers.mldock.model_service.cache import (
+    ModelCache,
+    estimate_model_size,
+)
+
+
+class Loader:
+    """records model loads"""
+
+    def __init__(self, delay=0.0):
+        self.delay = delay
+        self.loads = []
+        self.lock = threading.Lock()
+
+    def __call__(self, model_path):
+        time.sleep(self.delay)
+        with self.lock:
+            self.loads.append(model_path)
+        return {"path": model_path, "weights": np.zeros(1000)}
+
+
+@pytest.fixture
+def model_dir():
+    """temporary model channel"""
+    with tempfile.TemporaryDirectory() as tempdir:
+        yield tempdir
+
+
+class TestModelCache:
+    """Tests the model cache methods"""
+
+    @staticmethod
+    def test_estimate_model_size():
+        """test numpy weights dominate the estimated size"""
+        weights = np.zeros((1000, 100))
+        model = {"coef": weights, "nested": [weights, {"bias": np.ones(10)}]}
+
+        actual = estimate_model_size(model)
+
+        assert weights.nbytes <= actual < 2 * weights.nbytes
+
+    @staticmethod
+    def test_size_is_measured_from_resident_memory(model_dir):
+        """test native allocations invisible to the object walk are measured by rss"""
+        cache = ModelCache(load_model=Loader(), model_dir=model_dir)
+
+        # a load growing the resident set by 50 MiB
+        with patch.object(model_cache, "read_rss", side_effect=[0, 50 * 2**20]):
+            cache.get("tenant-a")
+
+        assert cache.memory_usage == 50 * 2**20
+
+    @staticmethod
+    def test_size_falls_back_to_estimate(model_dir):
+        """test the object walk is used when resident memory does not grow"""
+        cache = ModelCache(load_model=Loader(), model_dir=model_dir)
+
+        with patch.object(model_cache, "read_rss", return_value=None):
+            model = cache.get("tenant-a")
+
+        assert cache.memory_usage == estimate_model_size(model) > 8000
+
+    @staticmethod
+    def test_get_loads_lazily_and_caches(model_dir):
+        """test models are loaded once and then served from cache"""
+        loader = Loader()
+        cache = ModelCache(load_model=loader, model_dir=model_dir)
+
+        first = cache.get("tenant-a")
+        second = cache.get("tenant-a")
+
+        assert first is second
+        assert loader.loads == [f"{model_dir}/tenant-a"]
+        assert (cache.hits, cache.misses) == (1, 1)
+
+    @staticmethod
+    def test_get_single_flight(model_dir):
+        """test concurrent first requests trigger a single load"""
+        loader = Loader(delay=0.2)
+        cache = ModelCache(load_model=loader, model_dir=model_dir)
+
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            models = list(executor.map(cache.get, ["tenant-a"] * 8))
+
+        assert len(loader.loads) == 1
+        assert all(model is models[0] for model in models)
+
+    @staticmethod
+    def test_evicts_least_recently_used_over_budget(model_dir):
+        """test least recently used models are evicted over the memory budget"""
+        cache = ModelCache(
+            load_model=Loader(),
+            model_dir=model_dir,
+            memory_budget=250,
+            sizeof=lambda _: 100,
+        )
+
+        cache.get("a")
+        cache.get("b")
+        cache.get("a")
+        cache.get("c")
+
+        assert "a" in cache and "c" in cache
+        assert "b" not in cache
+        assert cache.evictions == 1
+        assert cache.memory_usage == 200
+
+    @staticmethod
+    def test_evicts_over_max_models(model_dir):
+        """test models are evicted over the maximum number of models"""
+        cache = ModelCache(load_model=Loader(), model_dir=model_dir, max_models=1)
+
+        cache.get("a")
+        cache.get("b")
+
+        assert len(cache) == 1 and "b" in cache
+
+    @staticmethod
+    def test_load_failure_is_raised_and_not_cached(model_dir):
+        """test failed loads raise and are retried on the next request"""
+        calls = []
+
+        def load_model(model_path):
+            calls.append(model_path)
+            raise FileNotFoundError(model_path)
+
+        cache = ModelCache(load_model=load_model, model_dir=model_dir)
+
+        for _ in range(2):
+            with pytest.raises(FileNotFoundError):
+                cache.get("missing")
+
+        assert len(calls) == 2
+
+    @staticmethod
+    @pytest.mark.parametrize("model_id", ["../secrets", "a/b", ".."])
+    def test_rejects_model_ids_outside_model_dir(model_dir, model_id):
+        """test model ids cannot escape the model channel"""
+        cache = ModelCache(load_model=Loader(), model_dir=model_dir)
+
+        with pytest.raises(ValueError):
+            cache.get(model_id)
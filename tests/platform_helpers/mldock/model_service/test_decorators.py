@@ -0,0 +1,88 @@
+"""Tests the model service decorators"""
+import logging
+import os
+
+import pytest
+from mock import MagicMock
+
+from mldock.platform_helpers.mldock.model_service import decorators
+
+logger = logging.getLogger("mldock")
+
+
+@pytest.fixture(name="environment")
+def fixture_environment(tmp_path):
+    """environment writing failures to a temporary directory"""
+    environment = MagicMock()
+    environment.output_data_dir = str(tmp_path)
+    return environment
+
+
+class TestCachedPredictor:
+    """Tests the cached predictor decorator"""
+
+    @staticmethod
+    def test_container_created_once(environment):
+        """test the container and worker hooks do not run per request"""
+        container = MagicMock()
+
+        @decorators.cached_predictor(container, environment, logger)
+        def predict(value):
+            return value + 1
+
+        assert [predict(value) for value in range(5)] == [1, 2, 3, 4, 5]
+
+        container.assert_called_once_with(
+            container_environment=environment, container_logger=logger
+        )
+        serving = container.return_value
+        serving.startup_worker.assert_called_once()
+        serving.cleanup_worker.assert_not_called()
+        assert predict.serving_container() is serving
+
+        predict.close()
+        serving.cleanup_worker.assert_called_once()
+        assert predict.hook_overhead["startup_worker"] >= 0.0
+
+    @staticmethod
+    def test_container_recreated_after_fork(environment, monkeypatch):
+        """test a forked worker builds its own container"""
+        container = MagicMock()
+
+        @decorators.cached_predictor(container, environment, logger)
+        def predict():
+            return True
+
+        predict()
+        pid = os.getpid()
+        monkeypatch.setattr(decorators.os, "getpid", lambda: pid + 1)
+        predict()
+
+        assert container.call_count == 2
+
+    @staticmethod
+    def test_writes_failure_file(environment):
+        """test exceptions are written to the failure file and re-raised"""
+
+        @decorators.cached_predictor(MagicMock(), environment, logger)
+        def predict():
+            raise ValueError("bad input")
+
+        with pytest.raises(ValueError):
+            predict()
+
+        with open(os.path.join(environment.output_data_dir, "failure")) as file_:
+            assert "bad input" in file_.read()
+
+    @staticmethod
+    def test_measure_hook_overhead(environment):
+        """test the per-request hook overhead of predictor is measured"""
+        container = MagicMock()
+
+        overhead = decorators.measure_hook_overhead(
+            container, environment, logger, iterations=10
+        )
+
+        assert overhead >= 0.0
+        assert container.return_value.startup_worker.call_count == 10
+        assert container.return_value.cleanup_worker.call_count == 10
@@ -0,0 +1,193 @@
+"""Tests the model hot-swap"""
+import os
+import threading
+import time
+from pathlib import Path
+
+import pytest
+from mock import MagicMock, patch
+
+from mldock.platform_helpers.mldock.model_service import hotswap
+
+
+def write_model(model_dir, content: str, mtime_ns: int):
+    """write a model artifact with a given modification time"""
+    path = Path(model_dir, "model.txt")
+    path.write_text(str(content))
+    os.utime(path, ns=(mtime_ns, mtime_ns))
+
+
+def read_model(model_path):
+    """load the model artifact"""
+    return Path(model_path, "model.txt").read_text()
+
+
+class TestModelVersion:
+    """Tests model version fingerprints"""
+
+    @staticmethod
+    def test_model_version(tmp_path):
+        """test the version changes with the artifacts"""
+        assert hotswap.model_version(tmp_path) is None
+
+        write_model(tmp_path, "v1", 10**18)
+        version = hotswap.model_version(tmp_path)
+
+        assert version == hotswap.model_version(tmp_path)
+        write_model(tmp_path, "v1", 2 * 10**18)
+        assert hotswap.model_version(tmp_path) == version
+        write_model(tmp_path, "v2", 2 * 10**18)
+        assert hotswap.model_version(tmp_path) != version
+
+    @staticmethod
+    def test_model_version_reuses_hashes(tmp_path):
+        """test unchanged files are not hashed again"""
+        write_model(tmp_path, "v1", 10**18)
+        hashes = {}
+        version = hotswap.model_version(tmp_path, hashes)
+
+        with patch.object(hotswap, "_file_digest") as file_digest:
+            assert hotswap.model_version(tmp_path, hashes) == version
+        file_digest.assert_not_called()
+
+
+class TestHotSwapModel:
+    """Tests the hot-swap model"""
+
+    @staticmethod
+    def test_swaps_new_versions(tmp_path):
+        """test new versions are warmed up, swapped in and old versions unloaded"""
+        write_model(tmp_path, "v1", 10**18)
+        warmup, unload = MagicMock(), MagicMock()
+        model = hotswap.HotSwapModel(read_model, tmp_path, warmup=warmup, unload=unload)
+
+        assert model.load()
+        assert not model.load()
+        assert model.model == "v1"
+
+        write_model(tmp_path, "v2", 2 * 10**18)
+        assert model.load()
+
+        assert model.model == "v2"
+        assert model.swaps == 2
+        assert [call.args[0] for call in warmup.call_args_list] == ["v1", "v2"]
+        unload.assert_called_once_with("v1")
+
+    @staticmethod
+    def test_drains_in_flight_requests(tmp_path):
+        """test an old version is not freed until its in-flight requests complete"""
+        write_model(tmp_path, "v1", 10**18)
+        unload = MagicMock()
+        model = hotswap.HotSwapModel(read_model, tmp_path, unload=unload)
+        model.load()
+
+        swapped = threading.Event()
+        with model.acquire() as current:
+            write_model(tmp_path, "v2", 2 * 10**18)
+            thread = threading.Thread(target=lambda: model.load() and swapped.set())
+            thread.start()
+            time.sleep(0.1)
+
+            # traffic switched, the old version is still in use
+            assert model.model == "v2"
+            assert current == "v1"
+            unload.assert_not_called()
+        thread.join(5)
+
+        assert swapped.is_set()
+        unload.assert_called_once_with("v1")
+
+    @staticmethod
+    def test_acquire_during_swap(tmp_path):
+        """test a request racing a swap uses the new version, not the retired one"""
+        write_model(tmp_path, "v1", 10**18)
+        model = hotswap.HotSwapModel(read_model, tmp_path)
+        model.load()
+        old = model._current  # pylint: disable=protected-access
+
+        class SwapOnEnter(threading.Condition):
+            """swaps in a new version just before the first request is counted"""
+
+            swapped = False
+
+            def __enter__(self):
+                if not self.swapped:
+                    self.swapped = True
+                    write_model(tmp_path, "v2", 2 * 10**18)
+                    model.load()
+                return super().__enter__()
+
+        old.drained = SwapOnEnter()
+        with model.acquire() as current:
+            assert current == "v2"
+        assert old.model is None and old.in_flight == 0
+
+    @staticmethod
+    def test_failed_load_keeps_current_version(tmp_path):
+        """test a failing new version keeps serving the current one"""
+        write_model(tmp_path, "v1", 10**18)
+        model = hotswap.HotSwapModel(read_model, tmp_path)
+        model.load()
+
+        model.load_model = MagicMock(side_effect=ValueError("corrupt model"))
+        write_model(tmp_path, "v2", 2 * 10**18)
+
+        with pytest.raises(ValueError):
+            model.load()
+        assert model.model == "v1"
+
+    @staticmethod
+    def test_watch(tmp_path):
+        """test the watcher syncs new versions in to staging directories and swaps them in"""
+        model_dir = Path(tmp_path, "model")
+        model_dir.mkdir()
+        write_model(model_dir, "v1", 10**18)
+        model = hotswap.HotSwapModel(read_model, model_dir)
+        model.load()
+        sync = MagicMock(
+            side_effect=lambda target_dir: write_model(target_dir, "v2", 2 * 10**18)
+        )
+
+        model.watch(interval=0.01, sync=sync)
+        deadline = time.monotonic() + 5
+        while model.model != "v2" and time.monotonic() < deadline:
+            time.sleep(0.01)
+        time.sleep(0.05)
+        model.stop()
+
+        assert model.model == "v2"
+        assert sync.call_count > 1
+        # the live version is never rewritten, identical syncs are discarded
+        assert read_model(model_dir) == "v1"
+        assert [path.name for path in model.staging_dir.iterdir()] == [
+            Path(sync.call_args_list[0].args[0]).name
+        ]
+
+    @staticmethod
+    def test_poll_skips_unchanged_remote_version(tmp_path):
+        """test unchanged remote versions are not synced"""
+        model = hotswap.HotSwapModel(read_model, Path(tmp_path, "model"))
+        remote_version = MagicMock(side_effect=["etag-1", "etag-1", "etag-2"])
+        sync = MagicMock(
+            side_effect=lambda target_dir: write_model(
+                target_dir, remote_version.call_count, 10**18
+            )
+        )
+
+        assert model.poll(sync=sync, remote_version=remote_version)
+        assert not model.poll(sync=sync, remote_version=remote_version)
+        assert model.poll(sync=sync, remote_version=remote_version)
+
+        assert sync.call_count == 2
+        assert model.model == "3"
+        # the retired version's staging directory is removed
+        assert len(list(model.staging_dir.iterdir())) == 1
+
+    @staticmethod
+    def test_acquire_without_model(tmp_path):
+        """test requests fail before a version is loaded"""
+        model = hotswap.HotSwapModel(read_model, tmp_path)
+
+        with pytest.raises(RuntimeError):
+            with model.acquire():
+                pass
@@ -0,0 +1,157 @@
+"""Tests the prediction memoization cache"""
+import numpy as np
+import pytest
+from mock import MagicMock, patch
+
+from mldock.platform_helpers.mldock.model_service import memoize
+from mldock.platform_helpers.mldock.model_service.base import ModelService
+
+
+class EchoService(ModelService):
+    """model service counting predict calls"""
+
+    calls = 0
+
+    @staticmethod
+    def load_model(model_path: str):
+        return None
+
+    def predict(self, input_data):
+        self.calls += 1
+        return np.asarray(input_data) + 1
+
+
+class TestPredictionCache:
+    """Tests the prediction cache methods"""
+
+    @staticmethod
+    def test_payload_key():
+        """test payload keys depend on body, content type and accept"""
+        key = memoize.payload_key(b"[1, 2]", "application/json")
+
+        assert key == memoize.payload_key("[1, 2]", "application/json")
+        assert key != memoize.payload_key(b"[1, 2]", "text/csv")
+        assert key != memoize.payload_key(b"[1, 2]", "application/json", "text/csv")
+
+    @staticmethod
+    def test_input_key():
+        """test input keys depend on array dtype, shape and values"""
+        key = memoize.input_key(np.arange(4))
+
+        assert key == memoize.input_key(np.arange(4))
+        assert key != memoize.input_key(np.arange(4).reshape(2, 2))
+        assert key != memoize.input_key(np.arange(4, dtype=np.int8))
+        assert memoize.input_key({"a": [1]}) == memoize.input_key({"a": [1]})
+
+    @staticmethod
+    def test_memoize_counts_hits_and_misses():
+        """test repeated inputs are served from the cache"""
+        cache = memoize.PredictionCache(max_size=10)
+        function = MagicMock(side_effect=lambda input_data: input_data * 2)
+        memoized = cache.memoize(function)
+
+        assert memoized(np.array([1])) == [2]
+        assert memoized(np.array([1])) == [2]
+        assert memoized(np.array([2])) == [4]
+
+        assert function.call_count == 2
+        stats = cache.stats()
+        assert (stats["hits"], stats["misses"], stats["size"]) == (1, 2, 2)
+
+    @staticmethod
+    def test_hits_cannot_be_mutated():
+        """test mutating a returned result does not corrupt later hits"""
+        cache = memoize.PredictionCache(max_size=10)
+        memoized = cache.memoize(lambda input_data: {"scores": input_data * 2})
+        array_memoized = cache.memoize(lambda input_data: input_data * 2)
+
+        first = array_memoized(np.array([1, 2]))
+        first[0] = 42
+        hit = array_memoized(np.array([1, 2]))
+        with pytest.raises(ValueError):
+            hit[0] = 42
+        memoized([3])["scores"].append(0)
+        memoized([3])["scores"].append(0)
+
+        np.testing.assert_equal(array_memoized(np.array([1, 2])), [2, 4])
+        assert memoized([3]) == {"scores": [3, 3]}
+
+    @staticmethod
+    def test_memoize_with_key():
+        """test memoize can be used as decorator factory with a custom key"""
+        cache = memoize.PredictionCache(max_size=10)
+        calls = []
+
+        @cache.memoize(key=memoize.payload_key)
+        def invoke(payload, content_type, accept=None):
+            calls.append(payload)
+            return "application/json", payload
+
+        invoke(b"[1]", "application/json")
+        invoke(b"[1]", "application/json")
+
+        assert calls == [b"[1]"]
+
+    @staticmethod
+    def test_evicts_least_recently_used():
+        """test entries over max_size are evicted least recently used first"""
+        cache = memoize.PredictionCache(max_size=2)
+
+        cache.put("a", 1)
+        cache.put("b", 2)
+        cache.get("a")
+        cache.put("c", 3)
+
+        assert cache.get("b") is None
+        assert (cache.get("a"), cache.get("c")) == (1, 3)
+        assert cache.evictions == 1
+
+    @staticmethod
+    def test_entries_expire_after_ttl():
+        """test entries expire after the time to live"""
+        cache = memoize.PredictionCache(max_size=2, ttl=10)
+
+        with patch.object(memoize.time, "monotonic", return_value=100.0):
+            cache.put("a", 1)
+        with patch.object(memoize.time, "monotonic", return_value=105.0):
+            assert cache.get("a") == 1
+        with patch.object(memoize.time, "monotonic", return_value=111.0):
+            assert cache.get("a") is None
+
+        assert len(cache) == 0
+
+    @staticmethod
+    def test_disabled_cache_calls_through():
+        """test a max_size of 0 disables caching"""
+        cache = memoize.PredictionCache(max_size=0)
+        function = MagicMock(return_value=1)
+        memoized = cache.memoize(function)
+
+        memoized(1)
+        memoized(1)
+
+        assert function.call_count == 2
+        assert len(cache) == 0
+
+    @staticmethod
+    def test_from_environment():
+        """test cache size and ttl are read from the environment"""
+        environment = MagicMock()
+        environment.environment_variables.int.return_value = 100
+        environment.environment_variables.float.return_value = 30.0
+
+        cache = memoize.PredictionCache.from_environment(environment)
+
+        assert (cache.max_size, cache.ttl) == (100, 30.0)
+
+    @staticmethod
+    def test_model_service_prediction_cache():
+        """test model service predictions are memoized"""
+        service = EchoService(model_path="model")
+        cache = service.enable_prediction_cache(max_size=10)
+
+        np.testing.assert_equal(service.predict([1, 2]), [2, 3])
+        np.testing.assert_equal(service.predict([1, 2]), [2, 3])
+
+        assert service.calls == 1
+        assert cache.hits == 1
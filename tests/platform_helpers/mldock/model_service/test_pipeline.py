@@ -0,0 +1,126 @@
+"""Tests the pipelined stage executor"""
+import asyncio
+import threading
+import time
+
+import numpy as np
+import pytest
+
+from mldock.platform_helpers.mldock.model_service.base import ModelService
+from mldock.platform_helpers.mldock.model_service.pipeline import StagePipeline
+
+
+class DoublingService(ModelService):
+    """model service with all three stages"""
+
+    @staticmethod
+    def load_model(model_path: str):
+        return 2
+
+    def predict(self, input_data):
+        return input_data * self.model
+
+    @staticmethod
+    def input_transform(input_data, **kwargs):
+        return np.asarray(input_data)
+
+    @staticmethod
+    def output_transform(predictions, **kwargs):
+        return predictions.tolist()
+
+
+def sleeper(seconds: float):
+    """stage sleeping to simulate work that releases the GIL"""
+
+    def stage(item):
+        time.sleep(seconds)
+        return item
+
+    return stage
+
+
+class TestStagePipeline:
+    """Tests the stage pipeline"""
+
+    @staticmethod
+    def test_model_service_pipeline_keeps_order():
+        """test outputs of all stages are returned in submission order"""
+        pipeline = DoublingService(model_path="model").create_pipeline(queue_size=2)
+
+        actual = list(pipeline.map([[index] for index in range(20)]))
+        pipeline.close()
+
+        assert actual == [[index * 2] for index in range(20)]
+        assert pipeline.stats()["predict"]["items"] == 20
+
+    @staticmethod
+    def test_stages_overlap():
+        """test stages run concurrently on consecutive items"""
+        pipeline = StagePipeline(
+            [
+                ("pre", sleeper(0.02)),
+                ("predict", sleeper(0.02)),
+                ("post", sleeper(0.02)),
+            ]
+        )
+
+        start = time.perf_counter()
+        list(pipeline.map(range(10)))
+        elapsed = time.perf_counter() - start
+        pipeline.close()
+
+        # sequential execution takes 10 * 3 * 0.02 = 0.6s
+        assert elapsed < 0.45
+        stats = pipeline.stats()
+        assert set(stats) == {"pre", "predict", "post"}
+        assert all(0 < stage["utilisation"] <= 1 for stage in stats.values())
+
+    @staticmethod
+    def test_stage_errors_skip_later_stages():
+        """test a failing stage resolves the item's future with the exception"""
+        calls = []
+
+        def fail_on_odd(item):
+            if item % 2:
+                raise ValueError("odd")
+            return item
+
+        pipeline = StagePipeline([("check", fail_on_odd), ("record", calls.append)])
+
+        assert pipeline.run(2) is None
+        with pytest.raises(ValueError):
+            pipeline.run(3)
+        pipeline.close()
+
+        assert calls == [2]
+
+    @staticmethod
+    def test_queues_are_bounded():
+        """test submit blocks while the first stage's queue is full"""
+        release = threading.Event()
+        pipeline = StagePipeline(
+            [("blocked", lambda item: release.wait(5))], queue_size=1
+        )
+
+        pipeline.submit(0)
+        time.sleep(0.05)
+        pipeline.submit(1)
+        blocked = threading.Thread(target=pipeline.submit, args=(2,), daemon=True)
+        blocked.start()
+        blocked.join(0.1)
+
+        assert blocked.is_alive()
+        release.set()
+        blocked.join(5)
+        pipeline.close()
+
+    @staticmethod
+    def test_run_async():
+        """test items can be awaited"""
+        pipeline = StagePipeline([("add", lambda item: item + 1)])
+
+        assert asyncio.run(pipeline.run_async(1)) == 2
+        pipeline.close()
+
+        with pytest.raises(RuntimeError):
+            pipeline.submit(1)
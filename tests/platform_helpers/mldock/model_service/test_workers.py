@@ -0,0 +1,105 @@
+"""Tests the forked inference worker pool"""
+import asyncio
+import os
+
+import numpy as np
+import pytest
+
+from mldock.platform_helpers.mldock.model_service.base import ModelService
+from mldock.platform_helpers.mldock.model_service import workers
+
+pytestmark = pytest.mark.skipif(
+    not hasattr(os, "fork"), reason="forked workers require fork"
+)
+
+
+class WeightedService(ModelService):
+    """model service multiplying inputs by its weights"""
+
+    @staticmethod
+    def load_model(model_path: str):
+        return np.arange(3, dtype=np.float64)
+
+    def predict(self, input_data):
+        if input_data is None:
+            raise ValueError("no input data")
+        return np.asarray(input_data) @ self.model
+
+
+@pytest.fixture
+def pool():
+    """started worker pool of two workers"""
+    worker_pool = WeightedService(model_path="model").create_worker_pool(num_workers=2)
+    worker_pool.start()
+    yield worker_pool
+    worker_pool.close(timeout=5)
+
+
+class TestForkedWorkerPool:
+    """Tests the forked worker pool methods"""
+
+    @staticmethod
+    def test_predict(pool):
+        """test predictions run in worker processes"""
+        futures = [pool.submit([[index, 1, 1]]) for index in range(6)]
+
+        actual = [future.result(timeout=10) for future in futures]
+
+        np.testing.assert_equal(actual, [[3.0]] * 6)
+
+    @staticmethod
+    def test_predict_async(pool):
+        """test coroutines can await worker predictions"""
+        actual = asyncio.run(pool.predict_async([[1, 1, 1]]))
+
+        np.testing.assert_equal(actual, [3.0])
+
+    @staticmethod
+    def test_predict_errors_propagate(pool):
+        """test exceptions raised by predict are raised to the caller"""
+        with pytest.raises(ValueError, match="no input data"):
+            pool.submit(None).result(timeout=10)
+
+    @staticmethod
+    def test_dead_worker_fails_its_request_and_is_replaced():
+        """test a worker dying mid-request fails that request and is re-forked"""
+
+        def predict(input_data):
+            if input_data == "crash":
+                os._exit(1)  # pylint: disable=protected-access
+            return input_data
+
+        pool = workers.ForkedWorkerPool(predict, num_workers=2).start()
+        try:
+            with pytest.raises(workers.WorkerDiedError, match="exit code 1"):
+                pool.submit("crash").result(timeout=10)
+
+            actual = [pool.submit(index) for index in range(4)]
+
+            assert [future.result(timeout=10) for future in actual] == [0, 1, 2, 3]
+            assert pool.restarts == 1
+            assert all(stats["alive"] for stats in pool.worker_stats())
+        finally:
+            pool.close(timeout=5)
+
+    @staticmethod
+    def test_worker_stats(pool):
+        """test per worker memory and utilisation since start are reported"""
+        pool.predict([[1, 1, 1]])
+
+        actual = pool.worker_stats()
+
+        assert len(actual) == 2
+        for stats in actual:
+            assert stats["alive"]
+            if os.path.exists("/proc"):
+                assert stats["rss_bytes"] > 0
+                assert stats["cpu_utilisation"] >= 0
+
+    @staticmethod
+    def test_submit_requires_start():
+        """test requests cannot be queued before the pool is started"""
+        pool = workers.ForkedWorkerPool(lambda input_data: input_data, num_workers=1)
+
+        with pytest.raises(RuntimeError):
+            pool.submit([1])
@@ -1,9 +1,11 @@
 from pathlib import Path
 import tempfile
 from pyarrow import fs
+from mock import MagicMock
 from mldock.platform_helpers.mldock.storage.pyarrow import (
     upload_assets,
     download_assets,
+    get_assets_version,
 )
 
 
@@ -111,3 +113,44 @@ class TestPyarrow:
         expected_msg = f"skipping: {result_txtfile} is not a compressed file or compression format is not supported."
         captured = capsys.readouterr().out
         assert expected_msg in captured, "Failure."
+
+    def test_local_get_assets_version_changes_with_assets(self):
+        """test local asset versions change when an asset is rewritten"""
+        local_file_system = fs.LocalFileSystem()
+
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            txtfile = Path(tmp_dir, "example/data.txt").as_posix()
+            _ = self.__create_textfile(txtfile)
+            version = get_assets_version(
+                file_system=local_file_system,
+                fs_base_path=tmp_dir,
+                storage_location="example",
+            )
+
+            assert version == get_assets_version(
+                file_system=local_file_system,
+                fs_base_path=tmp_dir,
+                storage_location="example",
+            ), "Failure."
+            with open(txtfile, "a") as file:
+                file.write(" again")
+            assert version != get_assets_version(
+                file_system=local_file_system,
+                fs_base_path=tmp_dir,
+                storage_location="example",
+            ), "Failure."
+
+    @staticmethod
+    def test_remote_get_assets_version_uses_etags():
+        """test remote asset versions are read from the listing's size and ETag"""
+        file_system = MagicMock()
+        file_system.isfile.return_value = False
+        file_system.glob.return_value = ["bucket/model/model.pkl"]
+        file_system.info.return_value = {"size": 42, "ETag": '"abc"'}
+
+        versions = get_assets_version(
+            file_system=file_system, fs_base_path="bucket/model", storage_location="."
+        )
+
+        assert versions == [("bucket/model/model.pkl", 42, '"abc"')], "Failure."
+        file_system.download.assert_not_called()
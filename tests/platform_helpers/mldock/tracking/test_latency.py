@@ -0,0 +1,104 @@
+"""Tests the latency histograms"""
+import threading
+
+import numpy as np
+import pytest
+
+from mldock.platform_helpers.mldock.tracking.latency import (
+    LatencyHistogram,
+    LatencyMetrics,
+)
+
+
+class TestLatencyHistogram:
+    """Tests the latency histogram"""
+
+    @staticmethod
+    @pytest.mark.parametrize("seconds", [5e-8, 1e-6, 3.3e-4, 0.25, 12.0])
+    def test_bucket_values_are_accurate(seconds):
+        """test bucket midpoints are within the histogram's relative error"""
+        histogram = LatencyHistogram()
+
+        value = histogram._value(histogram._index(int(seconds * 1e9)))
+
+        assert value == pytest.approx(seconds, rel=1 / 64)
+
+    @staticmethod
+    def test_percentiles():
+        """test percentiles match the recorded distribution"""
+        histogram = LatencyHistogram()
+        latencies = np.random.default_rng(0).exponential(0.01, size=10000)
+        for seconds in latencies:
+            histogram.record(seconds)
+
+        snapshot = histogram.snapshot()
+
+        assert snapshot["count"] == 10000
+        assert snapshot["sum"] == pytest.approx(latencies.sum())
+        assert snapshot["max"] == latencies.max()
+        for name, quantile in (("p50", 50), ("p90", 90), ("p99", 99)):
+            assert snapshot[name] == pytest.approx(
+                np.percentile(latencies, quantile), rel=0.05
+            )
+
+    @staticmethod
+    def test_empty_snapshot():
+        """test an empty histogram reports zero latencies"""
+        snapshot = LatencyHistogram().snapshot()
+
+        assert snapshot["count"] == 0
+        assert snapshot["p999"] == 0.0
+
+    @staticmethod
+    def test_merges_threads():
+        """test latencies recorded by many threads are merged"""
+        histogram = LatencyHistogram(max_seconds=1.0)
+
+        def record():
+            for _ in range(1000):
+                histogram.record(0.001)
+
+        threads = [threading.Thread(target=record) for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        histogram.record(5.0)
+
+        snapshot = histogram.snapshot()
+        assert snapshot["count"] == 4001
+        assert snapshot["p50"] == pytest.approx(0.001, rel=1 / 64)
+        assert snapshot["max"] == 5.0
+
+
+class TestLatencyMetrics:
+    """Tests latency metrics by stage"""
+
+    @staticmethod
+    def test_time_and_timed():
+        """test stages are timed by context manager and decorator"""
+        latency = LatencyMetrics()
+
+        with latency.time("decode"):
+            pass
+
+        @latency.timed("predict")
+        def predict(input_data):
+            return input_data
+
+        assert predict(1) == 1
+        snapshot = latency.snapshot()
+        assert snapshot["decode"]["count"] == 1
+        assert snapshot["predict"]["count"] == 1
+
+    @staticmethod
+    def test_to_prometheus():
+        """test metrics are exported as prometheus summaries"""
+        latency = LatencyMetrics()
+        latency.record("predict", 0.002)
+
+        actual = latency.to_prometheus()
+
+        assert "# TYPE mldock_stage_latency_seconds summary" in actual
+        assert 'mldock_stage_latency_seconds{stage="predict",quantile="0.99"}' in actual
+        assert 'mldock_stage_latency_seconds_count{stage="predict"} 1\n' in actual